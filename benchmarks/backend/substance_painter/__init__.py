@@ -0,0 +1,27 @@
+"""Stand-in for the parts of the substance_painter API the Custom Exporter uses, for the benchmarks, tests and batch pipeline.
+Projects are JSON files or synthetic projects (project.create_synthetic), and configure() can slow down every API call."""
+
+from . import latency
+from . import logging
+from . import event
+from . import resource
+from . import textureset
+from . import project
+from . import export
+from . import ui
+
+def configure(api_call:float=None, export_per_map:float=None, write_files:bool=None, maps_per_preset:dict=None):
+    """
+    api_call: seconds spent in every API call (name, get_resolution, from_name, ...)
+    export_per_map: seconds spent per exported map in export_project_textures
+    write_files: whether export_project_textures writes placeholder files on disk
+    maps_per_preset: export preset name -> list of map suffixes it exports
+    """
+    if api_call is not None:
+        latency.LATENCIES["api_call"] = api_call
+    if export_per_map is not None:
+        latency.LATENCIES["export_per_map"] = export_per_map
+    if write_files is not None:
+        export.WRITE_FILES = write_files
+    if maps_per_preset is not None:
+        export.MAPS_PER_PRESET.update(maps_per_preset)
@@ -0,0 +1,54 @@
+""" Stand-in for substance_painter.event, with a dispatcher that can also emit events. """
+
+class Event:
+    pass
+
+class ProjectOpened(Event):
+    pass
+
+class ProjectCreated(Event):
+    pass
+
+class ProjectAboutToClose(Event):
+    pass
+
+class ProjectAboutToSave(Event):
+    pass
+
+class ProjectSaved(Event):
+    pass
+
+class ExportTexturesAboutToStart(Event):
+    pass
+
+class ExportTexturesEnded(Event):
+    pass
+
+class LayerStacksModelDataChanged(Event):
+    pass
+
+class TextureStateEventAction:
+    ADD = 0
+    UPDATE = 1
+    REMOVE = 2
+
+class TextureStateEvent(Event):
+    def __init__(self, action:int=TextureStateEventAction.UPDATE, stack_id:int=0):
+        self.action = action
+        self.stack_id = stack_id
+
+class Dispatcher:
+    def __init__(self):
+        self.callbacks = {}
+
+    def connect(self, event_type, callback):
+        self.callbacks.setdefault(event_type, []).append(callback)
+
+    def disconnect(self, event_type, callback):
+        self.callbacks.get(event_type, []).remove(callback)
+
+    def emit(self, event):
+        for callback in list(self.callbacks.get(type(event), [])):
+            callback(event)
+
+DISPATCHER = Dispatcher()
@@ -0,0 +1,119 @@
+"""
+    Stand-in for substance_painter.export.
+
+    export_project_textures exports the maps of MAPS_PER_PRESET for every exportList entry,
+    named <TextureSet>_<Map>.png, or <TextureSet>_<Map>.<UDIM>.png for UV tiles.
+    The presets of the exportPresets of the config are used by name instead, with the file names of their maps,
+    where $textureSet is the texture set name and a / starts a subfolder of the export path.
+    When WRITE_FILES is set, the files are written on disk: images of the exported size when Pillow is installed,
+    small placeholder files otherwise.
+"""
+
+from . import latency
+from . import textureset
+
+# Default Utils imports
+import enum
+import importlib.util
+import os
+import re
+from typing import Dict, List
+
+WRITE_FILES = False
+MAPS_PER_PRESET = {
+    "Custom_Basic": ["BaseColor", "Normal", "OcclusionRoughnessMetallic"],
+    "Custom_Armament": ["BaseColor", "Normal", "OcclusionRoughnessMetallic", "Emissive"],
+    "Custom_Morph": ["BaseColor", "Normal", "OcclusionRoughnessMetallic", "Height"],
+    "Custom_Sources": ["BaseColor", "Opacity", "Normal", "AmbientOcclusion", "Roughness", "Metallic", "Emissive", "Height"],
+}
+SINGLE_CHANNEL_MAPS = {"Opacity", "AmbientOcclusion", "Roughness", "Metallic", "Height"}
+DEFAULT_MAPS = ["BaseColor", "Normal"]
+
+class ExportStatus(enum.Enum):
+    Success = 0
+    Cancelled = 1
+    Warning = 2
+    Error = 3
+
+class TextureExportResult:
+    def __init__(self, status:ExportStatus, message:str, textures:Dict):
+        self.status = status
+        self.message = message
+        self.textures = textures
+
+class ResourceExportPreset:
+    def __init__(self, resource_id):
+        self.resource_id = resource_id
+
+    def list_output_maps(self) -> List[Dict]:
+        latency.wait("api_call")
+        return [{"fileName": f"$textureSet_{map_name}", "channels": [], "parameters": {"fileFormat": "png"}}
+                for map_name in MAPS_PER_PRESET.get(self.resource_id.name, DEFAULT_MAPS)]
+
+def get_preset_file_names(export_entry:Dict, config:Dict) -> List[str]:
+    """ File name patterns of the maps of the preset of an export entry. """
+    preset_url = export_entry.get("exportPreset", config.get("defaultExportPreset", ""))
+    for export_preset in config.get("exportPresets", []):
+        if export_preset["name"] == preset_url:
+            return [output_map["fileName"] for output_map in export_preset["maps"]]
+    return [f"$textureSet_{map_name}" for map_name in MAPS_PER_PRESET.get(preset_url.rsplit("/", 1)[-1], DEFAULT_MAPS)]
+
+def list_project_textures(config:Dict) -> Dict:
+    """ Files that export_project_textures would write for the config, per (texture set name, stack name). """
+    latency.wait("api_call")
+    textures = {}
+    for export_entry in config["exportList"]:
+        texture_set_name, stack_name = export_entry["rootPath"].split("/", 1) if "/" in export_entry["rootPath"] else (export_entry["rootPath"], "")
+        texture_set = textureset.TEXTURE_SETS[texture_set_name]
+        tile_filter = export_entry.get("filter", {}).get("uvTiles")
+        tiles = tile_filter if tile_filter is not None else [[tile.u, tile.v] for tile in texture_set.uv_tiles]
+        tiles = [[u, v] for u, v in tiles if any((tile.u, tile.v) == (u, v) for tile in texture_set.uv_tiles)]
+        file_names = []
+        for file_name in get_preset_file_names(export_entry, config):
+            file_name = file_name.replace("$textureSet", texture_set_name)
+            if len(tiles) > 0:
+                file_names.extend(f"{file_name}.{1001 + u + 10 * v}.png" for u, v in tiles)
+            else:
+                file_names.append(f"{file_name}.png")
+        textures[(texture_set_name, stack_name)] = [os.path.join(config["exportPath"], file_name) for file_name in file_names]
+    return textures
+
+def get_export_size(config:Dict, stack_path:str, texture_set_name:str, file_path:str) -> List[int]:
+    """ Size of an exported file, from the first exportParameters entry matching its stack and UV tile. """
+    udim_match = re.search(r"\.(1\d{3})\.png$", file_path)
+    tile = [(int(udim_match.group(1)) - 1001) % 10, (int(udim_match.group(1)) - 1001) // 10] if udim_match else None
+    for parameters_entry in config.get("exportParameters", []):
+        data_paths = parameters_entry.get("filter", {}).get("dataPaths")
+        tile_filter = parameters_entry.get("filter", {}).get("uvTiles")
+        size_log2 = parameters_entry.get("parameters", {}).get("sizeLog2")
+        if size_log2 is not None and (data_paths is None or stack_path in data_paths) and (tile_filter is None or tile in tile_filter):
+            return [2 ** int(size_log2[0]), 2 ** int(size_log2[1])]
+    resolution = textureset.TEXTURE_SETS[texture_set_name].get_resolution()
+    return [resolution.width, resolution.height]
+
+def write_texture_file(file_path:str, size:List[int]):
+    if importlib.util.find_spec("PIL") is None:
+        with open(file_path, "wb") as exported_file:
+            exported_file.write(b"stand-in texture")
+        return
+    from PIL import Image
+    map_name = os.path.splitext(os.path.basename(file_path))[0].split(".")[0].rsplit("_", 1)[-1]
+    if map_name in SINGLE_CHANNEL_MAPS:
+        Image.new("L", size, 128).save(file_path)
+    else:
+        Image.new("RGB", size, (128, 128, 255)).save(file_path)
+
+def export_project_textures(config:Dict) -> TextureExportResult:
+    for export_entry in config["exportList"]:
+        texture_set_name = export_entry["rootPath"].split("/", 1)[0]
+        if texture_set_name not in textureset.TEXTURE_SETS:
+            return TextureExportResult(ExportStatus.Error, f"Texture set {texture_set_name} does not exist", {})
+
+    textures = list_project_textures(config)
+    latency.wait("export_per_map", sum(len(file_paths) for file_paths in textures.values()))
+    if WRITE_FILES:
+        for (texture_set_name, stack_name), file_paths in textures.items():
+            for file_path in file_paths:
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                write_texture_file(file_path, get_export_size(config, f"{texture_set_name}/{stack_name}", texture_set_name, file_path))
+    return TextureExportResult(ExportStatus.Success, "", textures)
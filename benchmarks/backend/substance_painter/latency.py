@@ -0,0 +1,14 @@
+""" Configurable latencies of the stand-in API, in seconds. """
+
+# Default Utils imports
+import time
+
+LATENCIES = {
+    "api_call": 0.0,
+    "export_per_map": 0.0,
+}
+
+def wait(latency_name:str, count:int=1):
+    seconds = LATENCIES[latency_name] * count
+    if seconds > 0:
+        time.sleep(seconds)
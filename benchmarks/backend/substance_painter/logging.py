@@ -0,0 +1,14 @@
+""" Stand-in for substance_painter.logging, the messages are kept in memory. """
+
+# Default Utils imports
+from collections import deque
+
+DBG_INFO = "dbg_info"
+INFO = "info"
+WARNING = "warning"
+ERROR = "error"
+
+MESSAGES = deque(maxlen=10000)
+
+def log(severity, channel, message):
+    MESSAGES.append((severity, channel, message))
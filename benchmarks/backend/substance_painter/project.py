@@ -0,0 +1,55 @@
+"""
+    Stand-in for substance_painter.project.
+
+    A project file is a JSON file:
+        {"texture_sets": [{"name": "PROP_CHR_S_01", "resolution": [1024, 1024], "uv_tiles": [[0, 0], [1, 0, 512, 512]]}]}
+    UV tiles are [u, v], with the resolution of the texture set, or [u, v, width, height].
+"""
+
+from . import event
+from . import textureset
+
+# Default Utils imports
+import builtins
+import json
+import os
+
+STATE = {"is_open": False, "file_path": None, "name": None}
+
+def is_open() -> bool:
+    return STATE["is_open"]
+
+def name() -> str:
+    return STATE["name"]
+
+def file_path() -> str:
+    return STATE["file_path"]
+
+def load_texture_sets(texture_set_descriptions):
+    textureset.TEXTURE_SETS.clear()
+    for description in texture_set_descriptions:
+        width, height = description["resolution"]
+        texture_set = textureset.TextureSet(description["name"], width, height, description.get("uv_tiles"))
+        textureset.TEXTURE_SETS[texture_set.texture_set_name] = texture_set
+    first_texture_set = next(iter(textureset.TEXTURE_SETS.values()), None)
+    textureset.set_active_stack(first_texture_set.stack if first_texture_set is not None else None)
+
+def open(project_file_path:str):
+    with builtins.open(project_file_path, "r", encoding="utf-8") as project_file: #This function shadows the built-in open
+        project_data = json.load(project_file)
+    load_texture_sets(project_data["texture_sets"])
+    STATE.update(is_open=True, file_path=project_file_path, name=os.path.splitext(os.path.basename(project_file_path))[0])
+    event.DISPATCHER.emit(event.ProjectOpened())
+
+def create_synthetic(texture_set_descriptions, project_name:str="Synthetic"):
+    """ Opens a project made of texture set descriptions, without a project file. """
+    load_texture_sets(texture_set_descriptions)
+    STATE.update(is_open=True, file_path=None, name=project_name)
+    event.DISPATCHER.emit(event.ProjectCreated())
+
+def close():
+    if STATE["is_open"]:
+        event.DISPATCHER.emit(event.ProjectAboutToClose())
+    textureset.TEXTURE_SETS.clear()
+    textureset.set_active_stack(None)
+    STATE.update(is_open=False, file_path=None, name=None)
@@ -0,0 +1,10 @@
+""" Stand-in for substance_painter.resource. """
+
+class ResourceID:
+    def __init__(self, context:str, name:str, version:str=None):
+        self.context = context
+        self.name = name
+        self.version = version
+
+    def url(self) -> str:
+        return f"resource://{self.context}/{self.name}"
@@ -0,0 +1,133 @@
+""" Stand-in for substance_painter.textureset. The texture sets of the open project are stored in TEXTURE_SETS. """
+
+from . import event
+from . import latency
+
+# Default Utils imports
+import itertools
+from typing import Dict, List
+
+STACK_IDS = itertools.count(1)
+
+class Resolution:
+    def __init__(self, width:int, height:int):
+        self.width = width
+        self.height = height
+
+    def __eq__(self, other):
+        return isinstance(other, Resolution) and (self.width, self.height) == (other.width, other.height)
+
+    def __repr__(self):
+        return f"Resolution({self.width}, {self.height})"
+
+class UVTile:
+    def __init__(self, u:int, v:int, resolution:Resolution, texture_set:"TextureSet"=None):
+        self.u = u
+        self.v = v
+        self.resolution = resolution
+        self.texture_set = texture_set
+
+    def get_resolution(self) -> Resolution:
+        latency.wait("api_call")
+        return Resolution(self.resolution.width, self.resolution.height)
+
+    def set_resolution(self, new_resolution:Resolution):
+        latency.wait("api_call")
+        self.resolution = Resolution(new_resolution.width, new_resolution.height)
+        if self.texture_set is not None:
+            emit_texture_state_changed(self.texture_set)
+
+class Stack:
+    def __init__(self, texture_set:"TextureSet", name:str=""):
+        self.texture_set = texture_set
+        self.stack_name = name
+        self.stack_id = next(STACK_IDS)
+
+    def material(self) -> "TextureSet":
+        return self.texture_set
+
+    def name(self) -> str:
+        return self.stack_name
+
+    def __str__(self):
+        return f"{self.texture_set.texture_set_name}/{self.stack_name}"
+
+class TextureSet:
+    def __init__(self, name:str, width:int, height:int, uv_tiles:List[List[int]]=None):
+        self.texture_set_name = name
+        self.resolution = Resolution(width, height)
+        self.uv_tiles = [UVTile(tile[0], tile[1], Resolution(*tile[2:4]) if len(tile) == 4 else Resolution(width, height), self) for tile in (uv_tiles or [])] #[u, v] or [u, v, width, height]
+        self.stack = Stack(self)
+
+    @staticmethod
+    def from_name(texture_set_name:str) -> "TextureSet":
+        latency.wait("api_call")
+        return TEXTURE_SETS[texture_set_name]
+
+    def name(self) -> str:
+        latency.wait("api_call")
+        return self.texture_set_name
+
+    def set_name(self, new_name:str):
+        """ Renames the texture set, the project keeps its order of texture sets. """
+        latency.wait("api_call")
+        if new_name in TEXTURE_SETS:
+            raise ValueError(f"A texture set is already named {new_name}")
+        texture_sets = list(TEXTURE_SETS.values())
+        self.texture_set_name = new_name
+        TEXTURE_SETS.clear()
+        TEXTURE_SETS.update((texture_set.texture_set_name, texture_set) for texture_set in texture_sets)
+
+    def get_resolution(self) -> Resolution:
+        latency.wait("api_call")
+        return Resolution(self.resolution.width, self.resolution.height)
+
+    def set_resolution(self, new_resolution:Resolution):
+        """ Also sets the resolution of every UV tile. """
+        latency.wait("api_call")
+        self.resolution = Resolution(new_resolution.width, new_resolution.height)
+        for uv_tile in self.uv_tiles:
+            uv_tile.resolution = Resolution(new_resolution.width, new_resolution.height)
+        emit_texture_state_changed(self)
+
+    def get_stack(self, layered_stack_name:str="") -> Stack:
+        latency.wait("api_call")
+        return self.stack
+
+    def all_stacks(self) -> List[Stack]:
+        latency.wait("api_call")
+        return [self.stack]
+
+    def has_uv_tiles(self) -> bool:
+        latency.wait("api_call")
+        return len(self.uv_tiles) > 0
+
+    def all_uv_tiles(self) -> List[UVTile]:
+        latency.wait("api_call")
+        return list(self.uv_tiles)
+
+TEXTURE_SETS: Dict[str, TextureSet] = {}
+ACTIVE_STACK = [None]
+
+def all_texture_sets() -> List[TextureSet]:
+    latency.wait("api_call")
+    return list(TEXTURE_SETS.values())
+
+def get_active_stack():
+    latency.wait("api_call")
+    return ACTIVE_STACK[0]
+
+def set_active_stack(stack:Stack):
+    ACTIVE_STACK[0] = stack
+
+def set_resolution(texture_sets:List[TextureSet], new_resolution:Resolution):
+    latency.wait("api_call")
+    for texture_set in texture_sets:
+        texture_set.resolution = Resolution(new_resolution.width, new_resolution.height)
+        for uv_tile in texture_set.uv_tiles:
+            uv_tile.resolution = Resolution(new_resolution.width, new_resolution.height)
+        emit_texture_state_changed(texture_set)
+
+def emit_texture_state_changed(texture_set:TextureSet):
+    """ Textures are created again at the new resolution, like in Substance Painter. """
+    event.DISPATCHER.emit(event.TextureStateEvent(event.TextureStateEventAction.ADD, texture_set.stack.stack_id))
@@ -0,0 +1,11 @@
+""" Stand-in for substance_painter.ui, the widgets are only kept in a list. """
+
+DOCK_WIDGETS = []
+
+def add_dock_widget(widget):
+    DOCK_WIDGETS.append(widget)
+    return widget
+
+def delete_ui_element(widget):
+    if widget in DOCK_WIDGETS:
+        DOCK_WIDGETS.remove(widget)
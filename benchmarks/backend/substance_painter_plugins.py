@@ -0,0 +1,3 @@
+""" Stand-in for substance_painter_plugins. """
+
+plugins = {}
@@ -0,0 +1,216 @@
+"""Benchmark of the hot paths on synthetic projects of 10 to 10,000 texture sets. The widget benchmarks need PySide6.
+Usage:
+python benchmarks/bench_hot_paths.py --output bench_results.json
+python benchmarks/bench_hot_paths.py --sizes 10 100 --api-latency 0.00001 --compare old_results.json"""
+
+# Default Utils imports
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "backend"))
+sys.path.insert(0, os.path.join(REPO_DIR, "modules"))
+sys.path.insert(0, os.path.join(REPO_DIR, "plugins"))
+
+import substance_painter
+import module_export
+import module_export_estimate
+import module_name_autofix
+import module_validation_name
+import module_validation_resolution
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+ASSET_TYPE = "Props"
+
+def build_synthetic_texture_sets(count:int) -> List[Dict]:
+    """ Mix of valid and invalid names, all within the Props resolution budget so no dialog is opened. """
+    prefix = module_validation_name.get_naming_rule(ASSET_TYPE).prefix
+    details_1, details_2 = module_validation_name.get_naming_rule(ASSET_TYPE).details_display
+    combinations = [(detail_1, detail_2) for detail_1 in details_1 for detail_2 in details_2]
+    texture_sets = []
+    for i in range(count):
+        detail_1, detail_2 = combinations[i % len(combinations)]
+        asset_id = i // len(combinations)
+        name = f"{prefix}_{detail_1}_{detail_2}_{asset_id:02d}" #IDs above 99 fail the validation
+        resolution = [1024, 1024] if i % 3 else [512, 1024]
+        texture_sets.append({"name": name, "resolution": resolution})
+    return texture_sets
+
+def time_call(function:Callable, repeat:int) -> float:
+    """ Best time of repeat calls, in seconds. """
+    best_time = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        best_time = min(best_time, time.perf_counter() - start_time)
+    return best_time
+
+def bench_validate_names(count:int) -> Callable:
+    names = [texture_set.name() for texture_set in substance_painter.textureset.all_texture_sets()]
+    return lambda: module_validation_name.validate_names(ASSET_TYPE, names)
+
+def bench_validate_res(count:int) -> Callable:
+    texture_sets = substance_painter.textureset.all_texture_sets()
+    return lambda: [module_validation_resolution.validate_res(ASSET_TYPE, texture_set.get_resolution()) for texture_set in texture_sets]
+
+def bench_plan_name_changes(count:int) -> Callable:
+    """ Every name of the project made invalid the way artists type them, e.g. PROP_CHR_S_01 -> prop-chr-s-1, so every name gets a suggestion. """
+    names = [texture_set.name().lower().replace("_0", "_").replace("_", "-") for texture_set in substance_painter.textureset.all_texture_sets()]
+    return lambda: module_name_autofix.plan_name_changes(ASSET_TYPE, names)
+
+def export_jobs_of_project(export_root:str) -> List:
+    return [(texture_set.name(), "Basic", module_export.build_export_path(export_root, ASSET_TYPE, texture_set.name(), "Basic"))
+            for texture_set in substance_painter.textureset.all_texture_sets()]
+
+def bench_build_export_configs(count:int) -> Callable:
+    export_jobs = export_jobs_of_project("bench_root")
+    return lambda: module_export.build_batch_export_configs(export_jobs)
+
+def bench_estimate_export_jobs(count:int) -> Callable:
+    export_jobs = export_jobs_of_project("bench_root")
+    cost_model = module_export_estimate.ExportCostModel(tempfile.gettempdir()) #Default rates, the model file is never written
+    cost_model.rates = {}
+    return lambda: module_export_estimate.sort_longest_first(export_jobs, module_export_estimate.estimate_export_jobs(export_jobs, cost_model))
+
+def bench_exporting_batch(count:int) -> Callable:
+    export_jobs = export_jobs_of_project(tempfile.gettempdir())
+    return lambda: module_export.exporting_batch(export_jobs)
+
+CORE_BENCHMARKS = {
+    "validate_names": bench_validate_names,
+    "validate_res": bench_validate_res,
+    "plan_name_changes": bench_plan_name_changes,
+    "build_batch_export_configs": bench_build_export_configs,
+    "estimate_export_jobs": bench_estimate_export_jobs,
+    "exporting_batch": bench_exporting_batch,
+}
+
+def get_widget_benchmarks():
+    """ Returns the widget benchmarks, or the reason why they can't run. """
+    try:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide6.QtWidgets import QApplication
+    except ImportError as error:
+        return {}, f"PySide6 is not available: {error}"
+
+    application = QApplication.instance() or QApplication([])
+    import custom_exporter
+    import module_refresh_scheduler
+
+    exporter = custom_exporter.CustomExporter()
+
+    def full_refresh_request():
+        refresh_request = module_refresh_scheduler.RefreshRequest()
+        refresh_request.full = True
+        return refresh_request
+
+    def bench_fill_texture_table(count:int) -> Callable:
+        def fill_texture_table():
+            exporter.fill_texture_table()
+            exporter.refresh_scheduler.run_pending_refresh() #The refresh requested by the fill runs right away instead of on the next event loop turn
+            application.processEvents()
+        return fill_texture_table
+
+    def bench_validate_texture_sets(count:int) -> Callable:
+        exporter.fill_texture_table()
+        exporter.refresh_scheduler.run_pending_refresh()
+        return lambda: exporter.validate_texture_sets(range(count))
+
+    def bench_on_refresh_requested(count:int) -> Callable:
+        exporter.fill_texture_table()
+        exporter.refresh_scheduler.run_pending_refresh()
+        return lambda: exporter.perform_refresh(full_refresh_request())
+
+    def bench_texture_state_events(count:int) -> Callable:
+        exporter.fill_texture_table()
+        exporter.refresh_scheduler.run_pending_refresh()
+        stack_ids = [texture_set.stack.stack_id for texture_set in substance_painter.textureset.all_texture_sets()]
+        def texture_state_events():
+            #One texture change per texture set, like a painting session over the whole project, then the throttled revalidation
+            for stack_id in stack_ids:
+                substance_painter.event.DISPATCHER.emit(substance_painter.event.TextureStateEvent(substance_painter.event.TextureStateEventAction.UPDATE, stack_id))
+            exporter.live_revalidation.flush()
+            exporter.refresh_scheduler.run_pending_refresh()
+        return texture_state_events
+
+    return {
+        "fill_texture_table": bench_fill_texture_table,
+        "validate_texture_sets": bench_validate_texture_sets,
+        "on_refresh_requested": bench_on_refresh_requested,
+        "texture_state_events": bench_texture_state_events,
+    }, None
+
+def get_git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def run_benchmarks(sizes:List[int], repeat:int, include_widget:bool) -> Dict:
+    module_export.open_explorer_at_path = lambda path: None #Never open file browsers during benchmarks
+    benchmarks = dict(CORE_BENCHMARKS)
+    skipped = {}
+    if include_widget:
+        widget_benchmarks, skip_reason = get_widget_benchmarks()
+        if skip_reason is not None:
+            skipped = {name: skip_reason for name in ["fill_texture_table", "validate_texture_sets", "on_refresh_requested", "texture_state_events"]}
+        benchmarks.update(widget_benchmarks)
+
+    results = {name: {} for name in benchmarks}
+    for size in sizes:
+        substance_painter.project.create_synthetic(build_synthetic_texture_sets(size), f"Synthetic_{size}")
+        for name, make_benchmark in benchmarks.items():
+            results[name][str(size)] = time_call(make_benchmark(size), repeat)
+            print(f"{name:<28} {size:>6} texture sets: {results[name][str(size)] * 1000:10.3f} ms", flush=True)
+        substance_painter.project.close()
+
+    return {
+        "commit": get_git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"repeat": repeat, "latencies": dict(substance_painter.latency.LATENCIES)},
+        "results": results,
+        "skipped": skipped,
+    }
+
+def compare_results(results:Dict, previous_results:Dict):
+    print(f"\nComparison with commit {previous_results.get('commit', 'unknown')} (ratio > 1 is slower):")
+    for name, timings in results["results"].items():
+        for size, seconds in timings.items():
+            previous_seconds = previous_results.get("results", {}).get(name, {}).get(size)
+            if previous_seconds:
+                print(f"{name:<28} {size:>6} texture sets: x{seconds / previous_seconds:.2f}")
+
+def main(argv:List[str]=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Custom Exporter hot paths on synthetic projects.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Numbers of texture sets of the synthetic projects")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs per benchmark, the best time is kept")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="Seconds spent in every stand-in API call")
+    parser.add_argument("--export-latency", type=float, default=0.0, help="Seconds spent per exported map")
+    parser.add_argument("--no-widget", action="store_true", help="Skip the benchmarks that need PySide6")
+    parser.add_argument("--output", default="bench_results.json", help="Path of the JSON results")
+    parser.add_argument("--compare", default=None, help="JSON results of another commit to compare with")
+    args = parser.parse_args(argv)
+
+    substance_painter.configure(api_call=args.api_latency, export_per_map=args.export_latency)
+    results = run_benchmarks(args.sizes, args.repeat, not args.no_widget)
+    with open(args.output, "w", encoding="utf-8") as output_file:
+        json.dump(results, output_file, indent=2)
+    for name, skip_reason in results["skipped"].items():
+        print(f"{name:<28} skipped: {skip_reason}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as previous_file:
+            compare_results(results, json.load(previous_file))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
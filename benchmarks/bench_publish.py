@@ -0,0 +1,98 @@
+"""Benchmark of the publish step of local staging, with two local folders standing in for the scratch folder and the share.
+Usage:
+python benchmarks/bench_publish.py
+python benchmarks/bench_publish.py --scratch-dir D:/Scratch --share-dir //server/Textures/bench --texture-sets 200 --workers 1 8 16
+python benchmarks/bench_publish.py --dedup --duplicates 0.5"""
+
+# Default Utils imports
+import argparse
+import filecmp
+import json
+import os
+import shutil
+import sys
+import tempfile
+from typing import Dict, List
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCHMARKS_DIR), "modules"))
+
+#Custom exporter modules
+import module_export_dedup
+import module_export_publish
+
+MAP_NAMES = ["BaseColor", "Normal", "OcclusionRoughnessMetallic", "Emissive"]
+
+SHARED_CONTENT_COUNT = 4 #Distinct contents of the duplicated maps, e.g. flat normals and empty emissives
+
+def write_staged_files(staging_dir:str, texture_set_count:int, map_count:int, map_size:int, duplicate_ratio:float=0.0) -> Dict[str, List[str]]:
+    """ Random content, so a copy can't be faster than the bytes it writes. The duplicated maps share a few random contents. """
+    staged_files = {}
+    shared_contents = [os.urandom(map_size) for _ in range(SHARED_CONTENT_COUNT)] if duplicate_ratio > 0 else []
+    file_index = 0
+    for i in range(texture_set_count):
+        texture_set_name = f"PROP_CHR_S_{i:04d}"
+        export_path = os.path.join(staging_dir, "Props", f"{texture_set_name}_Basic")
+        os.makedirs(export_path, exist_ok=True)
+        for map_index in range(map_count):
+            file_path = os.path.join(export_path, f"{texture_set_name}_{MAP_NAMES[map_index % len(MAP_NAMES)]}{map_index // len(MAP_NAMES) or ''}.png")
+            is_duplicate = (file_index * duplicate_ratio) % 1.0 + duplicate_ratio >= 1.0 #Spreads the duplicates evenly over the maps
+            with open(file_path, "wb") as staged_file:
+                staged_file.write(shared_contents[file_index % SHARED_CONTENT_COUNT] if is_duplicate else os.urandom(map_size))
+            file_index += 1
+            staged_files.setdefault(texture_set_name, []).append(file_path)
+    return staged_files
+
+def check_published_files(publish_result, staging_dir:str, share_dir:str) -> int:
+    """ Number of published files that differ from their staged file. """
+    mismatch_count = 0
+    for file_paths in publish_result.published_files.values():
+        for published_path in file_paths:
+            staged_path = os.path.join(staging_dir, os.path.relpath(published_path, share_dir))
+            if not filecmp.cmp(staged_path, published_path, shallow=False):
+                mismatch_count += 1
+    return mismatch_count
+
+def main(argv:List[str]=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the publish step of local staging between two folders.")
+    parser.add_argument("--scratch-dir", default=None, help="Folder of the staged files, a temporary folder by default")
+    parser.add_argument("--share-dir", default=None, help="Folder the files are published to, a temporary folder by default")
+    parser.add_argument("--texture-sets", type=int, default=50)
+    parser.add_argument("--maps", type=int, default=4, help="Maps per texture set")
+    parser.add_argument("--map-kb", type=int, default=1024, help="Size of every map, in KB")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, module_export_publish.MAX_WORKERS])
+    parser.add_argument("--dedup", action="store_true", help="Publish through a content store, twice per run")
+    parser.add_argument("--duplicates", type=float, default=0.25, help="Ratio of the maps sharing their content with other maps, with --dedup")
+    parser.add_argument("--output", default=None, help="Path of the JSON results")
+    args = parser.parse_args(argv)
+
+    scratch_dir = args.scratch_dir or tempfile.mkdtemp(prefix="bench_scratch_")
+    share_dir = args.share_dir or tempfile.mkdtemp(prefix="bench_share_")
+    staging_dir = module_export_publish.create_staging_dir(scratch_dir)
+    results = []
+    try:
+        staged_files = write_staged_files(staging_dir, args.texture_sets, args.maps, args.map_kb * 1024, args.duplicates if args.dedup else 0.0)
+        for worker_count in args.workers:
+            publish_dir = os.path.join(share_dir, f"publish_{worker_count}_workers")
+            for run_name in (["first", "incremental"] if args.dedup else [""]):
+                content_store = module_export_dedup.ContentStore(publish_dir) if args.dedup else None
+                publish_result = module_export_publish.publish_staged_files(staged_files, staging_dir, publish_dir, max_workers=worker_count, content_store=content_store)
+                mismatch_count = check_published_files(publish_result, staging_dir, publish_dir)
+                print(f"{worker_count:>3} workers{f' ({run_name})' if run_name else ''}: {publish_result.summary()}, {mismatch_count} mismatching files")
+                results.append({"workers": worker_count, "run": run_name, "files": publish_result.file_count, "bytes": publish_result.byte_count,
+                                "copied_bytes": publish_result.copied_byte_count, "duration": publish_result.duration,
+                                "errors": publish_result.errors, "mismatching_files": mismatch_count})
+            shutil.rmtree(publish_dir, ignore_errors=True)
+    finally:
+        module_export_publish.remove_staging_dir(staging_dir)
+        for folder, folder_arg in ((scratch_dir, args.scratch_dir), (share_dir, args.share_dir)):
+            if folder_arg is None: #Only the temporary folders made by the benchmark are removed
+                shutil.rmtree(folder, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump({"settings": vars(args), "results": results}, output_file, indent=2)
+    return 0 if all(result["mismatching_files"] == 0 and len(result["errors"]) == 0 for result in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Startup benchmark of the plugin: plugin load and first table fill, in fresh processes. Exits with 1 over budget. Needs PySide6.
+Usage:
+python benchmarks/bench_startup.py --budget-ms 120
+python benchmarks/bench_startup.py --texture-sets 1000 --runs 10 --output startup_results.json"""
+
+# Default Utils imports
+import argparse
+import compileall
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+DEFAULT_BUDGET_MS = 120.0
+FILL_TIMEOUT = 30.0
+
+def run_child(texture_set_count:int) -> Dict[str, float]:
+    """ Times one cold start of the plugin, in the current process. """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "backend"))
+    sys.path.insert(0, os.path.join(REPO_DIR, "modules"))
+    sys.path.insert(0, os.path.join(REPO_DIR, "plugins"))
+
+    #Already loaded by Substance Painter before any plugin starts, so not part of the plugin load
+    from PySide6.QtWidgets import QApplication #Loads QtCore and QtGui too
+    import substance_painter
+    application = QApplication.instance() or QApplication([])
+    if texture_set_count > 0: #Within the resolution budget of every asset type, so no dialog is opened
+        substance_painter.project.create_synthetic([{"name": f"PROP_CHR_S_{i:02d}", "resolution": [512, 512]} for i in range(texture_set_count)], "Startup")
+
+    start_time = time.perf_counter()
+    import custom_exporter
+    import_time = time.perf_counter()
+    custom_exporter.start_plugin()
+    start_plugin_time = time.perf_counter()
+
+    #The table is filled on the event loop turn after the widget is shown
+    table_model = custom_exporter.custom_expo.texture_table_model
+    while table_model.rowCount() < texture_set_count and time.perf_counter() - start_plugin_time < FILL_TIMEOUT:
+        application.processEvents()
+    custom_exporter.custom_expo.refresh_scheduler.run_pending_refresh()
+    first_fill_time = time.perf_counter()
+
+    return {
+        "import_ms": (import_time - start_time) * 1000,
+        "start_plugin_ms": (start_plugin_time - import_time) * 1000,
+        "plugin_load_ms": (start_plugin_time - start_time) * 1000,
+        "first_fill_ms": (first_fill_time - start_plugin_time) * 1000,
+    }
+
+def run_startups(runs:int, texture_set_count:int, is_dev:bool) -> List[Dict[str, float]]:
+    #Bytecode is compiled once beforehand, like for an installed plugin, so the runs don't time the compilation of the sources
+    for folder_name in ("modules", "plugins"):
+        compileall.compile_dir(os.path.join(REPO_DIR, folder_name), quiet=1)
+    environment = dict(os.environ, QT_QPA_PLATFORM="offscreen", CUSTOM_EXPORTER_DEV="1" if is_dev else "0")
+    timings = []
+    for _ in range(runs):
+        child = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", "--texture-sets", str(texture_set_count)],
+                               env=environment, capture_output=True, text=True)
+        if child.returncode != 0:
+            raise RuntimeError(f"Startup run failed:\n{child.stderr}")
+        timings.append(json.loads(child.stdout.strip().splitlines()[-1]))
+    return timings
+
+def main(argv:List[str]=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Custom Exporter plugin startup against a time budget.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts, the median is kept")
+    parser.add_argument("--texture-sets", type=int, default=100, help="Number of texture sets of the project open when the plugin starts, 0 for no project")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Maximum median plugin load time, in milliseconds")
+    parser.add_argument("--dev", action="store_true", help="Start the plugin in dev mode, with CUSTOM_EXPORTER_DEV=1")
+    parser.add_argument("--output", default=None, help="Path of the JSON results")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_child(args.texture_sets)))
+        return 0
+
+    if importlib.util.find_spec("PySide6") is None:
+        print("Startup benchmark skipped, PySide6 is not available")
+        return 0
+
+    timings = run_startups(args.runs, args.texture_sets, args.dev)
+    medians = {phase: statistics.median(timing[phase] for timing in timings) for phase in timings[0]}
+    for phase, milliseconds in medians.items():
+        print(f"{phase:<18} {milliseconds:10.2f} ms")
+    is_within_budget = medians["plugin_load_ms"] <= args.budget_ms
+    print(f"Plugin load {'within' if is_within_budget else 'OVER'} the budget of {args.budget_ms:.0f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump({"settings": vars(args), "medians": medians, "runs": timings, "within_budget": is_within_budget}, output_file, indent=2)
+    return 0 if is_within_budget else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
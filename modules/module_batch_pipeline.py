@@ -0,0 +1,152 @@
+"""Command-line entry point to validate and export many projects without the widget, across a pool of worker processes.
+--backend-path puts a stand-in substance_painter package first on sys.path, e.g. benchmarks/backend on machines without Painter.
+Usage:
+python module_batch_pipeline.py --asset-type Props --export-root D:/Textures --report report.json A.spp B.spp
+python module_batch_pipeline.py --asset-type Props --project-list projects.txt --validate-only --backend-path path/to/backend"""
+
+# Default Utils imports
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+MODULES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def init_worker(backend_path:Optional[str]):
+    """ Makes the backend and the custom exporter modules importable in a worker process. """
+    if MODULES_DIR not in sys.path:
+        sys.path.insert(0, MODULES_DIR)
+    if backend_path:
+        sys.path.insert(0, os.path.abspath(backend_path))
+
+def validate_texture_sets(asset_type:str, texture_sets:List) -> List[Dict]:
+    import module_uv_tiles
+    import module_validation_name
+    import module_validation_resolution
+
+    names = [texture_set.name() for texture_set in texture_sets]
+    name_validation_results = module_validation_name.validate_names(asset_type, names)
+    texture_set_reports = []
+    for texture_set, name_validation_result in zip(texture_sets, name_validation_results):
+        resolution = texture_set.get_resolution()
+        tile_resolutions = module_uv_tiles.get_tile_resolutions(texture_set)
+        if len(tile_resolutions) > 0: #Every UV tile has to be within the budget
+            res_is_valid, res_validation_details = module_validation_resolution.validate_tile_res(asset_type, tile_resolutions)
+        else:
+            res_is_valid, res_validation_details = module_validation_resolution.validate_res(asset_type, resolution)
+        texture_set_reports.append({
+            "name": name_validation_result.texture_set_name,
+            "resolution": [resolution.width, resolution.height],
+            "uv_tiles": {str(module_uv_tiles.get_udim(u, v)): list(tile_resolution) for (u, v), tile_resolution in tile_resolutions.items()},
+            "name_valid": name_validation_result.is_valid,
+            "name_details": " ".join(name_validation_result.details.split()), #The details are formatted for tooltips
+            "res_valid": res_is_valid,
+            "res_details": " ".join(res_validation_details.split()),
+            "exported_files": [],
+        })
+    return texture_set_reports
+
+def export_texture_sets(texture_set_reports:List[Dict], asset_type:str, shader_type:str, export_root:str) -> List[str]:
+    """ Exports the valid texture sets of the open project. Returns the error messages of the failed export groups. """
+    import substance_painter
+    import module_export
+    import module_export_cache
+
+    export_jobs = [(report["name"], shader_type, module_export.build_export_path(export_root, asset_type, report["name"], shader_type)) 
+                   for report in texture_set_reports if report["name_valid"] and report["res_valid"]]
+    reports_by_name = {report["name"]: report for report in texture_set_reports}
+    export_errors = []
+    for export_config, texture_set_names in module_export.build_batch_export_configs(export_jobs):
+        export_result = substance_painter.export.export_project_textures(export_config)
+        if export_result.status != substance_painter.export.ExportStatus.Success:
+            export_errors.append(export_result.message)
+        for texture_set_name, exported_files in module_export_cache.group_exported_files(export_result.textures).items():
+            if texture_set_name in reports_by_name:
+                reports_by_name[texture_set_name]["exported_files"].extend(exported_files)
+    return export_errors
+
+def process_project(project_path:str, asset_type:str, shader_type:str, export_root:str, should_export:bool) -> Dict:
+    """ Validates, and optionally exports, one project. Runs in a worker process. """
+    import substance_painter
+
+    start_time = time.perf_counter()
+    project_report = {"project": project_path, "status": "ok", "errors": [], "texture_sets": []}
+    try:
+        substance_painter.project.open(project_path)
+        try:
+            texture_set_reports = validate_texture_sets(asset_type, substance_painter.textureset.all_texture_sets())
+            project_report["texture_sets"] = texture_set_reports
+            if should_export:
+                project_report["errors"] = export_texture_sets(texture_set_reports, asset_type, shader_type, export_root)
+        finally:
+            substance_painter.project.close()
+    except Exception as error: #One broken project must not stop the whole batch
+        project_report["errors"].append(f"{type(error).__name__}: {error}")
+
+    if len(project_report["errors"]) > 0:
+        project_report["status"] = "error"
+    elif not all(report["name_valid"] and report["res_valid"] for report in project_report["texture_sets"]):
+        project_report["status"] = "invalid"
+    project_report["duration"] = time.perf_counter() - start_time
+    return project_report
+
+def run_batch(project_paths:List[str], asset_type:str, shader_type:str, export_root:str, should_export:bool, 
+              backend_path:Optional[str]=None, workers:Optional[int]=None) -> Dict:
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(backend_path,)) as executor:
+        futures = [executor.submit(process_project, project_path, asset_type, shader_type, export_root, should_export) for project_path in project_paths]
+        project_reports = [future.result() for future in futures] #Same order as the project list
+
+    statuses = [project_report["status"] for project_report in project_reports]
+    return {
+        "asset_type": asset_type,
+        "shader_type": shader_type,
+        "export_root": export_root if should_export else None,
+        "summary": {
+            "projects": len(project_reports),
+            "ok": statuses.count("ok"),
+            "invalid": statuses.count("invalid"),
+            "error": statuses.count("error"),
+            "texture_sets": sum(len(project_report["texture_sets"]) for project_report in project_reports),
+            "duration": time.perf_counter() - start_time,
+        },
+        "projects": project_reports,
+    }
+
+def read_project_list(project_list_path:str) -> List[str]:
+    with open(project_list_path, "r", encoding="utf-8") as project_list_file:
+        return [line.strip() for line in project_list_file if line.strip() and not line.startswith("#")]
+
+def main(argv:Optional[List[str]]=None) -> int:
+    parser = argparse.ArgumentParser(description="Validate and export Substance Painter projects with the Custom Exporter rules.")
+    parser.add_argument("projects", nargs="*", help="Project files to process")
+    parser.add_argument("--project-list", help="Text file with one project file per line")
+    parser.add_argument("--asset-type", required=True, help="Asset type used for validation and export paths, e.g. Props")
+    parser.add_argument("--shader-type", default="Basic", help="Shader type selecting the export preset (default: Basic)")
+    parser.add_argument("--export-root", default="C:/ProjectName/Assets/Textures", help="Root of the export paths")
+    parser.add_argument("--validate-only", action="store_true", help="Only validate, don't export")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: number of CPUs)")
+    parser.add_argument("--backend-path", default=None, help="Directory containing the substance_painter package to use")
+    parser.add_argument("--report", default=None, help="Path of the JSON report (default: standard output)")
+    args = parser.parse_args(argv)
+
+    project_paths = list(args.projects)
+    if args.project_list:
+        project_paths.extend(read_project_list(args.project_list))
+    if len(project_paths) == 0:
+        parser.error("no projects to process")
+
+    report = run_batch(project_paths, args.asset_type, args.shader_type, args.export_root, not args.validate_only, args.backend_path, args.workers)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 0 if report["summary"]["ok"] == report["summary"]["projects"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
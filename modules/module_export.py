@@ -1,77 +1,315 @@
 # Substance Painter API import 
 import substance_painter
 
+#Custom exporter modules
+import module_export_manifest
+import module_trace
+import module_uv_tiles
+
 # Default utils imports
 from math import log2
-from os import startfile
+import os
+import time
 
-def get_export_preset_from_shader_type(shader_type):
-    custom_export_presets = {
-        "Basic" : "Custom_Basic",
-        "Armament" : "Custom_Armament",
-        "Morph" : "Custom_Morph",
-        }
+PADDING_ALGORITHM = "infinite"
+SOURCE_SHADER_TYPE = "Sources" #Exports the unpacked source maps, see module_texture_packing
+
+CUSTOM_EXPORT_PRESETS = {
+    "Basic" : "Custom_Basic",
+    "Armament" : "Custom_Armament",
+    "Morph" : "Custom_Morph",
+    SOURCE_SHADER_TYPE : "Custom_Sources",
+    }
+
+def has_export_preset(shader_type):
+    return shader_type in CUSTOM_EXPORT_PRESETS
 
-    export_preset_name = custom_export_presets.get(shader_type)
+def get_export_preset_from_shader_type(shader_type):
+    export_preset_name = CUSTOM_EXPORT_PRESETS.get(shader_type)
     if export_preset_name is None:
-        substance_painter.logging.log(substance_painter.logging.ERROR, "Custom Exporter", f"There is no export preset for the specified shader type {shader_type}")
+        substance_painter.logging.log(substance_painter.logging.ERROR, "Custom Exporter", f"There is no export preset for the specified shader type {shader_type}. Check Single Source Export to pack it from the source maps instead.")
     return export_preset_name
                                                        
 
+def build_export_path(export_root, asset_type, texture_set_name, shader_type):
+    return f"{export_root}/{asset_type}/{texture_set_name}_{shader_type}/"
+
+def get_texture_set_size_log2(texture_set):
+    resolution = texture_set.get_resolution()
+    return [log2(resolution.width), log2(resolution.height)]
+
+def build_stack_export_entries(texture_set, tiles=None):
+    """
+    Builds the exportList entry of a texture set and its exportParameters entries, filtered on its stack.
+    Texture sets with UV tiles get one exportParameters entry per tile resolution, and only the given (u, v) tiles are exported.
+    Returns (export_list_entry, export_parameters_entries).
+    """
+    texture_set_stack = str(texture_set.get_stack())
+    export_list_entry = {"rootPath": texture_set_stack}
+    tile_resolutions = module_uv_tiles.get_tile_resolutions(texture_set)
+    if len(tile_resolutions) == 0:
+        return export_list_entry, [{
+            "filter": {"dataPaths": [texture_set_stack]},
+            "parameters": {
+                "paddingAlgorithm": PADDING_ALGORITHM,
+                "sizeLog2": get_texture_set_size_log2(texture_set)
+            }
+        }]
+
+    if tiles is not None:
+        tiles = [tile for tile in tiles if tuple(tile) in tile_resolutions]
+        export_list_entry["filter"] = {"uvTiles": [list(tile) for tile in tiles]}
+    tiles_by_resolution = module_uv_tiles.group_tiles_by_resolution(tile_resolutions, tiles)
+    export_parameters_entries = []
+    for (width, height), resolution_tiles in tiles_by_resolution.items():
+        export_parameters_filter = {"dataPaths": [texture_set_stack]}
+        if len(tiles_by_resolution) > 1: #Tiles with the same resolution don't need a tile filter
+            export_parameters_filter["uvTiles"] = resolution_tiles
+        export_parameters_entries.append({
+            "filter": export_parameters_filter,
+            "parameters": {
+                "paddingAlgorithm": PADDING_ALGORITHM,
+                "sizeLog2": [log2(width), log2(height)]
+            }
+        })
+    return export_list_entry, export_parameters_entries
+
 def build_export_config(texture_set_name, shader_type, export_path):
     texture_set = substance_painter.textureset.TextureSet.from_name(texture_set_name)
-    texture_set_stack = texture_set.get_stack()
 
     export_preset_name = get_export_preset_from_shader_type(shader_type)
 
     export_preset_id = substance_painter.resource.ResourceID("custom_lib", export_preset_name)
 
-    resolution = texture_set.get_resolution()
-    resolution = [log2(resolution.width), log2(resolution.height)]
+    # Filtered on the stack, and on the UV tiles when their resolutions differ
+    export_list_entry, export_parameters_entries = build_stack_export_entries(texture_set)
 
     export_config = {
     "exportShaderParams": False,
     "exportPath": export_path,
     "defaultExportPreset" : export_preset_id.url(),
-    "exportList": [
-        {
-            "rootPath": str(texture_set_stack)
-        }
-        ],
-    "exportParameters": [
-        # No filters: those parameters apply to all exported maps
-        {
-            "parameters": {
-                "paddingAlgorithm": "infinite",
-                "sizeLog2": resolution
-            }
-        },
-        ]
+    "exportList": [export_list_entry],
+    "exportParameters": export_parameters_entries
     }
     return export_config
 
+def get_folder_pattern(texture_set_name, export_path):
+    """
+    Splits the export path of a texture set into its parent folder and its own folder, as a file name pattern of the export preset,
+    e.g. .../Props/PROP_CHR_S_01_Basic/ -> (.../Props/, "$textureSet_Basic/"), so all texture sets of a parent folder are exported by one call.
+    Export paths whose folder is not named after their texture set, or without preset maps to add the pattern to, are kept whole.
+    """
+    parent_path, _, folder_name = export_path.rstrip("/").rpartition("/")
+    if parent_path == "" or not folder_name.startswith(texture_set_name) or not hasattr(substance_painter.export, "ResourceExportPreset"):
+        return export_path, ""
+    return f"{parent_path}/", f"$textureSet{folder_name[len(texture_set_name):]}/"
+
+_preset_output_maps = {}
+
+def get_preset_output_maps(export_preset_name):
+    """ Output maps of an export preset of the library, in the format of the export configs, read once per session. """
+    if export_preset_name not in _preset_output_maps:
+        export_preset_id = substance_painter.resource.ResourceID("custom_lib", export_preset_name)
+        _preset_output_maps[export_preset_name] = substance_painter.export.ResourceExportPreset(export_preset_id).list_output_maps()
+    return _preset_output_maps[export_preset_name]
+
+def build_group_export_config(export_preset_name, export_path, folder_pattern):
+    """ Export config of a group without export entries. A folder pattern is added in front of the file name of every map of the preset. """
+    export_preset_id = substance_painter.resource.ResourceID("custom_lib", export_preset_name)
+    export_config = {
+        "exportShaderParams": False,
+        "exportPath": export_path,
+        "defaultExportPreset" : export_preset_id.url(),
+        "exportList": [],
+        "exportParameters": [],
+        }
+    if folder_pattern:
+        output_maps = [dict(output_map, fileName=f"{folder_pattern}{output_map['fileName']}") for output_map in get_preset_output_maps(export_preset_name)]
+        export_config["exportPresets"] = [{"name": export_preset_name, "maps": output_maps}]
+        export_config["defaultExportPreset"] = export_preset_name
+    return export_config
+
+def get_group_export_path(export_config, texture_set_name):
+    """ Folder the maps of a texture set of a group are exported to, its own folder when the preset of the group has a folder pattern. """
+    export_presets = export_config.get("exportPresets", [])
+    if len(export_presets) == 0 or len(export_presets[0]["maps"]) == 0:
+        return export_config["exportPath"]
+    folder_pattern = export_presets[0]["maps"][0]["fileName"].rpartition("/")[0]
+    return f"{export_config['exportPath']}{folder_pattern.replace('$textureSet', texture_set_name)}/"
+
+def build_batch_export_configs(export_jobs, tile_filters=None):
+    """
+    Groups export jobs, given as (texture_set_name, shader_type, export_path) tuples,
+    by export preset and parent folder of their export path, and builds one export config per group.
+    The folder of each texture set, e.g. PROP_CHR_S_01_Basic/, is part of the file names of the group preset, see get_folder_pattern.
+    Each texture set of a group gets its own exportList entry, and its own
+    exportParameters entries filtered on its stack, so it keeps its own resolution, per UV tile.
+    tile_filters is an optional texture set name -> (u, v) tiles dictionary, to export only some tiles of these texture sets.
+    Returns a list of (export_config, texture_set_names) tuples, in the order the groups were first seen.
+    """
+    with module_trace.span("build_export_config", texture_sets=len(export_jobs)):
+        return build_export_groups(export_jobs, tile_filters if tile_filters is not None else {})
+
+def build_export_groups(export_jobs, tile_filters):
+    export_groups = {}
+    for texture_set_name, shader_type, export_path in export_jobs:
+        export_preset_name = get_export_preset_from_shader_type(shader_type)
+        if export_preset_name is None: #The error is already logged, the texture set is skipped
+            continue
+
+        group_path, folder_pattern = get_folder_pattern(texture_set_name, export_path)
+        group_key = (export_preset_name, group_path, folder_pattern)
+        if group_key not in export_groups:
+            export_groups[group_key] = (build_group_export_config(export_preset_name, group_path, folder_pattern), [])
+        export_config, texture_set_names = export_groups[group_key]
+
+        texture_set = substance_painter.textureset.TextureSet.from_name(texture_set_name)
+        export_list_entry, export_parameters_entries = build_stack_export_entries(texture_set, tile_filters.get(texture_set_name))
+        export_config["exportList"].append(export_list_entry)
+        export_config["exportParameters"].extend(export_parameters_entries)
+        texture_set_names.append(texture_set_name)
+    return list(export_groups.values())
+
+class BatchExportResult:
+    """ Merged result of several export_project_textures calls, with the same fields as substance_painter.export.TextureExportResult. """
+    def __init__(self):
+        self.status = substance_painter.export.ExportStatus.Success
+        self.message = ""
+        self.textures = {}
+        self.manifest = None #ExportManifest of the run, written by finish_batch_export, or once its staged files are published
+        self.journal = None #ExportJournal of the run, None when the run is not journaled
+        self.content_store_root = None #Export root the run writes to directly, when it holds a content store (module_export_dedup)
+
+    def merge(self, export_result):
+        if export_result.status != substance_painter.export.ExportStatus.Success:
+            if self.status == substance_painter.export.ExportStatus.Success: #The first failure decides the status of the whole batch
+                self.status = export_result.status
+            self.message = f"{self.message}\n{export_result.message}" if self.message else export_result.message
+        for stack, exported_files in export_result.textures.items():
+            self.textures.setdefault(stack, []).extend(exported_files)
+
 def open_explorer_at_path(path):
-    startfile(path)
+    if hasattr(os, "startfile"): #Only available on Windows, headless runs on other platforms don't open anything
+        os.startfile(path)
 
 def exporting(texture_set_name, shader_type, export_path):
     if not substance_painter.project.is_open():
         return
     
-    export_config = build_export_config(texture_set_name, shader_type, export_path)
+    with module_trace.span("build_export_config", texture_sets=1):
+        export_config = build_export_config(texture_set_name, shader_type, export_path)
     
     substance_painter.logging.log(substance_painter.logging.INFO, "Custom Exporter", "Performing Texture Exporting!")
-    export_result = substance_painter.export.export_project_textures(export_config) 
+    start_time = time.perf_counter()
+    with module_trace.span("export_project_textures", texture_sets=1):
+        export_result = substance_painter.export.export_project_textures(export_config) 
 
     # In case of error, display a human readable message: 
     if export_result.status == substance_painter.export.ExportStatus.Success: 
         open_explorer_at_path(export_path)
     else:
         substance_painter.logging.log(substance_painter.logging.WARNING, "Custom Exporter", export_result.message)
-        print(export_result.message) 
 
-    # Display the details of what was exported: 
-    for k,v in export_result.textures.items(): 
-        substance_painter.logging.log(substance_painter.logging.INFO, "Custom Exporter", f"Stack {k}:")
-        for exported in v:
-            substance_painter.logging.log(substance_painter.logging.INFO, "Custom Exporter", exported)
+    manifest = module_export_manifest.ExportManifest(export_path)
+    manifest.add_group(export_config, [texture_set_name], export_result, time.perf_counter() - start_time)
+    log_export_manifest(manifest)
+
+def log_export_manifest(manifest):
+    # The details of what was exported are written once to the manifest file, the log only gets a summary:
+    with module_trace.span("post_export_logging", maps=len(manifest.entries)):
+        try:
+            manifest.write()
+        except OSError as error: #The maps are exported, only their manifest is missing, e.g. on a full disk or a read-only export root
+            substance_painter.logging.log(substance_painter.logging.WARNING, "Custom Exporter", f"The export manifest could not be written: {error}")
+        substance_painter.logging.log(substance_painter.logging.INFO, "Custom Exporter", manifest.summary())
+
+def get_folders_to_open(export_paths):
+    """ One folder per drive: the common folder of the destination folders, so a batch opens one window instead of one per texture set. """
+    folders_by_drive = {}
+    for export_path in export_paths:
+        folder = os.path.normpath(export_path)
+        folders_by_drive.setdefault(os.path.splitdrive(folder)[0].lower(), []).append(folder)
+    return [os.path.commonpath(folders) for folders in folders_by_drive.values()]
+
+def get_manifest_dir(export_jobs):
+    """ Default folder of the manifest: the common folder of all export paths. """
+    export_folders = [os.path.normpath(export_path) for _, _, export_path in export_jobs]
+    if len(export_folders) == 0:
+        return os.getcwd()
+    try:
+        return os.path.commonpath(export_folders)
+    except ValueError: #Folders on different drives have no common path
+        return export_folders[0]
+
+def start_batch_export(export_jobs, manifest_dir=None, journal=None, content_store_root=None):
+    """
+    The journal is begun with the texture sets of the jobs, unless its caller began it already.
+    content_store_root is the export root of the jobs when they write to it directly and it holds a content store,
+    the linked maps of every texture set are then moved aside before it is exported again.
+    """
+    batch_result = BatchExportResult()
+    batch_result.manifest = module_export_manifest.ExportManifest(manifest_dir if manifest_dir is not None else get_manifest_dir(export_jobs))
+    batch_result.journal = journal
+    batch_result.content_store_root = content_store_root
+    if journal is not None and journal.batch_id is None:
+        journal.begin(list(dict.fromkeys(texture_set_name for texture_set_name, _, _ in export_jobs)))
+    return batch_result
+
+def exporting_batch(export_jobs, manifest_dir=None, tile_filters=None, journal=None, content_store_root=None):
+    """
+    Exports all (texture_set_name, shader_type, export_path) jobs with one export_project_textures call
+    per export preset and parent folder of the export paths, instead of one call per texture set.
+    With a journal (module_export_journal), every texture set is journaled when it starts and when its files are exported.
+    Returns the merged export result.
+    """
+    if not substance_painter.project.is_open() or len(export_jobs) == 0:
+        return None
+
+    batch_result = start_batch_export(export_jobs, manifest_dir, journal, content_store_root)
+    exported_paths = []
+    substance_painter.logging.log(substance_painter.logging.INFO, "Custom Exporter", f"Performing Batch Texture Exporting of {len(export_jobs)} texture sets!")
+    for export_config, texture_set_names in build_batch_export_configs(export_jobs, tile_filters):
+        export_group(export_config, texture_set_names, batch_result, exported_paths)
+    finish_batch_export(batch_result, exported_paths)
+    return batch_result
+
+def export_group(export_config, texture_set_names, batch_result, exported_paths):
+    """ Exports one group built by build_batch_export_configs and merges its result into the batch result and its manifest. """
+    journal = batch_result.journal
+    export_paths = {texture_set_name: get_group_export_path(export_config, texture_set_name) for texture_set_name in texture_set_names}
+    if journal is not None:
+        journal.record_start(export_paths)
+    moved_paths = []
+    if batch_result.content_store_root is not None: #Maps published as hardlinks by an earlier export would all be written through
+        import module_export_dedup #Imported on first use
+        for texture_set_name, export_path in export_paths.items():
+            moved_paths.extend(module_export_dedup.set_linked_files_aside(export_path, texture_set_name))
+    start_time = time.perf_counter()
+    export_result = None
+    try:
+        with module_trace.span("export_project_textures", texture_sets=len(export_config["exportList"])):
+            export_result = substance_painter.export.export_project_textures(export_config)
+    finally:
+        if len(moved_paths) > 0: #A failed or raising export gets its previous maps back
+            module_export_dedup.restore_linked_files(moved_paths, is_exported=export_result is not None and export_result.status == substance_painter.export.ExportStatus.Success)
+    batch_result.merge(export_result)
+    batch_result.manifest.add_group(export_config, texture_set_names, export_result, time.perf_counter() - start_time)
+    if export_result.status == substance_painter.export.ExportStatus.Success:
+        exported_paths.extend(export_paths.values())
+        if journal is not None and journal.commit_on_export:
+            import module_export_cache #Imported on first use
+            exported_files = module_export_cache.group_exported_files(export_result.textures)
+            journal.record_commit({texture_set_name: exported_files[texture_set_name] for texture_set_name in texture_set_names if texture_set_name in exported_files})
+    return export_result
+
+def finish_batch_export(batch_result, exported_paths, is_staged=False):
+    """ is_staged is True when the exported files are staged, their folders are opened and the manifest is written once they are published. """
+    if batch_result.status != substance_painter.export.ExportStatus.Success:
+        substance_painter.logging.log(substance_painter.logging.WARNING, "Custom Exporter", batch_result.message)
 
+    if not is_staged:
+        for folder in get_folders_to_open(exported_paths):
+            open_explorer_at_path(folder)
+        log_export_manifest(batch_result.manifest)
+    if batch_result.journal is not None and batch_result.journal.commit_on_export: #The other runs are ended once their files are packed or published
+        batch_result.journal.end()
@@ -0,0 +1,107 @@
+"""Skips the texture sets whose inputs have not changed since their last export.
+The fingerprint of a texture set (preset, resolution, padding, export path, content revision) is cached next to the export root,
+with the size and modification time of its files. Texture sets with UV tiles get one entry per tile, keyed <TextureSet>.<UDIM>."""
+
+#Custom exporter modules
+import module_uv_tiles
+
+# Default Utils imports
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+CACHE_FILE_NAME = ".custom_exporter_cache.json"
+CACHE_VERSION = 1
+
+def build_fingerprint(export_preset_name:str, resolution:List[int], padding_algorithm:str, export_path:str, content_revision:Optional[str]) -> Optional[str]:
+    """ Returns None when the content revision is unknown, so the texture set is never skipped. """
+    if content_revision is None:
+        return None
+    fingerprint_data = json.dumps([export_preset_name, list(resolution), padding_algorithm, os.path.normpath(export_path), content_revision])
+    return hashlib.sha1(fingerprint_data.encode("utf-8")).hexdigest()
+
+def get_tile_key(texture_set_name:str, udim:int) -> str:
+    return f"{texture_set_name}.{udim}"
+
+def get_file_state(file_path:str) -> Optional[List[int]]:
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return None
+    return [file_stat.st_size, file_stat.st_mtime_ns]
+
+class ExportCache:
+    """ Fingerprint cache of the texture sets exported under one export root. """
+    def __init__(self, export_root:str):
+        self.export_root = export_root
+        self.cache_path = os.path.join(export_root, CACHE_FILE_NAME)
+        self.entries = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+                cache_data = json.load(cache_file)
+        except (OSError, ValueError): #A missing or corrupted cache only means that everything is exported again
+            return
+        if cache_data.get("version") == CACHE_VERSION:
+            self.entries = cache_data.get("entries", {})
+
+    def save(self):
+        os.makedirs(self.export_root, exist_ok=True)
+        temp_path = f"{self.cache_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump({"version": CACHE_VERSION, "entries": self.entries}, cache_file, indent=1)
+        os.replace(temp_path, self.cache_path) #The cache is never left half-written
+
+    def is_up_to_date(self, texture_set_name:str, fingerprint:Optional[str]) -> bool:
+        entry = self.entries.get(texture_set_name)
+        if fingerprint is None or entry is None or entry["fingerprint"] != fingerprint:
+            return False
+        if len(entry["files"]) == 0:
+            return False
+        for file_path, file_state in entry["files"].items():
+            if get_file_state(file_path) != file_state:
+                return False
+        return True
+
+    def get_duration(self, texture_set_name:str) -> float:
+        entry = self.entries.get(texture_set_name)
+        return entry["duration"] if entry is not None else 0.0
+
+    def record(self, texture_set_name:str, project_name:str, fingerprint:Optional[str], exported_files:List[str], duration:float, parent_name:Optional[str]=None):
+        """ The entry of a UV tile is recorded under its tile key, with the name of its texture set as parent_name. """
+        if fingerprint is None:
+            self.entries.pop(texture_set_name, None)
+            return
+        self.entries[texture_set_name] = {
+            "project": project_name,
+            "texture_set": parent_name if parent_name is not None else texture_set_name,
+            "fingerprint": fingerprint,
+            "files": {file_path: get_file_state(file_path) for file_path in exported_files},
+            "duration": duration,
+        }
+
+    def evict_deleted(self, project_name:str, existing_names:List[str]) -> int:
+        """ Removes the entries of the project whose texture sets don't exist anymore. Entries of other projects are kept. """
+        existing_names = set(existing_names)
+        deleted_names = [name for name, entry in self.entries.items() if entry["project"] == project_name and entry.get("texture_set", name) not in existing_names]
+        for name in deleted_names:
+            del self.entries[name]
+        return len(deleted_names)
+
+def group_exported_files(export_result_textures:Dict) -> Dict[str, List[str]]:
+    """ Groups the exported files of an export result by texture set name. Keys of the result are (texture set name, stack name). """
+    exported_files = {}
+    for stack_key, file_paths in export_result_textures.items():
+        texture_set_name = stack_key[0] if isinstance(stack_key, tuple) else str(stack_key).split("/")[0]
+        exported_files.setdefault(texture_set_name, []).extend(file_paths)
+    return exported_files
+
+def group_files_by_udim(file_paths:List[str]) -> Dict[Optional[int], List[str]]:
+    """ Groups the exported files of one texture set by UV tile, None for the files without a UDIM number. """
+    files_by_udim = {}
+    for file_path in file_paths:
+        files_by_udim.setdefault(module_uv_tiles.get_udim_from_file_path(file_path), []).append(file_path)
+    return files_by_udim
@@ -0,0 +1,158 @@
+"""Content store of the export root: every distinct map is stored once, named after its SHA-1,
+and published maps are hardlinks to it. Nothing of the exporter writes a linked map in place,
+the stored copies no map links to are pruned after every publish."""
+
+#Custom exporter modules
+import module_export_publish
+
+# Default Utils imports
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+STORE_FOLDER_NAME = ".texture_store"
+SET_ASIDE_SUFFIX = ".linked" #Suffix of the linked maps moved aside while their texture set is exported again
+INDEX_FILE_NAME = "index.json"
+INDEX_VERSION = 1
+MAX_WORKERS = 8
+
+def hash_files(file_paths:List[str], max_workers:int=MAX_WORKERS) -> Dict[str, Optional[str]]:
+    """ File path -> SHA-1 checksum, read in chunks, in parallel. None for the files that can't be read. """
+    def process(file_path):
+        try:
+            return module_export_publish.get_file_checksum(file_path)
+        except OSError:
+            return None
+
+    unique_paths = list(dict.fromkeys(file_paths))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(unique_paths, executor.map(process, unique_paths)))
+
+class ContentStore:
+    """ Content-addressed copies of the published maps of one export root, with a persistent index: checksum -> {"size": bytes}. """
+    def __init__(self, export_root:str):
+        self.store_dir = os.path.join(export_root, STORE_FOLDER_NAME)
+        self.index_path = os.path.join(self.store_dir, INDEX_FILE_NAME)
+        self.entries = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as index_file:
+                index_data = json.load(index_file)
+        except (OSError, ValueError): #A missing or corrupted index only means that the contents are stored again
+            return
+        if index_data.get("version") == INDEX_VERSION:
+            self.entries = index_data.get("entries", {})
+
+    def save(self):
+        os.makedirs(self.store_dir, exist_ok=True)
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as index_file:
+            json.dump({"version": INDEX_VERSION, "entries": self.entries}, index_file)
+        os.replace(temp_path, self.index_path) #The index is never left half-written
+
+    def get_object_path(self, checksum:str) -> str:
+        return os.path.join(self.store_dir, checksum[:2], checksum)
+
+    def contains(self, checksum:str) -> bool:
+        """ True when the content is indexed and its stored copy is still on disk, with the indexed size. """
+        entry = self.entries.get(checksum)
+        if entry is None:
+            return False
+        try:
+            if os.path.getsize(self.get_object_path(checksum)) == entry["size"]:
+                return True
+        except OSError:
+            pass
+        del self.entries[checksum] #The stored copy was removed or changed, the content is stored again
+        return False
+
+    def add(self, checksum:str, source_path:str) -> int:
+        """ Stores a copy of the file, verified against its checksum, and returns its size. Raises OSError or PublishError. """
+        object_path = self.get_object_path(checksum)
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        temp_path = f"{object_path}{module_export_publish.PUBLISHING_SUFFIX}"
+        try:
+            copied_checksum, byte_count = module_export_publish.copy_file(source_path, temp_path)
+            if copied_checksum != checksum or module_export_publish.get_file_checksum(temp_path) != checksum:
+                raise module_export_publish.PublishError(f"the stored copy of {os.path.basename(source_path)} does not match the exported file")
+            os.replace(temp_path, object_path)
+        except (OSError, module_export_publish.PublishError):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        self.entries[checksum] = {"size": byte_count}
+        return byte_count
+
+    def link(self, checksum:str, destination_path:str):
+        """ Hardlinks the stored copy to the destination. Raises OSError when the volume doesn't support hardlinks. """
+        os.link(self.get_object_path(checksum), destination_path)
+
+    def prune(self) -> int:
+        """ Removes the stored copies that no published map links to anymore, and returns their size. """
+        pruned_byte_count = 0
+        for checksum, entry in list(self.entries.items()):
+            object_path = self.get_object_path(checksum)
+            try:
+                if os.stat(object_path).st_nlink > 1:
+                    continue
+                os.remove(object_path)
+            except FileNotFoundError:
+                pass
+            except OSError: #Locked, it is pruned by a later publish
+                continue
+            del self.entries[checksum]
+            pruned_byte_count += entry["size"]
+        return pruned_byte_count
+
+def has_content_store(export_root:str) -> bool:
+    """ True when maps were published to the export root as hardlinks to its content store. """
+    return os.path.isdir(os.path.join(export_root, STORE_FOLDER_NAME))
+
+def set_linked_files_aside(folder:str, texture_set_name:str) -> List[str]:
+    """
+    Renames the maps of a texture set in a folder, named <TextureSet>_<Map> like every export preset names them,
+    that are hardlinked to other files, so exporting them again writes new files instead of writing through the link.
+    Returns the paths of the maps that were moved aside.
+    """
+    try:
+        file_names = os.listdir(folder)
+    except OSError: #Not exported yet
+        return []
+    moved_paths = []
+    for file_name in file_names:
+        file_path = os.path.join(folder, file_name)
+        try:
+            if file_name.startswith(f"{texture_set_name}_") and not file_name.endswith(SET_ASIDE_SUFFIX) and os.stat(file_path).st_nlink > 1:
+                os.replace(file_path, f"{file_path}{SET_ASIDE_SUFFIX}")
+                moved_paths.append(file_path)
+        except OSError: #A map that can't be moved is overwritten like before
+            continue
+    return moved_paths
+
+def restore_linked_files(moved_paths:List[str], is_exported:bool):
+    """
+    Moves the maps set aside back when their export failed, or when the export wrote no new file in their place.
+    The other maps set aside are removed, their content stays in the store and in the other linked maps.
+    """
+    for file_path in moved_paths:
+        set_aside_path = f"{file_path}{SET_ASIDE_SUFFIX}"
+        try:
+            if not is_exported or not os.path.exists(file_path):
+                os.replace(set_aside_path, file_path)
+            else:
+                os.remove(set_aside_path)
+        except OSError:
+            continue
+
+def list_set_aside_files(folder:str, texture_set_name:str) -> List[str]:
+    """ Original paths of the maps of a texture set left aside by an export that never finished. """
+    try:
+        return [os.path.join(folder, file_name[:-len(SET_ASIDE_SUFFIX)]) for file_name in os.listdir(folder)
+                if file_name.startswith(f"{texture_set_name}_") and file_name.endswith(SET_ASIDE_SUFFIX)]
+    except OSError:
+        return []
@@ -0,0 +1,135 @@
+"""Estimates the duration and disk size of an export before it runs, from the megapixels every texture set exports.
+The seconds per megapixel and bytes per pixel of every preset are refined after every export, and saved next to the export root."""
+
+#Substance Painter API import
+import substance_painter
+
+#Custom exporter modules
+import module_export
+import module_export_manifest
+
+# Default Utils imports
+import json
+import os
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+COST_MODEL_FILE_NAME = ".custom_exporter_cost_model.json"
+COST_MODEL_VERSION = 1
+DEFAULT_SECONDS_PER_MEGAPIXEL = 0.05
+DEFAULT_BYTES_PER_PIXEL = 2.0
+SMOOTHING = 0.3 #Weight of the last measured rate in the moving average
+
+class ExportEstimate(NamedTuple):
+    texture_set_name: str
+    export_preset_name: str
+    map_count: int
+    megapixels: float
+    duration: float
+    size_bytes: int
+
+def format_duration(duration:float) -> str:
+    if duration < 60:
+        return f"{duration:.1f} s"
+    return f"{int(duration // 60)} min {int(duration % 60):02d} s"
+
+def format_size(byte_count:int) -> str:
+    if byte_count >= 1024 ** 3:
+        return f"{byte_count / 1024 ** 3:.1f} GB"
+    return f"{byte_count / 1024 ** 2:.1f} MB"
+
+def format_estimate(estimate:ExportEstimate) -> str:
+    """ e.g. "~4.2 s, 48.0 MB" """
+    return f"~{format_duration(estimate.duration)}, {format_size(estimate.size_bytes)}"
+
+def get_files_size(file_paths:List[str]) -> Optional[int]:
+    """ Total size of the files, None when one of them can't be read. """
+    try:
+        return sum(os.path.getsize(file_path) for file_path in file_paths)
+    except OSError:
+        return None
+
+class ExportCostModel:
+    """ Rates of the exports under one export root, per export preset: preset name -> {"seconds_per_megapixel", "bytes_per_pixel", "sample_count"}. """
+    def __init__(self, export_root:str):
+        self.export_root = export_root
+        self.model_path = os.path.join(export_root, COST_MODEL_FILE_NAME)
+        self.rates = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.model_path, "r", encoding="utf-8") as model_file:
+                model_data = json.load(model_file)
+        except (OSError, ValueError): #A missing or corrupted model only means that the default rates are used
+            return
+        if model_data.get("version") == COST_MODEL_VERSION:
+            self.rates = model_data.get("rates", {})
+
+    def save(self):
+        os.makedirs(self.export_root, exist_ok=True)
+        temp_path = f"{self.model_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as model_file:
+            json.dump({"version": COST_MODEL_VERSION, "rates": self.rates}, model_file, indent=1)
+        os.replace(temp_path, self.model_path) #The model is never left half-written
+
+    def get_rates(self, export_preset_name:str) -> Dict:
+        return self.rates.get(export_preset_name, {"seconds_per_megapixel": DEFAULT_SECONDS_PER_MEGAPIXEL, "bytes_per_pixel": DEFAULT_BYTES_PER_PIXEL, "sample_count": 0})
+
+    def estimate(self, texture_set_name:str, export_preset_name:str, map_count:int, megapixels:float) -> ExportEstimate:
+        rates = self.get_rates(export_preset_name)
+        return ExportEstimate(texture_set_name, export_preset_name, map_count, megapixels,
+                              megapixels * rates["seconds_per_megapixel"], int(megapixels * 1e6 * rates["bytes_per_pixel"]))
+
+    def observe(self, export_preset_name:str, megapixels:float, duration:float, size_bytes:Optional[int]=None):
+        """ Refines the rates of the preset with a measured export. The first measure replaces the default rates. """
+        if megapixels <= 0:
+            return
+        rates = dict(self.get_rates(export_preset_name))
+        weight = SMOOTHING if rates["sample_count"] > 0 else 1.0
+        rates["seconds_per_megapixel"] += weight * (duration / megapixels - rates["seconds_per_megapixel"])
+        if size_bytes is not None:
+            rates["bytes_per_pixel"] += weight * (size_bytes / (megapixels * 1e6) - rates["bytes_per_pixel"])
+        rates["sample_count"] += 1
+        self.rates[export_preset_name] = rates
+
+    def describe(self, estimate:ExportEstimate) -> str:
+        """ Tooltip of an estimate, with the work of the texture set and the rates it was estimated with. """
+        rates = self.get_rates(estimate.export_preset_name)
+        based_on = f"{rates['sample_count']} measured exports" if rates["sample_count"] > 0 else "default rates, no export measured yet"
+        return (f"{estimate.map_count} maps, {estimate.megapixels:.1f} megapixels with {estimate.export_preset_name}\n"
+                f"{rates['seconds_per_megapixel']:.3f} s per megapixel and {rates['bytes_per_pixel']:.2f} bytes per pixel, from {based_on}")
+
+def get_group_work(export_config:Dict, textures:Dict) -> Dict[str, Tuple[int, float]]:
+    """ Texture set name -> (map count, megapixels) of the maps listed for an export config. """
+    sizes_by_stack = module_export_manifest.get_sizes_by_stack(export_config)
+    sizes_by_tile = module_export_manifest.get_sizes_by_tile(export_config)
+    work = {}
+    for stack_key, map_paths in textures.items():
+        texture_set_name, stack_name = stack_key if isinstance(stack_key, tuple) else (str(stack_key), "")
+        map_count, megapixels = work.get(texture_set_name, (0, 0.0))
+        for map_path in map_paths:
+            resolution = module_export_manifest.get_map_resolution(sizes_by_stack, sizes_by_tile, f"{texture_set_name}/{stack_name}", map_path)
+            map_count += 1
+            megapixels += resolution[0] * resolution[1] / 1e6 if resolution is not None else 0.0
+        work[texture_set_name] = (map_count, megapixels)
+    return work
+
+def estimate_export_jobs(export_jobs:List[Tuple[str, str, str]], cost_model:ExportCostModel, tile_filters:Dict=None) -> Dict[str, ExportEstimate]:
+    """ Texture set name -> estimate of its export, for (texture_set_name, shader_type, export_path) jobs. Nothing is exported. """
+    estimates = {}
+    for export_config, texture_set_names in module_export.build_batch_export_configs(export_jobs, tile_filters):
+        export_preset_name = export_config.get("defaultExportPreset", "").rsplit("/", 1)[-1]
+        work = get_group_work(export_config, substance_painter.export.list_project_textures(export_config))
+        for texture_set_name in texture_set_names:
+            map_count, megapixels = work.get(texture_set_name, (0, 0.0))
+            estimates[texture_set_name] = cost_model.estimate(texture_set_name, export_preset_name, map_count, megapixels)
+    return estimates
+
+def sort_longest_first(export_jobs:List[Tuple[str, str, str]], estimates:Dict[str, ExportEstimate]) -> List[Tuple[str, str, str]]:
+    """ Jobs with the longest estimate first, the jobs without an estimate last, in their original order. """
+    return sorted(export_jobs, key=lambda export_job: -estimates[export_job[0]].duration if export_job[0] in estimates else 0.0)
+
+def sum_estimates(estimates:Iterable[ExportEstimate]) -> Tuple[float, int]:
+    """ Total (duration, size_bytes) of the estimates. """
+    estimates = list(estimates)
+    return sum(estimate.duration for estimate in estimates), sum(estimate.size_bytes for estimate in estimates)
@@ -0,0 +1,202 @@
+"""Journal of the export runs, one JSON Lines file per project under <export root>/.export_journals/,
+so an interrupted run can be resumed: committed texture sets are skipped, and the partial outputs of the others are removed."""
+
+#Custom exporter modules
+import module_export_publish
+
+# Default Utils imports
+import json
+import os
+import re
+import shutil
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+JOURNALS_FOLDER_NAME = ".export_journals"
+MTIME_TOLERANCE = 2.0 #Seconds, some volumes store modification times with a 2 s precision
+
+class InterruptedBatch(NamedTuple):
+    batch_id: str
+    texture_set_names: List[str]
+    committed_files: Dict[str, List[str]] #Texture set name -> files of the committed texture sets
+    started_exports: Dict[str, Tuple[str, float]] #Texture set name -> (export_path, start time) of the texture sets started but not committed
+    staging_dir: Optional[str]
+    export_root: Optional[str]
+
+    def get_completed_files(self) -> Dict[str, List[str]]:
+        """ Files of the committed texture sets whose files are all still on disk, the texture sets a resumed export skips. """
+        return {texture_set_name: files for texture_set_name, files in self.committed_files.items()
+                if len(files) > 0 and all(os.path.isfile(file_path) for file_path in files)}
+
+def get_journal_path(export_root:str, project_name:str) -> str:
+    file_name = re.sub(r"[^\w.-]", "_", project_name or "untitled") #Project names are not always valid file names
+    return os.path.join(export_root, JOURNALS_FOLDER_NAME, f"{file_name}.jsonl")
+
+def read_records(journal_path:str) -> List[Dict]:
+    try:
+        with open(journal_path, "r", encoding="utf-8") as journal_file:
+            lines = journal_file.readlines()
+    except OSError: #No journal, no export was ever run for this project
+        return []
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError: #The line cut by a crash
+            continue
+    return records
+
+def read_interrupted_batch(journal_path:str) -> Optional[InterruptedBatch]:
+    """ The last run of the journal when it has no end record, None when it finished or was cancelled. """
+    begin_record = None
+    committed_files = {}
+    started_exports = {}
+    for record in read_records(journal_path):
+        event = record.get("event")
+        if event == "begin":
+            begin_record = record
+            committed_files = {}
+            started_exports = {}
+        elif begin_record is None or record.get("batch") != begin_record["batch"]:
+            continue
+        elif event == "start":
+            started_exports[record["texture_set"]] = (record["export_path"], record["time"])
+        elif event == "commit":
+            committed_files[record["texture_set"]] = record["files"]
+            started_exports.pop(record["texture_set"], None)
+        elif event == "end":
+            begin_record = None
+    if begin_record is None:
+        return None
+    return InterruptedBatch(begin_record["batch"], begin_record["texture_sets"], committed_files, started_exports,
+                            begin_record.get("staging_dir"), begin_record.get("export_root"))
+
+def remove_files(file_paths:List[str]) -> int:
+    removed_count = 0
+    for file_path in file_paths:
+        try:
+            os.remove(file_path)
+            removed_count += 1
+        except OSError: #Already gone, or locked: it is overwritten by the next export of its texture set
+            pass
+    return removed_count
+
+def list_written_files(folder:str, texture_set_name:str, start_time:float) -> List[str]:
+    """
+    Files of a texture set in an export folder written since its start record, named <TextureSet>_<Map> like every export preset names them,
+    without its previous maps moved aside by the export.
+    """
+    import module_export_dedup #Imported on first use
+    try:
+        file_names = os.listdir(folder)
+    except OSError:
+        return []
+    written_files = []
+    for file_name in file_names:
+        file_path = os.path.join(folder, file_name)
+        try:
+            if (file_name.startswith(f"{texture_set_name}_") and not file_name.endswith(module_export_dedup.SET_ASIDE_SUFFIX)
+                    and os.path.isfile(file_path) and os.path.getmtime(file_path) >= start_time - MTIME_TOLERANCE):
+                written_files.append(file_path)
+        except OSError:
+            continue
+    return written_files
+
+def list_publishing_files(folder:str) -> List[str]:
+    """ Temporary files left in a folder of the export root by a publish that never got to rename them. """
+    try:
+        return [os.path.join(folder, file_name) for file_name in os.listdir(folder) if file_name.endswith(module_export_publish.PUBLISHING_SUFFIX)]
+    except OSError:
+        return []
+
+def clean_partial_outputs(interrupted_batch:InterruptedBatch) -> int:
+    """ Removes the partial outputs of the interrupted run, and returns the number of removed files. """
+    removed_count = 0
+    if interrupted_batch.staging_dir is None:
+        import module_export_dedup #Imported on first use
+        for texture_set_name, (export_path, start_time) in interrupted_batch.started_exports.items():
+            removed_count += remove_files(list_written_files(export_path, texture_set_name, start_time))
+            module_export_dedup.restore_linked_files(module_export_dedup.list_set_aside_files(export_path, texture_set_name), is_exported=False)
+        return removed_count
+
+    #Staged exports only write to the staging folder, the export root only gets the temporary files of the publish
+    for export_path, _ in interrupted_batch.started_exports.values():
+        if interrupted_batch.export_root is not None:
+            published_folder = module_export_publish.get_published_path(export_path, interrupted_batch.staging_dir, interrupted_batch.export_root)
+            removed_count += remove_files(list_publishing_files(published_folder))
+    if os.path.isdir(interrupted_batch.staging_dir):
+        removed_count += sum(len(file_names) for _, _, file_names in os.walk(interrupted_batch.staging_dir))
+        shutil.rmtree(interrupted_batch.staging_dir, ignore_errors=True)
+    return removed_count
+
+class ExportJournal:
+    """
+    Append-only journal of one export run of a project.
+    commit_on_export is False when the exported files are not final yet, packed or staged: the texture sets are then committed
+    by the stage that puts their files in place, and the run is ended by the caller, once that stage is done.
+    """
+    def __init__(self, export_root:str, project_name:str, commit_on_export:bool=True):
+        self.export_root = export_root
+        self.journal_path = get_journal_path(export_root, project_name)
+        self.commit_on_export = commit_on_export
+        self.batch_id = None
+
+    def read_interrupted_batch(self) -> Optional[InterruptedBatch]:
+        return read_interrupted_batch(self.journal_path)
+
+    def begin(self, texture_set_names:List[str], staging_dir:str=None, carried_files:Dict[str, List[str]]=None):
+        """
+        Starts a new journal with the begin record of the run, and the commit records of the texture sets it carries over
+        from the run it resumes, given as texture set name -> files, so they are still skipped if this run is interrupted too.
+        """
+        run_time = time.time()
+        self.batch_id = f"{time.strftime('%Y%m%d_%H%M%S', time.localtime(run_time))}_{int(run_time * 1000) % 1000:03d}"
+        records = [{"event": "begin", "batch": self.batch_id, "texture_sets": list(texture_set_names) + list(carried_files or {}),
+                    "staging_dir": staging_dir, "export_root": self.export_root, "time": run_time}]
+        records.extend({"event": "commit", "batch": self.batch_id, "texture_set": texture_set_name, "files": files, "time": run_time}
+                       for texture_set_name, files in (carried_files or {}).items())
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        temp_path = f"{self.journal_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as journal_file:
+            journal_file.write("".join(json.dumps(record) + "\n" for record in records))
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+        os.replace(temp_path, self.journal_path) #The journal of the previous run is replaced in one go
+
+    def append(self, records:List[Dict]):
+        if self.batch_id is None or len(records) == 0:
+            return
+        try:
+            with open(self.journal_path, "a", encoding="utf-8") as journal_file:
+                journal_file.write("".join(json.dumps(record) + "\n" for record in records))
+                journal_file.flush()
+                os.fsync(journal_file.fileno()) #On disk before the export goes on, a crash right after keeps the record
+        except OSError: #The export goes on without its journal, it is only exported from scratch if it is interrupted
+            self.batch_id = None
+
+    def record_start(self, export_paths:Dict[str, str]):
+        """ Starts the texture sets, given as texture set name -> the folder their maps are exported to. """
+        run_time = time.time()
+        self.append([{"event": "start", "batch": self.batch_id, "texture_set": texture_set_name, "export_path": export_path, "time": run_time}
+                     for texture_set_name, export_path in export_paths.items()])
+
+    def record_commit(self, files_by_texture_set:Dict[str, List[str]]):
+        """ Commits the texture sets, given as texture set name -> their files in their final place. """
+        run_time = time.time()
+        self.append([{"event": "commit", "batch": self.batch_id, "texture_set": texture_set_name, "files": list(files), "time": run_time}
+                     for texture_set_name, files in files_by_texture_set.items()])
+
+    def end(self):
+        self.append([{"event": "end", "batch": self.batch_id, "time": time.time()}])
+        self.batch_id = None
+
+    def suspend(self):
+        """ Stops journaling the run without ending it, e.g. when its project closes, so it is offered for resume like a crashed run. """
+        self.batch_id = None
+
+    def clear(self):
+        """ Removes the journal, once its interrupted run is resolved without a new run. """
+        try:
+            os.remove(self.journal_path)
+        except OSError:
+            pass
@@ -0,0 +1,155 @@
+"""Collects the exported maps of a run into one JSON Lines manifest, written once per run, one JSON object per map:
+{"run", "texture_set", "stack", "udim", "map_path", "preset", "resolution", "size_bytes", "duration", "content_hash", "deduplicated"}
+content_hash and deduplicated are only set when the maps are published from local staging."""
+
+#Custom exporter modules
+import module_uv_tiles
+
+# Default Utils imports
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+MANIFESTS_FOLDER_NAME = ".export_manifests"
+
+def get_parameters_resolution(export_parameters:Dict) -> Optional[List[int]]:
+    size_log2 = export_parameters.get("parameters", {}).get("sizeLog2")
+    if size_log2 is None:
+        return None
+    if isinstance(size_log2, (int, float)):
+        size_log2 = [size_log2, size_log2]
+    return [int(round(2 ** size)) for size in size_log2]
+
+def get_sizes_by_stack(export_config:Dict) -> Dict[str, List[int]]:
+    """ Resolution in pixels of every stack of an export config, read from its sizeLog2 parameters that are not filtered on UV tiles. """
+    sizes_by_stack = {}
+    for export_parameters in export_config.get("exportParameters", []):
+        resolution = get_parameters_resolution(export_parameters)
+        if resolution is None or "uvTiles" in export_parameters.get("filter", {}):
+            continue
+        data_paths = export_parameters.get("filter", {}).get("dataPaths")
+        for export_entry in export_config["exportList"]:
+            if data_paths is None or export_entry["rootPath"] in data_paths:
+                sizes_by_stack[export_entry["rootPath"]] = resolution
+    return sizes_by_stack
+
+def get_sizes_by_tile(export_config:Dict) -> Dict[Tuple[str, int], List[int]]:
+    """ Resolution in pixels of the UV tiles with their own sizeLog2 parameters, per (stack, UDIM). """
+    sizes_by_tile = {}
+    for export_parameters in export_config.get("exportParameters", []):
+        resolution = get_parameters_resolution(export_parameters)
+        tiles = export_parameters.get("filter", {}).get("uvTiles")
+        if resolution is None or tiles is None:
+            continue
+        data_paths = export_parameters["filter"].get("dataPaths")
+        for export_entry in export_config["exportList"]:
+            if data_paths is None or export_entry["rootPath"] in data_paths:
+                for u, v in tiles:
+                    sizes_by_tile[(export_entry["rootPath"], module_uv_tiles.get_udim(u, v))] = resolution
+    return sizes_by_tile
+
+def get_map_resolution(sizes_by_stack:Dict, sizes_by_tile:Dict, stack_path:str, map_path:str) -> Optional[List[int]]:
+    """ Exported resolution of one map, the resolution of its UV tile if the tile has its own. """
+    udim = module_uv_tiles.get_udim_from_file_path(map_path)
+    if udim is not None and (stack_path, udim) in sizes_by_tile:
+        return sizes_by_tile[(stack_path, udim)]
+    return sizes_by_stack.get(stack_path)
+
+class ExportManifest:
+    """ In-memory manifest of one export run, written once to <manifest_dir>/.export_manifests/export_<run>.jsonl. """
+    def __init__(self, manifest_dir:str):
+        self.manifest_dir = manifest_dir
+        run_time = time.time()
+        self.run_id = f"{time.strftime('%Y%m%d_%H%M%S', time.localtime(run_time))}_{int(run_time * 1000) % 1000:03d}" #Milliseconds keep the runs of the same second apart
+        self.entries = []
+        self.texture_set_names = set()
+        self.failed_count = 0
+        self.saved_byte_count = 0 #Bytes not copied to the export root thanks to deduplication, packed maps and LOD variants included
+        self.manifest_path = None
+
+    def add_group(self, export_config:Dict, texture_set_names:List[str], export_result, duration:float):
+        """ Adds the maps exported by one export_project_textures call. The duration is shared by the texture sets of the group. """
+        preset_name = export_config.get("defaultExportPreset", "").rsplit("/", 1)[-1]
+        sizes_by_stack = get_sizes_by_stack(export_config)
+        sizes_by_tile = get_sizes_by_tile(export_config)
+        duration_per_texture_set = duration / max(len(texture_set_names), 1)
+        exported_names = set()
+        for stack_key, map_paths in export_result.textures.items():
+            texture_set_name, stack_name = stack_key if isinstance(stack_key, tuple) else (str(stack_key), "")
+            exported_names.add(texture_set_name)
+            for map_path in map_paths:
+                self.entries.append({
+                    "run": self.run_id,
+                    "texture_set": texture_set_name,
+                    "stack": stack_name,
+                    "udim": module_uv_tiles.get_udim_from_file_path(map_path),
+                    "map_path": map_path,
+                    "preset": preset_name,
+                    "resolution": get_map_resolution(sizes_by_stack, sizes_by_tile, f"{texture_set_name}/{stack_name}", map_path),
+                    "size_bytes": None, #Read from disk when the manifest is written, once per map
+                    "duration": duration_per_texture_set,
+                    "content_hash": None,
+                    "deduplicated": False,
+                })
+        self.texture_set_names.update(exported_names)
+        self.failed_count += len([name for name in texture_set_names if name not in exported_names])
+
+    def replace_maps(self, replaced_paths:List[str], map_paths:List[str]):
+        """
+        Replaces maps with the maps built from them, e.g. the source maps of a texture set with its packed maps, as the source maps are not kept.
+        Every new map gets the texture set, preset, resolution and duration of a replaced map of its UV tile.
+        """
+        replaced_paths = set(replaced_paths)
+        replaced_entries = {}
+        for entry in self.entries:
+            if entry["map_path"] in replaced_paths:
+                replaced_entries.setdefault(entry["udim"], entry)
+        self.entries = [entry for entry in self.entries if entry["map_path"] not in replaced_paths]
+        for map_path in map_paths:
+            udim = module_uv_tiles.get_udim_from_file_path(map_path)
+            replaced_entry = replaced_entries.get(udim)
+            if replaced_entry is not None:
+                self.entries.append(dict(replaced_entry, map_path=map_path, udim=udim))
+
+    def remap_paths(self, remap_path:Callable[[str], str]):
+        """ Points the entries to the new location of their maps, e.g. once the staged files are published. """
+        for entry in self.entries:
+            entry["map_path"] = remap_path(entry["map_path"])
+
+    def record_deduplication(self, checksums:Dict[str, str], deduplicated_files:List[str], saved_byte_count:int):
+        """ Sets the content hash of the published maps, given as published path -> checksum, and flags the deduplicated ones. """
+        deduplicated_files = set(deduplicated_files)
+        for entry in self.entries:
+            entry["content_hash"] = checksums.get(entry["map_path"])
+            entry["deduplicated"] = entry["map_path"] in deduplicated_files
+        self.saved_byte_count = saved_byte_count
+
+    def total_size(self) -> int:
+        return sum(entry["size_bytes"] or 0 for entry in self.entries)
+
+    def write(self) -> Optional[str]:
+        """ Writes the whole manifest in one go. Returns its path, or None when nothing was exported. """
+        if len(self.entries) == 0:
+            return None
+        for entry in self.entries:
+            try:
+                entry["size_bytes"] = os.path.getsize(entry["map_path"])
+            except OSError: #Reported as missing
+                entry["size_bytes"] = None
+        manifests_dir = os.path.join(self.manifest_dir, MANIFESTS_FOLDER_NAME)
+        os.makedirs(manifests_dir, exist_ok=True)
+        self.manifest_path = os.path.join(manifests_dir, f"export_{self.run_id}.jsonl")
+        with open(self.manifest_path, "w", encoding="utf-8") as manifest_file:
+            manifest_file.write("".join(json.dumps(entry) + "\n" for entry in self.entries))
+        return self.manifest_path
+
+    def summary(self) -> str:
+        summary = f"Exported {len(self.entries)} maps of {len(self.texture_set_names)} texture sets ({self.total_size() / (1024 * 1024):.1f} MB)"
+        if self.saved_byte_count > 0:
+            summary += f", {self.saved_byte_count / (1024 * 1024):.1f} MB saved by deduplication"
+        if self.failed_count > 0:
+            summary += f", {self.failed_count} texture sets failed"
+        if self.manifest_path is not None:
+            summary += f". Manifest: {self.manifest_path}"
+        return summary
@@ -0,0 +1,224 @@
+"""Exports to a local staging folder first, then publishes the files of every texture set to the export root, in parallel.
+Files are copied under a temporary name and verified, then renamed once all files of the texture set are verified.
+The renames of a texture set are not atomic as a whole: the journal (module_export_journal) recovers from a crash between them.
+The scratch root is CUSTOM_EXPORTER_SCRATCH, or a folder in the temp folder of the system."""
+
+# Default Utils imports
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+SCRATCH_ENV_VAR = "CUSTOM_EXPORTER_SCRATCH"
+SCRATCH_FOLDER_NAME = "custom_exporter_scratch"
+PUBLISHING_SUFFIX = ".publishing" #Suffix of the files being published, they are renamed once their texture set is verified
+CHUNK_SIZE = 1024 * 1024
+MAX_WORKERS = 8 #Copies to a network share are bound by its latency, not by the local disk
+
+class PublishError(Exception):
+    pass
+
+class PublishResult(NamedTuple):
+    published_files: Dict[str, List[str]] #Texture set name -> published file paths
+    errors: Dict[str, str] #Texture set name -> reason why it was not published
+    byte_count: int #Bytes of the published files
+    copied_byte_count: int #Bytes copied to the export root, less than byte_count when identical files were deduplicated
+    duration: float
+    checksums: Optional[Dict[str, str]] = None #Published file path -> checksum, empty without a content store
+    deduplicated_files: Optional[List[str]] = None #Published file paths hardlinked to a content that was stored before them
+
+    @property
+    def saved_byte_count(self) -> int:
+        return self.byte_count - self.copied_byte_count
+
+    @property
+    def file_count(self) -> int:
+        return sum(len(file_paths) for file_paths in self.published_files.values())
+
+    def summary(self) -> str:
+        throughput = self.byte_count / (1024 * 1024) / self.duration if self.duration > 0 else 0.0
+        summary = (f"Published {self.file_count} files of {len(self.published_files)} texture sets ({self.byte_count / (1024 * 1024):.1f} MB) "
+                   f"in {self.duration:.2f} s, {throughput:.1f} MB/s")
+        if self.saved_byte_count > 0:
+            summary += f", {self.saved_byte_count / (1024 * 1024):.1f} MB saved by deduplication"
+        if len(self.errors) > 0:
+            summary += f", {len(self.errors)} texture sets failed"
+        return summary
+
+def build_publish_result(published_files:Dict[str, List[str]], errors:Dict[str, str], byte_count:int, copied_byte_count:int, duration:float,
+                         checksums:Dict[str, str]=None, deduplicated_files:List[str]=None) -> PublishResult:
+    """ PublishResult with its own checksums and deduplicated files, never containers shared with other results. """
+    return PublishResult(published_files, errors, byte_count, copied_byte_count, duration,
+                         checksums if checksums is not None else {}, deduplicated_files if deduplicated_files is not None else [])
+
+def get_scratch_root() -> str:
+    return os.environ.get(SCRATCH_ENV_VAR) or os.path.join(tempfile.gettempdir(), SCRATCH_FOLDER_NAME)
+
+def create_staging_dir(scratch_root:str=None) -> str:
+    """ New empty staging folder for one export run, so the files of an earlier run are never published again. """
+    scratch_root = scratch_root if scratch_root is not None else get_scratch_root()
+    os.makedirs(scratch_root, exist_ok=True)
+    return tempfile.mkdtemp(prefix="export_", dir=scratch_root)
+
+def remove_staging_dir(staging_dir:str):
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+def get_staged_path(export_path:str, export_root:str, staging_dir:str) -> str:
+    """ Export path in the staging folder, with the same path relative to the staging folder as the export path relative to the export root. """
+    return f"{os.path.join(staging_dir, os.path.relpath(export_path, export_root))}/".replace("\\", "/")
+
+def get_published_path(staged_path:str, staging_dir:str, export_root:str) -> str:
+    return os.path.join(export_root, os.path.relpath(staged_path, staging_dir)).replace("\\", "/")
+
+def copy_file(source_path:str, destination_path:str) -> Tuple[str, int]:
+    """ Copies a file and returns the checksum of the copied content, and its size. """
+    checksum = hashlib.sha1()
+    byte_count = 0
+    with open(source_path, "rb") as source_file, open(destination_path, "wb") as destination_file:
+        while True:
+            chunk = source_file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            checksum.update(chunk)
+            destination_file.write(chunk)
+            byte_count += len(chunk)
+    return checksum.hexdigest(), byte_count
+
+def get_file_checksum(file_path:str) -> str:
+    checksum = hashlib.sha1()
+    with open(file_path, "rb") as checked_file:
+        for chunk in iter(lambda: checked_file.read(CHUNK_SIZE), b""):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+def publish_texture_set(file_pairs:List[Tuple[str, str]], checksums:Dict[str, str]=None, content_store=None) -> Tuple[int, int, List[str]]:
+    """
+    Publishes the (staged_path, published_path) files of one texture set, and returns the number of bytes published and copied,
+    and the staged paths of the files published as hardlinks.
+    With a content store, the files whose content is stored are hardlinked to their stored copy, given their staged path -> checksum.
+    Raises PublishError or OSError, after removing the temporary files, when a file can't be copied or its copy doesn't match.
+    """
+    temporary_paths = []
+    byte_count = 0
+    copied_byte_count = 0
+    linked_paths = []
+    try:
+        for staged_path, published_path in file_pairs:
+            temporary_path = f"{published_path}{PUBLISHING_SUFFIX}"
+            temporary_paths.append(temporary_path)
+            checksum = checksums.get(staged_path) if checksums is not None else None
+            if checksum is not None and checksum in content_store.entries:
+                try:
+                    if os.path.lexists(temporary_path): #Left behind by an interrupted publish, os.link doesn't overwrite
+                        os.remove(temporary_path)
+                    content_store.link(checksum, temporary_path)
+                    byte_count += content_store.entries[checksum]["size"]
+                    linked_paths.append(staged_path)
+                    continue
+                except OSError: #No hardlinks on this volume, the file is copied
+                    pass
+            checksum, file_byte_count = copy_file(staged_path, temporary_path)
+            if get_file_checksum(temporary_path) != checksum:
+                raise PublishError(f"the copy of {os.path.basename(published_path)} does not match the exported file")
+            byte_count += file_byte_count
+            copied_byte_count += file_byte_count
+    except (OSError, PublishError):
+        for temporary_path in temporary_paths:
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+        raise
+
+    #Every file is verified, the texture set is published with renames only
+    for temporary_path, (_, published_path) in zip(temporary_paths, file_pairs):
+        os.replace(temporary_path, published_path)
+    return byte_count, copied_byte_count, linked_paths
+
+def store_contents(checksums:Dict[str, str], content_store, max_workers:int=MAX_WORKERS) -> Tuple[int, List[str]]:
+    """
+    Copies every content of the staged files, given as staged path -> checksum, that is not in the content store yet, once, in parallel.
+    Returns the number of bytes copied, and the staged paths that were copied. A content that can't be stored is left out of the store,
+    its files are copied instead.
+    """
+    new_contents = {}
+    for staged_path, checksum in checksums.items():
+        if checksum is not None and checksum not in new_contents and not content_store.contains(checksum):
+            new_contents[checksum] = staged_path
+
+    def process(checksum):
+        try:
+            return content_store.add(checksum, new_contents[checksum])
+        except (OSError, PublishError):
+            return 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        byte_counts = list(executor.map(process, new_contents))
+    stored_paths = [new_contents[checksum] for checksum in new_contents if checksum in content_store.entries]
+    return sum(byte_counts), stored_paths
+
+def publish_staged_files(staged_files:Dict[str, List[str]], staging_dir:str, export_root:str, max_workers:int=MAX_WORKERS, content_store=None) -> PublishResult:
+    """
+    Publishes the staged files, given as texture set name -> staged file paths, to the same paths under the export root.
+    With a content store, identical files are published as hardlinks to one stored copy, and the store index is saved.
+    """
+    start_time = time.perf_counter()
+    file_pairs_by_name = {texture_set_name: [(staged_path, get_published_path(staged_path, staging_dir, export_root)) for staged_path in dict.fromkeys(staged_paths)]
+                          for texture_set_name, staged_paths in staged_files.items()}
+
+    #All destination folders are created up front, so the workers never create the same folder at the same time
+    errors = {}
+    for folder in sorted({os.path.dirname(published_path) for file_pairs in file_pairs_by_name.values() for _, published_path in file_pairs}):
+        try:
+            os.makedirs(folder, exist_ok=True)
+        except OSError as error:
+            for texture_set_name, file_pairs in file_pairs_by_name.items():
+                if any(os.path.dirname(published_path) == folder for _, published_path in file_pairs):
+                    errors[texture_set_name] = f"the folder {folder} can't be created: {error}"
+
+    checksums = None
+    stored_byte_count = 0
+    stored_paths = set()
+    if content_store is not None:
+        import module_export_dedup #Imported on first use
+        checksums = module_export_dedup.hash_files([staged_path for texture_set_name, file_pairs in file_pairs_by_name.items() if texture_set_name not in errors
+                                                    for staged_path, _ in file_pairs], max_workers=max_workers)
+        stored_byte_count, stored_paths = store_contents(checksums, content_store, max_workers=max_workers)
+        stored_paths = set(stored_paths)
+
+    def process(texture_set_name):
+        try:
+            return publish_texture_set(file_pairs_by_name[texture_set_name], checksums, content_store)
+        except (OSError, PublishError) as error:
+            return str(error)
+
+    published_files = {}
+    published_checksums = {}
+    deduplicated_files = []
+    byte_count = 0
+    copied_byte_count = stored_byte_count
+    names_to_publish = [texture_set_name for texture_set_name in file_pairs_by_name if texture_set_name not in errors]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for texture_set_name, result in zip(names_to_publish, executor.map(process, names_to_publish)):
+            if isinstance(result, str):
+                errors[texture_set_name] = result
+                continue
+            published_files[texture_set_name] = [published_path for _, published_path in file_pairs_by_name[texture_set_name]]
+            byte_count += result[0]
+            copied_byte_count += result[1]
+            published_paths = dict(file_pairs_by_name[texture_set_name])
+            deduplicated_files.extend(published_paths[staged_path] for staged_path in result[2] if staged_path not in stored_paths)
+            if checksums is not None:
+                published_checksums.update((published_path, checksums[staged_path]) for staged_path, published_path in file_pairs_by_name[texture_set_name]
+                                           if checksums.get(staged_path) is not None)
+
+    if content_store is not None:
+        content_store.prune() #The maps replaced by this publish may have been the last links to their stored copy
+        try:
+            content_store.save()
+        except OSError: #The published files are fine, the next export only stores their contents again
+            pass
+    return build_publish_result(published_files, errors, byte_count, copied_byte_count, time.perf_counter() - start_time, published_checksums, deduplicated_files)
@@ -0,0 +1,120 @@
+"""Exports the batch one group per event loop turn, so the UI stays responsive and the batch can be cancelled between groups.
+The schedule function is injectable: QTimer.singleShot(0, ...) inside Painter, e.g. pending.append headless."""
+
+#Substance Painter API import
+import substance_painter
+#Custom exporter modules
+import module_export
+from module_refresh_scheduler import schedule_on_event_loop
+# Default Utils imports
+import time
+
+STATUS_QUEUED = "Queued"
+STATUS_EXPORTING = "Exporting..."
+STATUS_FAILED = "Failed"
+STATUS_CANCELLED = "Cancelled"
+
+class ExportQueue:
+    """
+    Exports (texture_set_name, shader_type, export_path) jobs one group at a time.
+    on_progress(texture_set_name, status) is called every time the status of a texture set changes,
+    on_group_exported(texture_set_names, export_result, elapsed_time) is called after each exported group,
+    on_finished(batch_result) is called once, when the batch is done or cancelled, also when finishing the batch fails.
+    is_staged is True when the export paths are in a staging folder, which should not be opened, and the manifest is written once the files are published.
+    journal is an optional ExportJournal (module_export_journal), so an interrupted batch can be resumed.
+    content_store_root is the export root when the jobs write to it directly and it holds a content store, see module_export.start_batch_export.
+    """
+    def __init__(self, export_jobs, schedule=None, on_progress=None, on_group_exported=None, on_finished=None, manifest_dir=None, tile_filters=None, is_staged=False, journal=None,
+                 content_store_root=None):
+        self.schedule = schedule if schedule is not None else schedule_on_event_loop
+        self.on_progress = on_progress
+        self.on_group_exported = on_group_exported
+        self.on_finished = on_finished
+        self.export_jobs = export_jobs
+        self.manifest_dir = manifest_dir
+        self.is_staged = is_staged
+        self.journal = journal
+        self.content_store_root = content_store_root
+        self.export_groups = module_export.build_batch_export_configs(export_jobs, tile_filters) #tile_filters: texture set name -> (u, v) tiles to export, all tiles for the other texture sets
+        self.texture_set_count = sum(len(texture_set_names) for _, texture_set_names in self.export_groups)
+        self.statuses = {}
+        self.durations = {}
+        self.batch_result = None
+        self.exported_paths = []
+        self.exported_groups = [] #(export_config, texture_set_names) of the groups exported successfully, for the post-export stages
+        self.next_group_index = 0
+        self.exported_count = 0
+        self.is_running = False
+        self.is_cancelled = False
+        self.start_time = None
+
+    def start(self):
+        self.batch_result = module_export.start_batch_export(self.export_jobs, self.manifest_dir, self.journal, self.content_store_root)
+        self.is_running = True
+        self.start_time = time.perf_counter()
+        substance_painter.logging.log(substance_painter.logging.INFO, "Custom Exporter", f"Queued Texture Exporting of {self.texture_set_count} texture sets!")
+        for _, texture_set_names in self.export_groups:
+            for texture_set_name in texture_set_names:
+                self.set_status(texture_set_name, STATUS_QUEUED)
+        self.schedule(self.export_next_group)
+
+    def cancel(self):
+        """ Cancels every group that has not started yet. The group being exported always finishes. """
+        if self.is_running:
+            self.is_cancelled = True
+
+    def set_status(self, texture_set_name, status):
+        self.statuses[texture_set_name] = status
+        if self.on_progress is not None:
+            self.on_progress(texture_set_name, status)
+
+    def export_next_group(self):
+        if not self.is_running:
+            return
+        if self.is_cancelled or self.next_group_index >= len(self.export_groups):
+            self.finish()
+            return
+
+        export_config, texture_set_names = self.export_groups[self.next_group_index]
+        self.next_group_index += 1
+        for texture_set_name in texture_set_names:
+            self.set_status(texture_set_name, STATUS_EXPORTING)
+
+        group_start_time = time.perf_counter()
+        export_result = module_export.export_group(export_config, texture_set_names, self.batch_result, self.exported_paths)
+        elapsed_time = time.perf_counter() - group_start_time
+
+        is_success = export_result.status == substance_painter.export.ExportStatus.Success
+        if is_success:
+            self.exported_groups.append((export_config, texture_set_names))
+        for texture_set_name in texture_set_names:
+            self.durations[texture_set_name] = elapsed_time
+            self.set_status(texture_set_name, f"Done ({elapsed_time:.2f} s)" if is_success else STATUS_FAILED)
+        self.exported_count += len(texture_set_names)
+        if self.on_group_exported is not None:
+            self.on_group_exported(texture_set_names, export_result, elapsed_time)
+
+        self.schedule(self.export_next_group) #Yields to the event loop before the next group
+
+    def finish(self):
+        self.is_running = False
+        if self.is_cancelled:
+            for texture_set_name, status in self.statuses.items():
+                if status == STATUS_QUEUED:
+                    self.set_status(texture_set_name, STATUS_CANCELLED)
+            if self.batch_result.status == substance_painter.export.ExportStatus.Success:
+                self.batch_result.status = substance_painter.export.ExportStatus.Cancelled
+                self.batch_result.message = "Texture Exporting was cancelled by the user."
+            substance_painter.logging.log(substance_painter.logging.WARNING, "Custom Exporter", f"Texture Exporting was cancelled after {self.exported_count} of {self.texture_set_count} texture sets.")
+
+        try:
+            module_export.finish_batch_export(self.batch_result, self.exported_paths, self.is_staged)
+            substance_painter.logging.log(substance_painter.logging.INFO, "Custom Exporter", f"Texture Exporting finished in {self.elapsed_time():.2f} s.")
+        finally: #The widget is always given back its export button
+            if self.on_finished is not None:
+                self.on_finished(self.batch_result)
+
+    def elapsed_time(self):
+        if self.start_time is None:
+            return 0.0
+        return time.perf_counter() - self.start_time
@@ -0,0 +1,68 @@
+"""Reads and writes exported textures as float32 NumPy arrays in the 0-1 range. NumPy and Pillow are optional, see get_missing_dependencies().
+Images replace the previous file and are never written in place, since a published map can be a hardlink shared with other maps."""
+
+# Default Utils imports
+import importlib.util
+import os
+from typing import List, NamedTuple, Tuple
+
+class ImageFormat(NamedTuple):
+    mode: str #Pillow mode of the source file
+    max_value: float #Value of 1.0 in the source file
+
+SUPPORTED_EXTENSIONS = {".png", ".tga", ".tif", ".tiff"}
+MODES_8_BIT = {"L", "LA", "RGB", "RGBA"}
+MODES_16_BIT = {"I;16", "I;16B", "I;16L"}
+MODE_32_BIT_INT = "I" #Older versions of Pillow open 16-bit grayscale PNGs as 32-bit integers
+WRITING_SUFFIX = ".writing" #Suffix of the images being written, they replace the previous file once complete
+
+def get_missing_dependencies() -> List[str]:
+    return [module_name for module_name, package_name in (("numpy", "numpy"), ("PIL", "Pillow")) if importlib.util.find_spec(module_name) is None]
+
+def is_supported(file_path:str) -> bool:
+    return os.path.splitext(file_path)[1].lower() in SUPPORTED_EXTENSIONS
+
+def read_image(file_path:str) -> Tuple["numpy.ndarray", ImageFormat]:
+    """ Raises ValueError for images that can't be read without losing precision, e.g. 16-bit RGB. """
+    import numpy
+    from PIL import Image
+
+    with Image.open(file_path) as image:
+        mode = image.mode
+        if mode in MODES_8_BIT:
+            pixels = numpy.asarray(image, dtype=numpy.uint8)
+            max_value = 255.0
+        elif mode in MODES_16_BIT:
+            pixels = numpy.asarray(image).astype(numpy.uint16)
+            max_value = 65535.0
+        elif mode == MODE_32_BIT_INT: #Read as 16-bit, like the files written by Substance Painter
+            pixels = numpy.clip(numpy.asarray(image), 0, 65535).astype(numpy.uint16)
+            max_value = 65535.0
+        else:
+            raise ValueError(f"unsupported image mode {mode} of {os.path.basename(file_path)}")
+    if pixels.ndim == 2:
+        pixels = pixels[:, :, None]
+    return pixels.astype(numpy.float32) / max_value, ImageFormat(mode, max_value)
+
+def write_image(file_path:str, pixels:"numpy.ndarray", image_format:ImageFormat):
+    """ Writes float pixels in the 0-1 range with the format of the source image, as a new file replacing the previous one. """
+    import numpy
+    from PIL import Image
+
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    values = numpy.clip(numpy.rint(pixels * image_format.max_value), 0, image_format.max_value)
+    if image_format.mode in MODES_16_BIT or image_format.mode == MODE_32_BIT_INT: #Written as 16-bit grayscale
+        image = Image.fromarray(values[:, :, 0].astype(numpy.uint16))
+    else:
+        values = values.astype(numpy.uint8)
+        image = Image.fromarray(values[:, :, 0] if values.shape[2] == 1 else values, image_format.mode)
+    temp_path = f"{file_path}{WRITING_SUFFIX}"
+    try:
+        image.save(temp_path, format=Image.registered_extensions()[os.path.splitext(file_path)[1].lower()])
+        os.replace(temp_path, file_path)
+    except (OSError, ValueError):
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
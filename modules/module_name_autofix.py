@@ -0,0 +1,210 @@
+"""Suggests the nearest valid name of the texture sets failing the name validation, and renames them as one batch.
+Tokens of the name are matched to the acronyms and aliases of naming_rules.json, within MAX_DISTANCE edits,
+and the suggestions never collide with each other or with the names of the project."""
+
+#Substance Painter API import
+import substance_painter.textureset
+
+#Custom exporter modules
+import module_validation_name
+
+# Default Utils imports
+import json
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+MAX_DISTANCE = 2 #Edits allowed between a token and an acronym, never more than a third of the token
+MAX_ID_WIDTH = 4 #Widest Asset ID tried when padding the digits of a name
+TOKEN_REGEX = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+class NameChange(NamedTuple):
+    texture_set_name: str
+    target_name: str
+
+def get_edit_distance(source:str, target:str) -> int:
+    """ Edits between two strings: insertions, deletions, substitutions, and swaps of two adjacent letters. """
+    previous_row = None
+    row = list(range(len(target) + 1))
+    for i in range(1, len(source) + 1):
+        previous_row, row, row_before = row, [i] + [0] * len(target), previous_row
+        for j in range(1, len(target) + 1):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            row[j] = min(previous_row[j] + 1, row[j - 1] + 1, previous_row[j - 1] + cost)
+            if i > 1 and j > 1 and source[i - 1] == target[j - 2] and source[i - 2] == target[j - 1]:
+                row[j] = min(row[j], row_before[j - 2] + 1)
+    return row[-1]
+
+class BKTree:
+    """ Metric tree of the tokens, every child is keyed by its edit distance to its parent. """
+    def __init__(self, tokens:Iterable[str]):
+        self.root = None
+        for token in tokens:
+            self.add(token)
+
+    def add(self, token:str):
+        if self.root is None:
+            self.root = (token, {})
+            return
+        node_token, children = self.root
+        while True:
+            distance = get_edit_distance(token, node_token)
+            if distance == 0:
+                return
+            if distance not in children:
+                children[distance] = (token, {})
+                return
+            node_token, children = children[distance]
+
+    def search(self, token:str, max_distance:int) -> List[Tuple[int, str]]:
+        """ (distance, token) of every token within max_distance, closest first. """
+        matches = []
+        nodes = [self.root] if self.root is not None else []
+        while nodes:
+            node_token, children = nodes.pop()
+            distance = get_edit_distance(token, node_token)
+            if distance <= max_distance:
+                matches.append((distance, node_token))
+            #Triangle inequality: only the children within max_distance of the distance to this node can match
+            nodes.extend(child for child_distance, child in children.items() if distance - max_distance <= child_distance <= distance + max_distance)
+        return sorted(matches)
+
+class NameIndex:
+    """ Token index of the naming rule of one asset type, with the lookups of the tokens found so far. """
+    def __init__(self, rule:module_validation_name.CompiledNamingRule, aliases:Dict[str, List[str]]):
+        self.rule = rule
+        slots = [[rule.prefix]] + [list(detail_options) for detail_options in rule.details_display]
+        self.slots_by_token = {}
+        for slot, acronyms in enumerate(slots):
+            for acronym in acronyms:
+                for token in [acronym] + aliases.get(acronym, []):
+                    self.slots_by_token.setdefault(token.upper(), set()).add((slot, acronym))
+        self.tree = BKTree(self.slots_by_token)
+        self.lookups = {}
+        self.asset_ids = {} #ID width -> every Asset ID of that width matching the ID pattern, in order
+
+    def lookup(self, token:str) -> Dict[int, Tuple[int, str]]:
+        """ Slot -> (distance, acronym) of the closest acronym of every slot the token can be, without the ambiguous slots. """
+        if token in self.lookups:
+            return self.lookups[token]
+        max_distance = min(MAX_DISTANCE, len(token) // 3)
+        matches = {}
+        ambiguous_slots = set()
+        for distance, index_token in self.tree.search(token, max_distance):
+            for slot, acronym in self.slots_by_token[index_token]:
+                if slot not in matches:
+                    matches[slot] = (distance, acronym)
+                elif matches[slot][0] == distance and matches[slot][1] != acronym:
+                    ambiguous_slots.add(slot)
+        self.lookups[token] = {slot: match for slot, match in matches.items() if slot not in ambiguous_slots}
+        return self.lookups[token]
+
+    def get_asset_ids(self, width:int) -> List[str]:
+        if width not in self.asset_ids:
+            self.asset_ids[width] = [str(number).zfill(width) for number in range(10 ** width) if self.rule.id_regex.fullmatch(str(number).zfill(width))]
+        return self.asset_ids[width]
+
+    def format_asset_id(self, digits:str) -> Optional[str]:
+        """ The digits of a name as an Asset ID, with as many leading zeros as the ID pattern needs, e.g. 1 or 001 -> 01. None when none matches. """
+        if self.rule.id_regex.fullmatch(digits):
+            return digits
+        for width in range(1, MAX_ID_WIDTH + 1):
+            asset_id = str(int(digits)).zfill(width)
+            if self.rule.id_regex.fullmatch(asset_id):
+                return asset_id
+        return None
+
+_aliases = None
+
+def get_aliases(asset_type:str) -> Dict[str, List[str]]:
+    """ Acronym -> aliases of the asset type, the optional "aliases" of naming_rules.json, loaded once per session. """
+    global _aliases
+    if _aliases is None:
+        with open(module_validation_name.NAMING_RULES_PATH, "r", encoding="utf-8") as naming_rules_file:
+            _aliases = {rule_asset_type: rule.get("aliases", {}) for rule_asset_type, rule in json.load(naming_rules_file).items()}
+    return _aliases.get(asset_type, {})
+
+_name_indexes = {}
+
+def get_name_index(asset_type:str) -> Optional[NameIndex]:
+    """ Token index of an asset type, built on first use. None for an unknown asset type. """
+    if asset_type not in _name_indexes:
+        rule = module_validation_name.get_naming_rule(asset_type)
+        if rule is None:
+            return None
+        _name_indexes[asset_type] = NameIndex(rule, get_aliases(asset_type))
+    return _name_indexes[asset_type]
+
+def split_name(texture_set_name:str) -> List[str]:
+    """ Upper case tokens of a name. Parts that are tokens of no index, like "ChairS", are split on case changes and digits. """
+    tokens = []
+    for part in re.split(r"[^A-Za-z0-9]+", texture_set_name):
+        tokens.extend(token.upper() for token in (TOKEN_REGEX.findall(part) if not part.isalpha() or not (part.isupper() or part.islower()) else [part]))
+    return tokens
+
+def suggest_name(asset_type:str, texture_set_name:str, taken_names:Set[str]=frozenset()) -> Optional[str]:
+    """ Nearest valid name of a failing name, not in taken_names. None when the name is valid or no name can be suggested. """
+    name_index = get_name_index(asset_type)
+    if name_index is None or name_index.rule.name_regex.fullmatch(texture_set_name):
+        return None
+    rule = name_index.rule
+    tokens = split_name(texture_set_name)
+
+    #Every slot takes its closest token, the closest matches are assigned first, and every token is assigned once
+    candidates = sorted((distance, position, slot, acronym) for position, token in enumerate(tokens) if not token.isdigit()
+                        for slot, (distance, acronym) in name_index.lookup(token).items())
+    acronyms = [None] * (len(rule.details) + 1)
+    assigned_positions = set()
+    for _, position, slot, acronym in candidates:
+        if acronyms[slot] is None and position not in assigned_positions:
+            acronyms[slot] = acronym
+            assigned_positions.add(position)
+    acronyms[0] = rule.prefix #A missing asset type acronym is always the same
+    if any(acronym is None for acronym in acronyms):
+        return None
+
+    digit_tokens = [token for token in tokens if token.isdigit()]
+    asset_id = name_index.format_asset_id(digit_tokens[-1]) if len(digit_tokens) > 0 else None
+    stem = "_".join(acronyms)
+    if asset_id is not None and f"{stem}_{asset_id}" not in taken_names:
+        return f"{stem}_{asset_id}"
+    for width in ([len(asset_id)] if asset_id is not None else range(1, MAX_ID_WIDTH + 1)): #The next free Asset ID, from the one of the name
+        asset_ids = name_index.get_asset_ids(width)
+        first_index = asset_ids.index(asset_id) if asset_id in asset_ids else 0
+        for free_id in asset_ids[first_index:] + asset_ids[:first_index]:
+            if f"{stem}_{free_id}" not in taken_names:
+                return f"{stem}_{free_id}"
+    return None
+
+def plan_name_changes(asset_type:str, texture_set_names:List[str]) -> List[NameChange]:
+    """ Dry run of the renames, for every failing name of the project with a suggestion, in the order of the names. Nothing is renamed. """
+    taken_names = set(texture_set_names)
+    name_changes = []
+    for texture_set_name in texture_set_names:
+        target_name = suggest_name(asset_type, texture_set_name, taken_names)
+        if target_name is not None:
+            taken_names.add(target_name) #The next suggestions can't take it anymore
+            name_changes.append(NameChange(texture_set_name, target_name))
+    return name_changes
+
+def is_rename_supported() -> bool:
+    """ Texture sets can only be renamed from Python in versions of Substance Painter with TextureSet.set_name. """
+    return hasattr(substance_painter.textureset.TextureSet, "set_name")
+
+def apply_name_changes(name_changes:List[NameChange]):
+    """
+    Renames the texture sets as one batch. When a rename fails, the renames already applied are rolled back,
+    and the error is raised again, so the project is left as it was before the batch.
+    """
+    applied_changes = []
+    try:
+        for name_change in name_changes:
+            substance_painter.textureset.TextureSet.from_name(name_change.texture_set_name).set_name(name_change.target_name)
+            applied_changes.append(name_change)
+    except Exception:
+        for name_change in reversed(applied_changes):
+            substance_painter.textureset.TextureSet.from_name(name_change.target_name).set_name(name_change.texture_set_name)
+        raise
+
+def format_name_change(name_change:NameChange) -> str:
+    """ e.g. "prop_chair_s_1 -> PROP_CHR_S_01" """
+    return f"{name_change.texture_set_name} -> {name_change.target_name}"
@@ -0,0 +1,114 @@
+"""Coalesces the refresh requests of the widget into one refresh per event loop turn, never run recursively,
+and throttles the rows changed by Substance Painter events.
+Imports no other module of the exporter, and Qt only on first use, so it is cheap to load at plugin start."""
+
+# Default Utils imports
+from typing import Callable, List
+
+LIVE_REVALIDATION_INTERVAL_MS = 500
+
+def schedule_on_event_loop(callback):
+    """ Runs the callback on the next turn of the Qt event loop. """
+    from PySide6 import QtCore #Imported here, so the scheduler and the export queue can be used headless without Qt
+    QtCore.QTimer.singleShot(0, callback)
+
+def schedule_after_delay(delay_ms:int, callback):
+    """ Runs the callback on the Qt event loop, after the delay. """
+    from PySide6 import QtCore #Imported here, so the throttle can be used headless without Qt
+    QtCore.QTimer.singleShot(delay_ms, callback)
+
+class RefreshRequest:
+    """ What a refresh has to recompute. A full refresh covers all the other flags. """
+    def __init__(self):
+        self.full = False #Every row is read again from Substance Painter and revalidated
+        self.rows = False #The dirty rows of the table store are read again and revalidated
+        self.asset_type = False #Every row is revalidated and the export paths are rebuilt
+        self.export_root = False #The export paths are rebuilt
+
+    def is_empty(self):
+        return not (self.full or self.rows or self.asset_type or self.export_root)
+
+class RefreshScheduler:
+    """ Runs refresh_callback(refresh_request) once per event loop turn, with all the requests made during that turn. """
+    def __init__(self, refresh_callback, schedule=None):
+        self.refresh_callback = refresh_callback
+        self.schedule = schedule if schedule is not None else schedule_on_event_loop
+        self.pending_request = RefreshRequest()
+        self.is_scheduled = False
+        self.is_refreshing = False
+        self.request_count = 0
+        self.refresh_count = 0
+
+    @property
+    def collapsed_count(self):
+        """ Number of requests that did not need their own refresh. """
+        return self.request_count - self.refresh_count - (1 if self.is_scheduled else 0)
+
+    def request_refresh(self, full=False, rows=False, asset_type=False, export_root=False):
+        self.request_count += 1
+        self.pending_request.full |= full
+        self.pending_request.rows |= rows
+        self.pending_request.asset_type |= asset_type
+        self.pending_request.export_root |= export_root
+        if not self.is_scheduled and not self.is_refreshing: #A running refresh schedules the pending request itself when it is done
+            self.is_scheduled = True
+            self.schedule(self.run_pending_refresh)
+
+    def run_pending_refresh(self):
+        if self.is_refreshing: #Called from a nested event loop, e.g. a modal dialog opened by the running refresh
+            return
+        self.is_scheduled = False
+        refresh_request = self.pending_request
+        self.pending_request = RefreshRequest()
+        if refresh_request.is_empty():
+            return
+
+        self.is_refreshing = True
+        try:
+            self.refresh_count += 1
+            self.refresh_callback(refresh_request)
+        finally:
+            self.is_refreshing = False
+
+        if not self.pending_request.is_empty(): #Requests made during the refresh get one more refresh, on the next event loop turn
+            self.is_scheduled = True
+            self.schedule(self.run_pending_refresh)
+
+class RowChangeThrottle:
+    """
+    Collects the rows changed by Substance Painter events, and runs rows_callback(rows) with all of them
+    at most once per interval, on the Qt event loop. While is_busy() returns True, e.g. during an export, the rows are kept for later.
+    """
+    def __init__(self, rows_callback:Callable[[List[int]], None], interval_ms:int=LIVE_REVALIDATION_INTERVAL_MS, schedule_after=None, is_busy=None):
+        self.rows_callback = rows_callback
+        self.interval_ms = interval_ms
+        self.schedule_after = schedule_after if schedule_after is not None else schedule_after_delay
+        self.is_busy = is_busy if is_busy is not None else (lambda: False)
+        self.pending_rows = set()
+        self.is_scheduled = False
+        self.change_count = 0 #Number of row changes received
+        self.flush_count = 0 #Number of times rows_callback was called
+
+    def add_row(self, row:int):
+        self.change_count += 1
+        self.pending_rows.add(row)
+        if not self.is_scheduled:
+            self.is_scheduled = True
+            self.schedule_after(self.interval_ms, self.flush)
+
+    def flush(self):
+        self.is_scheduled = False
+        if len(self.pending_rows) == 0:
+            return
+        if self.is_busy():
+            self.is_scheduled = True
+            self.schedule_after(self.interval_ms, self.flush)
+            return
+        rows = sorted(self.pending_rows)
+        self.pending_rows = set()
+        self.flush_count += 1
+        self.rows_callback(rows)
+
+    def clear(self):
+        """ Drops the pending rows, e.g. when the project is closed and the rows don't exist anymore. """
+        self.pending_rows = set()
@@ -0,0 +1,116 @@
+"""Brings over budget texture sets back within the resolution budget of their asset type, as one batch.
+Every dimension over the budget gets the largest power of two within it, the other dimension keeps its size.
+The changes are planned first (dry run), and the applied ones are rolled back when a change fails."""
+
+#Substance Painter API import
+import substance_painter.logging
+import substance_painter.textureset
+
+#Custom exporter modules
+import module_uv_tiles
+
+# Default Utils imports
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+class ResolutionChange(NamedTuple):
+    texture_set_name: str
+    tile: Optional[Tuple[int, int]] #(u, v) of the changed UV tile, None when the whole texture set is changed
+    original_res: Tuple[int, int]
+    target_res: Tuple[int, int]
+
+def get_largest_power_of_two(value:int) -> int:
+    return 1 << (value.bit_length() - 1)
+
+def get_target_res(res:Tuple[int, int], budget:Tuple[int, int]) -> Tuple[int, int]:
+    """ Largest power of two within the budget for every dimension over the budget, the other dimension is kept. """
+    return tuple(size if size <= max_size else get_largest_power_of_two(max_size) for size, max_size in zip(res, budget))
+
+def is_tile_res_supported() -> bool:
+    """ Versions of Substance Painter without per tile resolutions can only resize the whole texture set. """
+    return hasattr(substance_painter.textureset, "UVTile") and hasattr(substance_painter.textureset.UVTile, "set_resolution")
+
+def plan_resolution_changes(texture_set_resolutions:Dict[str, Tuple[Tuple[int, int], Optional[Dict[Tuple[int, int], Tuple[int, int]]]]],
+                            budget:Tuple[int, int]) -> List[ResolutionChange]:
+    """
+    Dry run of the fix, given texture set name -> (resolution, (u, v) -> (width, height) of its UV tiles or None).
+    Returns the changes to apply, in the order of the texture sets. Nothing is changed in the project.
+    """
+    resolution_changes = []
+    can_resize_tiles = is_tile_res_supported()
+    for texture_set_name, (res, tile_resolutions) in texture_set_resolutions.items():
+        if tile_resolutions is not None and can_resize_tiles:
+            for tile, tile_res in sorted(tile_resolutions.items(), key=lambda item: module_uv_tiles.get_udim(*item[0])):
+                target_res = get_target_res(tile_res, budget)
+                if target_res != tuple(tile_res):
+                    resolution_changes.append(ResolutionChange(texture_set_name, tuple(tile), tuple(tile_res), target_res))
+            continue
+        if tile_resolutions is not None: #Every tile gets the resolution of the texture set, so the largest tile decides it
+            res = module_uv_tiles.get_max_resolution(tile_resolutions)
+        target_res = get_target_res(res, budget)
+        if target_res != tuple(res):
+            resolution_changes.append(ResolutionChange(texture_set_name, None, tuple(res), target_res))
+    return resolution_changes
+
+def group_changes_by_target(resolution_changes:List[ResolutionChange]) -> Dict[Tuple[int, int], List[ResolutionChange]]:
+    changes_by_target = {}
+    for resolution_change in resolution_changes:
+        changes_by_target.setdefault(resolution_change.target_res, []).append(resolution_change)
+    return changes_by_target
+
+def set_texture_sets_resolution(texture_sets:list, res:Tuple[int, int]):
+    resolution = substance_painter.textureset.Resolution(*res)
+    if hasattr(substance_painter.textureset, "set_resolution"): #One call for all the texture sets, in recent versions of Substance Painter
+        substance_painter.textureset.set_resolution(texture_sets, resolution)
+    else:
+        for texture_set in texture_sets:
+            texture_set.set_resolution(resolution)
+
+def apply_changes(resolution_changes:List[ResolutionChange], applied_changes:List[ResolutionChange]):
+    #Whole texture sets, grouped by target resolution
+    texture_set_changes = [resolution_change for resolution_change in resolution_changes if resolution_change.tile is None]
+    for target_res, changes in group_changes_by_target(texture_set_changes).items():
+        texture_sets = [substance_painter.textureset.TextureSet.from_name(change.texture_set_name) for change in changes]
+        set_texture_sets_resolution(texture_sets, target_res)
+        applied_changes.extend(changes)
+
+    #UV tiles, the tiles of a texture set are listed once
+    tile_changes = {}
+    for resolution_change in resolution_changes:
+        if resolution_change.tile is not None:
+            tile_changes.setdefault(resolution_change.texture_set_name, []).append(resolution_change)
+    for texture_set_name, changes in tile_changes.items():
+        uv_tiles = {(uv_tile.u, uv_tile.v): uv_tile for uv_tile in substance_painter.textureset.TextureSet.from_name(texture_set_name).all_uv_tiles()}
+        for change in changes:
+            uv_tiles[change.tile].set_resolution(substance_painter.textureset.Resolution(*change.target_res))
+            applied_changes.append(change)
+
+def apply_resolution_changes(resolution_changes:List[ResolutionChange]):
+    """
+    Applies the planned changes as one batch. When a change fails, the changes already applied are rolled back,
+    and the error is raised again, so the project is left as it was before the batch.
+    A failed rollback is logged, and the error of the change is still the one raised.
+    """
+    applied_changes = []
+    try:
+        apply_changes(resolution_changes, applied_changes)
+    except Exception:
+        try:
+            apply_changes(invert_resolution_changes(applied_changes), [])
+        except Exception as rollback_error:
+            substance_painter.logging.log(substance_painter.logging.WARNING, "Custom Exporter",
+                                          f"Rollback of the resolution fix failed, some texture sets keep their new resolution: {rollback_error}")
+        raise
+
+def invert_resolution_changes(resolution_changes:List[ResolutionChange]) -> List[ResolutionChange]:
+    """ Changes that undo the given changes, when applied. """
+    return [resolution_change._replace(original_res=resolution_change.target_res, target_res=resolution_change.original_res)
+            for resolution_change in reversed(resolution_changes)]
+
+def get_changed_texture_set_names(resolution_changes:List[ResolutionChange]) -> List[str]:
+    return list(dict.fromkeys(resolution_change.texture_set_name for resolution_change in resolution_changes))
+
+def format_resolution_change(resolution_change:ResolutionChange) -> str:
+    """ e.g. "PROP_Chair_01: 4096 x 1024 -> 2048 x 1024", with the UDIM number of a changed UV tile. """
+    udim = f" {module_uv_tiles.get_udim(*resolution_change.tile)}" if resolution_change.tile is not None else ""
+    (original_width, original_height), (target_width, target_height) = resolution_change.original_res, resolution_change.target_res
+    return f"{resolution_change.texture_set_name}{udim}: {original_width} x {original_height} -> {target_width} x {target_height}"
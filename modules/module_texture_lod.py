@@ -0,0 +1,90 @@
+"""Downscaled LOD variants of the exported maps, to the resolution budgets smaller than the map, with a 2x2 area filter.
+Normal maps are renormalized. Variants are written to <export path>/LOD_<width>x<height>/<map file name>."""
+
+#Custom exporter modules
+import module_image_io
+import module_validation_resolution
+
+# Default Utils imports
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+MAX_WORKERS = 4 #Every worker holds a full resolution map in memory
+NORMAL_MAP_KEYWORD = "normal"
+
+def get_lod_scale_factors(width:int, height:int) -> List[int]:
+    """ Power of two factors bringing the map within each smaller resolution budget, e.g. [2, 4] for a 4096 map. """
+    scale_factors = set()
+    for budget_width, budget_height in module_validation_resolution.res_requirements.values():
+        scale_factor = 1
+        while width // scale_factor > budget_width or height // scale_factor > budget_height:
+            scale_factor *= 2
+        if scale_factor == 1: #The map already fits this budget
+            continue
+        if width % scale_factor == 0 and height % scale_factor == 0:
+            scale_factors.add(scale_factor)
+    return sorted(scale_factors)
+
+def downscale_area(pixels:"numpy.ndarray", scale_factor:int) -> "numpy.ndarray":
+    """ Area filter: every output pixel is the mean of a scale_factor x scale_factor block. """
+    height, width, channels = pixels.shape
+    blocks = pixels.reshape(height // scale_factor, scale_factor, width // scale_factor, scale_factor, channels)
+    return blocks.mean(axis=(1, 3), dtype="float32")
+
+def renormalize_normals(pixels:"numpy.ndarray") -> "numpy.ndarray":
+    """ Normals are stored as RGB = (XYZ + 1) / 2. Alpha, if any, is kept as it is. """
+    import numpy
+
+    normals = pixels[:, :, :3] * 2.0 - 1.0
+    length = numpy.sqrt(numpy.sum(normals * normals, axis=2, keepdims=True))
+    normals = normals / numpy.maximum(length, 1e-6)
+    renormalized = pixels.copy()
+    renormalized[:, :, :3] = (normals + 1.0) * 0.5
+    return renormalized
+
+def is_normal_map(file_path:str) -> bool:
+    return NORMAL_MAP_KEYWORD in os.path.basename(file_path).lower()
+
+def get_variant_path(file_path:str, width:int, height:int) -> str:
+    return os.path.join(os.path.dirname(file_path), f"LOD_{width}x{height}", os.path.basename(file_path))
+
+def generate_map_variants(file_path:str) -> List[str]:
+    """ Writes all variants of one map, and returns their paths. Runs in a worker thread. """
+    pixels, image_format = module_image_io.read_image(file_path)
+    height, width = pixels.shape[:2]
+    scale_factors = get_lod_scale_factors(width, height)
+    is_normal = is_normal_map(file_path) and pixels.shape[2] >= 3
+    variant_paths = []
+    current_pixels = pixels
+    current_factor = 1
+    for scale_factor in scale_factors: #Each variant is filtered from the previous one, a 2x2 mean of 2x2 means is the 4x4 mean
+        current_pixels = downscale_area(current_pixels, scale_factor // current_factor)
+        current_factor = scale_factor
+        variant_pixels = renormalize_normals(current_pixels) if is_normal else current_pixels
+        variant_path = get_variant_path(file_path, width // scale_factor, height // scale_factor)
+        module_image_io.write_image(variant_path, variant_pixels, image_format)
+        variant_paths.append(variant_path)
+    return variant_paths
+
+def generate_lod_variants(file_paths:List[str]) -> Dict[str, List[str]]:
+    """
+    Generates the variants of every exported map, in parallel.
+    Returns map path -> variant paths. Maps that can't be processed are returned with an error string instead.
+    """
+    missing_dependencies = module_image_io.get_missing_dependencies()
+    if len(missing_dependencies) > 0:
+        raise ImportError(f"LOD variants need the missing Python packages: {', '.join(missing_dependencies)}")
+
+    supported_paths = [file_path for file_path in file_paths if module_image_io.is_supported(file_path)]
+    results = {file_path: "unsupported file format" for file_path in file_paths if not module_image_io.is_supported(file_path)}
+
+    def process(file_path):
+        try:
+            return generate_map_variants(file_path)
+        except (OSError, ValueError) as error:
+            return str(error)
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results.update(zip(supported_paths, executor.map(process, supported_paths)))
+    return results
@@ -0,0 +1,184 @@
+"""Builds the packed maps of every shader type from one export of the source maps (Custom_Sources preset), with NumPy channel shuffles.
+Layouts are declared in shader_packings.json: shader type -> packed map suffix -> output channels,
+each "<SourceMap>.<R|G|B|A>", "<SourceMap>" or a constant in the 0-1 range."""
+
+#Custom exporter modules
+import module_export
+import module_image_io
+
+# Default Utils imports
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+SHADER_PACKINGS_PATH = os.path.join(os.path.dirname(__file__), "shader_packings.json")
+SOURCES_FOLDER_PREFIX = "sources_"
+MAX_WORKERS = 4 #Every worker holds all source maps of one texture set in memory
+CHANNEL_INDICES = {"R": 0, "G": 1, "B": 2, "A": 3}
+PACKED_MODES = {1: "L", 2: "LA", 3: "RGB", 4: "RGBA"}
+
+class PackedChannel(NamedTuple):
+    source_map: Optional[str] #None for a constant channel
+    channel_index: int
+    constant: float
+
+class ShaderPacking(NamedTuple):
+    shader_type: str
+    packed_maps: Dict[str, Tuple[PackedChannel, ...]]
+    layout: str #JSON of the layout, part of the export fingerprint, so a changed layout is exported again
+
+def compile_channel(channel:Union[str, float], source_maps:Dict[str, int]) -> PackedChannel:
+    if isinstance(channel, (int, float)):
+        return PackedChannel(None, 0, float(channel))
+    source_map, _, channel_name = channel.partition(".")
+    if source_map not in source_maps:
+        raise ValueError(f"unknown source map {source_map}")
+    channel_index = CHANNEL_INDICES.get(channel_name, -1) if channel_name else 0
+    if not 0 <= channel_index < source_maps[source_map]:
+        raise ValueError(f"{source_map} has no channel {channel_name}")
+    return PackedChannel(source_map, channel_index, 0.0)
+
+def load_shader_packings(config_path:str=SHADER_PACKINGS_PATH) -> Dict[str, ShaderPacking]:
+    """ Raises ValueError when a layout uses a channel that the source maps don't have. """
+    with open(config_path, "r", encoding="utf-8") as config_file:
+        config = json.load(config_file)
+    source_maps = config["source_maps"]
+    shader_packings = {}
+    for shader_type, layout in config["shader_types"].items():
+        packed_maps = {}
+        for packed_map, channels in layout.items():
+            try:
+                packed_channels = tuple(compile_channel(channel, source_maps) for channel in channels)
+            except ValueError as error:
+                raise ValueError(f"Invalid packing of {shader_type} {packed_map}: {error}") from None
+            if len(packed_channels) not in PACKED_MODES or all(channel.source_map is None for channel in packed_channels):
+                raise ValueError(f"Invalid packing of {shader_type} {packed_map}: it needs 1 to 4 channels, with at least one source channel")
+            packed_maps[packed_map] = packed_channels
+        shader_packings[shader_type] = ShaderPacking(shader_type, packed_maps, json.dumps(layout, sort_keys=True))
+    return shader_packings
+
+_shader_packings = None
+
+def shader_packings() -> Dict[str, ShaderPacking]:
+    """ Layouts are loaded once per session. """
+    global _shader_packings
+    if _shader_packings is None:
+        _shader_packings = load_shader_packings()
+    return _shader_packings
+
+def get_shader_types() -> List[str]:
+    return list(shader_packings())
+
+def create_sources_dir(staging_dir:str=None) -> str:
+    """ New empty folder for the source maps of one export run, in its staging folder, or in the scratch folder when the export is not staged. """
+    import module_export_publish #Imported on first use
+    parent_dir = staging_dir if staging_dir is not None else module_export_publish.get_scratch_root()
+    os.makedirs(parent_dir, exist_ok=True)
+    return tempfile.mkdtemp(prefix=SOURCES_FOLDER_PREFIX, dir=parent_dir).replace("\\", "/")
+
+def remove_sources_dir(sources_dir:str):
+    shutil.rmtree(sources_dir, ignore_errors=True)
+
+def build_source_export_jobs(export_jobs:List[Tuple[str, str, str]], sources_dir:str) -> List[Tuple[str, str, str]]:
+    """ One source export job per texture set, however many shader types it is packed for, all to the sources folder, so they are exported in a single group. """
+    source_jobs = {}
+    for texture_set_name, _, _ in export_jobs:
+        if texture_set_name not in source_jobs:
+            source_jobs[texture_set_name] = (texture_set_name, module_export.SOURCE_SHADER_TYPE, f"{sources_dir.rstrip('/')}/")
+    return list(source_jobs.values())
+
+def group_source_files(texture_set_name:str, file_paths:List[str]) -> Dict[str, Dict[str, str]]:
+    """ UDIM suffix ("" without UV tiles) -> source map -> file path, for files named <TextureSet>_<SourceMap>[.<UDIM>].<ext>. """
+    source_files_by_tile = {}
+    prefix = f"{texture_set_name}_"
+    for file_path in file_paths:
+        file_name = os.path.splitext(os.path.basename(file_path))[0]
+        if not file_name.startswith(prefix):
+            continue
+        source_map, _, udim = file_name[len(prefix):].partition(".")
+        source_files_by_tile.setdefault(f".{udim}" if udim else "", {})[source_map] = file_path
+    return source_files_by_tile
+
+def pack_map(packed_channels:Tuple[PackedChannel, ...], read_source) -> Tuple["numpy.ndarray", module_image_io.ImageFormat]:
+    import numpy
+
+    source_pixels = {channel.source_map: read_source(channel.source_map) for channel in packed_channels if channel.source_map is not None}
+    shapes = {pixels.shape[:2] for pixels, _ in source_pixels.values()}
+    if len(shapes) > 1:
+        raise ValueError(f"source maps {', '.join(source_pixels)} have different sizes")
+    shape = shapes.pop()
+    channels = [source_pixels[channel.source_map][0][:, :, channel.channel_index] if channel.source_map is not None
+                else numpy.full(shape, channel.constant, dtype=numpy.float32) for channel in packed_channels]
+
+    #16-bit precision is kept for single channel maps, Pillow writes multichannel images in 8-bit only
+    first_format = next(iter(source_pixels.values()))[1]
+    if len(channels) == 1 and first_format.mode in module_image_io.MODES_16_BIT:
+        packed_format = first_format
+    else:
+        packed_format = module_image_io.ImageFormat(PACKED_MODES[len(channels)], 255.0)
+    return numpy.stack(channels, axis=2), packed_format
+
+def pack_tile(texture_set_name:str, udim_suffix:str, source_paths:Dict[str, str], pack_targets:List[Tuple[ShaderPacking, str]]) -> List[str]:
+    """ Writes the packed maps of all shader types of one texture set tile, and returns their paths. Runs in a worker thread. """
+    read_sources = {}
+    def read_source(source_map):
+        if source_map not in read_sources: #Every source map is read once, whatever number of packed maps use it
+            if source_map not in source_paths:
+                raise ValueError(f"source map {source_map}{udim_suffix} of {texture_set_name} was not exported")
+            read_sources[source_map] = module_image_io.read_image(source_paths[source_map])
+        return read_sources[source_map]
+
+    extension = os.path.splitext(next(iter(source_paths.values())))[1]
+    packed_paths = []
+    for shader_packing, export_path in pack_targets:
+        for packed_map, packed_channels in shader_packing.packed_maps.items():
+            pixels, image_format = pack_map(packed_channels, read_source)
+            packed_path = os.path.join(export_path, f"{texture_set_name}_{packed_map}{udim_suffix}{extension}")
+            module_image_io.write_image(packed_path, pixels, image_format)
+            packed_paths.append(packed_path)
+    return packed_paths
+
+def pack_texture_sets(pack_jobs:List[Tuple[str, str, str]], source_files:Dict[str, List[str]]) -> Dict[str, Union[List[str], str]]:
+    """
+    Builds the packed maps of the (texture_set_name, shader_type, export_path) jobs from the exported source files,
+    given as texture set name -> source file paths. The tiles of all texture sets are processed in parallel.
+    Returns texture set name -> packed file paths, or an error string when a texture set could not be packed.
+    """
+    missing_dependencies = module_image_io.get_missing_dependencies()
+    if len(missing_dependencies) > 0:
+        raise ImportError(f"Single source export needs the missing Python packages: {', '.join(missing_dependencies)}")
+
+    pack_targets = {}
+    results = {}
+    for texture_set_name, shader_type, export_path in pack_jobs:
+        shader_packing = shader_packings().get(shader_type)
+        if shader_packing is None:
+            results[texture_set_name] = f"there is no packing layout for the shader type {shader_type}"
+            continue
+        pack_targets.setdefault(texture_set_name, []).append((shader_packing, export_path))
+
+    tile_jobs = []
+    for texture_set_name, targets in pack_targets.items():
+        source_files_by_tile = group_source_files(texture_set_name, source_files.get(texture_set_name, []))
+        if len(source_files_by_tile) == 0:
+            results[texture_set_name] = "no source maps were exported"
+        for udim_suffix, source_paths in source_files_by_tile.items():
+            tile_jobs.append((texture_set_name, udim_suffix, source_paths, targets))
+
+    def process(tile_job):
+        try:
+            return pack_tile(*tile_job)
+        except (OSError, ValueError) as error:
+            return str(error)
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for tile_job, tile_result in zip(tile_jobs, executor.map(process, tile_jobs)):
+            texture_set_name = tile_job[0]
+            if isinstance(tile_result, str):
+                results[texture_set_name] = tile_result #One failed tile fails the whole texture set
+            elif not isinstance(results.get(texture_set_name), str):
+                results.setdefault(texture_set_name, []).extend(tile_result)
+    return results
@@ -0,0 +1,113 @@
+"""Snapshot of the texture sets of the open project, read once and reused by every refresh.
+A record stays valid until a TextureStateEvent of its stack, a project change or a change made by the plugin invalidates it.
+Renames send no event: the Refresh button reads every record again."""
+
+#Custom exporter modules
+import module_uv_tiles
+
+# Default Utils imports
+from typing import Dict, List, Optional, Tuple
+
+class TextureSetRecord:
+    """ State of one texture set, as last read from Substance Painter. """
+    __slots__ = ("name", "width", "height", "stack_ids", "tile_resolutions", "validation_asset_type", "validation_state", "validation_details")
+
+    def __init__(self, name:str, width:int, height:int, stack_ids:Tuple[int, ...], tile_resolutions:Dict[Tuple[int, int], Tuple[int, int]]):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.stack_ids = stack_ids
+        self.tile_resolutions = tile_resolutions #Empty for texture sets without UV tiles
+        self.validation_asset_type = None #Asset type of the stored validation result, None until the texture set is validated
+        self.validation_state = 0
+        self.validation_details = ""
+
+def get_stack_ids(texture_set) -> Tuple[int, ...]:
+    """ Ids of the stacks of a texture set, several for a layered material. Empty when the API doesn't give stack ids. """
+    if not hasattr(texture_set, "all_stacks"):
+        return ()
+    return tuple(stack.stack_id for stack in texture_set.all_stacks() if hasattr(stack, "stack_id"))
+
+def read_record(texture_set) -> TextureSetRecord:
+    resolution = texture_set.get_resolution()
+    return TextureSetRecord(texture_set.name(), resolution.width, resolution.height,
+                            get_stack_ids(texture_set), module_uv_tiles.get_tile_resolutions(texture_set))
+
+class TextureSetSnapshot:
+    """ Records of the texture sets of the open project, indexed by row, in the order of all_texture_sets(). """
+    def __init__(self):
+        self.hit_count = 0 #Records served from the snapshot
+        self.miss_count = 0 #Records read from Substance Painter
+        self.reset([])
+
+    def reset(self, texture_sets:list):
+        self.texture_sets = list(texture_sets)
+        self.records: List[Optional[TextureSetRecord]] = [None] * len(self.texture_sets) #None when the record has to be read again
+        self.row_by_stack_id = {}
+
+    def __len__(self):
+        return len(self.texture_sets)
+
+    def get_record(self, row:int) -> TextureSetRecord:
+        record = self.records[row]
+        if record is not None:
+            self.hit_count += 1
+            return record
+        self.miss_count += 1
+        record = read_record(self.texture_sets[row])
+        self.records[row] = record
+        for stack_id in record.stack_ids:
+            self.row_by_stack_id[stack_id] = row
+        return record
+
+    def stale_rows(self) -> List[int]:
+        return [row for row, record in enumerate(self.records) if record is None]
+
+    def invalidate_row(self, row:int):
+        self.records[row] = None
+
+    def invalidate_stack(self, stack_id:int) -> Optional[int]:
+        """ Invalidates the record of the texture set owning the stack, and returns its row, None for an unknown stack. """
+        row = self.row_by_stack_id.get(stack_id)
+        if row is not None:
+            self.records[row] = None
+        return row
+
+    def invalidate_renamed(self, stack_id:int, name:str) -> Optional[int]:
+        """ Invalidates the record of the texture set owning the stack if its name changed, and returns its row, None otherwise. """
+        row = self.row_by_stack_id.get(stack_id)
+        if row is None or self.records[row] is None or self.records[row].name == name:
+            return None
+        self.records[row] = None
+        return row
+
+    def invalidate_all(self):
+        self.records = [None] * len(self.texture_sets)
+
+    def sync_names(self, texture_sets:list) -> bool:
+        """
+        Takes the current texture sets of the project, and invalidates the records of the renamed ones, with one API call per texture set.
+        Returns False when texture sets were added or removed, the snapshot has to be reset then.
+        """
+        if len(texture_sets) != len(self.texture_sets):
+            return False
+        self.texture_sets = list(texture_sets)
+        for row, texture_set in enumerate(self.texture_sets):
+            record = self.records[row]
+            if record is not None and texture_set.name() != record.name:
+                self.records[row] = None
+        return True
+
+    def get_validation(self, row:int, asset_type:str) -> Optional[Tuple[int, str]]:
+        """ Stored (validation_state, validation_details) of a texture set for the asset type, None if it has to be validated. """
+        record = self.records[row]
+        if record is None or record.validation_asset_type != asset_type:
+            return None
+        return record.validation_state, record.validation_details
+
+    def set_validation(self, row:int, asset_type:str, validation_state:int, validation_details:str):
+        record = self.records[row]
+        if record is not None:
+            record.validation_asset_type = asset_type
+            record.validation_state = validation_state
+            record.validation_details = validation_details
@@ -0,0 +1,294 @@
+"""Model/view classes of the texture set table: the rows are parallel arrays of TextureSetRowStore,
+and cells are computed only for the visible rows, so no widget is created per row."""
+
+# 3rd party UI library import
+from PySide6 import QtCore
+from PySide6.QtWidgets import QApplication, QComboBox, QStyle, QStyledItemDelegate, QStyleOptionComboBox
+
+#Custom exporter modules
+import module_export
+import module_uv_tiles
+import module_validation_memory
+
+# Default Utils imports
+from array import array
+from typing import Callable, Dict, List, Tuple
+
+COLUMN_EXPORT = 0
+COLUMN_NAME = 1
+COLUMN_SHADER = 2
+COLUMN_RESOLUTION = 3
+COLUMN_MEMORY = 4
+COLUMN_EXPORT_PATH = 5
+COLUMN_VALIDATION = 6
+COLUMN_ESTIMATE = 7
+COLUMN_EXPORT_STATUS = 8
+COLUMN_HEADERS = ["Export", "Texture Set Name", "Shader Type", "Resolution", "GPU Memory", "Export Path", "Validation", "Estimate", "Export Status"]
+
+VALIDATION_UNKNOWN = 0
+VALIDATION_OK = 1
+VALIDATION_NAME_FAILED = 2
+VALIDATION_RES_FAILED = 3
+VALIDATION_MEMORY_FAILED = 4
+VALIDATION_FAILED_CHECKS = {VALIDATION_NAME_FAILED: "Name", VALIDATION_RES_FAILED: "Resolution", VALIDATION_MEMORY_FAILED: "GPU Memory"}
+
+class TextureSetRowStore:
+    """ Row state of the texture set table, stored as parallel arrays indexed by row. """
+    def __init__(self):
+        self.reset([], [])
+
+    def reset(self, names:List[str], resolutions:List[Tuple[int, int]]):
+        row_count = len(names)
+        self.names = list(names)
+        self.widths = array("i", (width for width, _ in resolutions))
+        self.heights = array("i", (height for _, height in resolutions))
+        self.tile_resolutions = [None] * row_count #(u, v) -> (width, height) of the UV tiles, None for texture sets without UV tiles
+        self.shader_indices = array("b", bytes(row_count))
+        self.export_checked = array("b", [1]) * row_count
+        self.export_enabled = array("b", [1]) * row_count
+        self.validation_states = array("b", bytes(row_count))
+        self.validation_details = [""] * row_count #Failure reason of the validation, empty when it passed
+        self.name_suggestions = [""] * row_count #Nearest valid name of a failing name, see module_name_autofix. Empty when there is none
+        self.memory_validation = None #MemoryValidation of all rows, None until it is computed or when NumPy is missing
+        self.estimates = [""] * row_count #Estimated duration and disk size of the export, see module_export_estimate
+        self.estimate_details = [""] * row_count #Tooltip of the estimate, with the work and the rates it was estimated with
+        self.export_statuses = [""] * row_count
+        self.export_status_details = [""] * row_count #Tooltip of the export status, e.g. the issues found by the post-export verification
+        self.row_by_name = {name: row for row, name in enumerate(self.names)}
+        self.dirty_rows = set() #Rows changed by a row-local edit, refreshed by the next incremental refresh
+
+    def __len__(self):
+        return len(self.names)
+
+    def set_name(self, row:int, name:str):
+        self.row_by_name.pop(self.names[row], None)
+        self.names[row] = name
+        self.row_by_name[name] = row
+
+    def mark_dirty(self, row:int):
+        self.dirty_rows.add(row)
+
+    def take_dirty_rows(self) -> List[int]:
+        dirty_rows = sorted(self.dirty_rows)
+        self.dirty_rows = set()
+        return dirty_rows
+
+    def rows_with_validation_state(self, validation_state:int) -> List[int]:
+        return [row for row, state in enumerate(self.validation_states) if state == validation_state]
+
+    def set_resolution(self, row:int, width:int, height:int):
+        self.widths[row] = width
+        self.heights[row] = height
+
+    def set_tile_resolutions(self, row:int, tile_resolutions:Dict[Tuple[int, int], Tuple[int, int]]):
+        """ The resolution of a texture set with UV tiles is the largest resolution of its tiles. """
+        self.tile_resolutions[row] = tile_resolutions if len(tile_resolutions) > 0 else None
+        if self.tile_resolutions[row] is not None:
+            self.set_resolution(row, *module_uv_tiles.get_max_resolution(tile_resolutions))
+
+    def set_validation(self, row:int, validation_state:int, validation_details:str=""):
+        """ The export checkbox follows the first validation of the row and every change of its validity, otherwise it keeps the choice of the user. """
+        previous_state = self.validation_states[row]
+        is_valid = validation_state == VALIDATION_OK
+        if previous_state == VALIDATION_UNKNOWN or is_valid != (previous_state == VALIDATION_OK):
+            self.export_checked[row] = is_valid
+        self.validation_states[row] = validation_state
+        self.validation_details[row] = validation_details
+        self.export_enabled[row] = is_valid
+
+class TextureSetTableModel(QtCore.QAbstractTableModel):
+    """ Table model over a TextureSetRowStore. """
+    exportStateChanged = QtCore.Signal(int) #Row whose export checkbox was toggled by the user
+    shaderChanged = QtCore.Signal(int) #Row whose shader type was changed by the user
+
+    def __init__(self, store:TextureSetRowStore, shader_types:List[str], load_validation_icons:Callable, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.shader_types = shader_types
+        self.load_validation_icons = load_validation_icons #Returns the (ok, fail) icons, called the first time a validation icon is drawn
+        self.validation_icons = None
+        self.export_root = ""
+        self.asset_type = ""
+        self.updated_cell_count = 0 #Number of cells notified as changed, reset by the widget before every refresh
+
+    def reset_rows(self, names:List[str], resolutions:List[Tuple[int, int]]):
+        self.beginResetModel()
+        self.store.reset(names, resolutions)
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMN_HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if orientation == QtCore.Qt.Orientation.Horizontal and role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return COLUMN_HEADERS[section]
+        return None
+
+    def shader_type(self, row:int) -> str:
+        return self.shader_types[self.store.shader_indices[row]]
+
+    def export_path(self, row:int) -> str:
+        """ Export path of the row, built from the current export root and asset type. """
+        return module_export.build_export_path(self.export_root, self.asset_type, self.store.names[row], self.shader_type(row))
+
+    def validation_tooltip(self, row:int) -> str:
+        store = self.store
+        name = store.names[row]
+        validation_state = store.validation_states[row]
+        if validation_state == VALIDATION_OK:
+            return f"Texture set validations are OK for texture set {row+1} \
+                    \n{name} \
+                    \nGood job!"
+        if validation_state == VALIDATION_UNKNOWN:
+            return ""
+        failed_check = VALIDATION_FAILED_CHECKS[validation_state]
+        details = store.validation_details[row]
+        if validation_state == VALIDATION_MEMORY_FAILED and store.memory_validation is not None: #Built on request, with the current totals of the project
+            details = module_validation_memory.format_memory_details(store.memory_validation, row)
+        if validation_state == VALIDATION_NAME_FAILED and store.name_suggestions[row]:
+            details = f"{details} \
+                \nSuggested name: {store.name_suggestions[row]}"
+        return f"Texture set {failed_check} validation is FAILED for texture set {row+1} \
+                \n{name} \
+                \nReason: {details} \
+                \nExport of this texture set is forcibly disabled until validation is OK."
+
+    def tile_resolution_tooltip(self, row:int) -> str:
+        tiles_by_resolution = module_uv_tiles.group_tiles_by_resolution(self.store.tile_resolutions[row])
+        return "\n".join(f"{width} x {height}: UDIM {module_uv_tiles.format_udims(tiles)}" for (width, height), tiles in sorted(tiles_by_resolution.items(), reverse=True))
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        column = index.column()
+        store = self.store
+        if role == QtCore.Qt.ItemDataRole.DisplayRole or role == QtCore.Qt.ItemDataRole.EditRole:
+            if column == COLUMN_NAME:
+                return store.names[row]
+            if column == COLUMN_SHADER:
+                return self.shader_type(row)
+            if column == COLUMN_RESOLUTION:
+                if store.tile_resolutions[row] is not None:
+                    return f"{store.widths[row]} x {store.heights[row]} ({len(store.tile_resolutions[row])} tiles)"
+                return f"{store.widths[row]} x {store.heights[row]}"
+            if column == COLUMN_MEMORY:
+                if store.memory_validation is None or row >= len(store.memory_validation.footprints):
+                    return ""
+                return module_validation_memory.format_megabytes(int(store.memory_validation.footprints[row]))
+            if column == COLUMN_EXPORT_PATH:
+                return self.export_path(row)
+            if column == COLUMN_ESTIMATE:
+                return store.estimates[row]
+            if column == COLUMN_EXPORT_STATUS:
+                return store.export_statuses[row]
+        elif role == QtCore.Qt.ItemDataRole.CheckStateRole and column == COLUMN_EXPORT:
+            return QtCore.Qt.CheckState.Checked if store.export_checked[row] else QtCore.Qt.CheckState.Unchecked
+        elif role == QtCore.Qt.ItemDataRole.DecorationRole and column == COLUMN_VALIDATION:
+            validation_state = store.validation_states[row]
+            if validation_state == VALIDATION_UNKNOWN:
+                return None
+            if self.validation_icons is None:
+                self.validation_icons = self.load_validation_icons()
+            icon_validation_ok, icon_validation_fail = self.validation_icons
+            return icon_validation_ok if validation_state == VALIDATION_OK else icon_validation_fail
+        elif role == QtCore.Qt.ItemDataRole.ToolTipRole:
+            if column == COLUMN_VALIDATION:
+                return self.validation_tooltip(row)
+            if column == COLUMN_EXPORT:
+                if store.validation_states[row] == VALIDATION_OK:
+                    return f"Specify if Texture Set {row+1}: {store.names[row]} should be processed during the export or skipped."
+                return self.validation_tooltip(row)
+            if column == COLUMN_SHADER:
+                return "Specify the type of export preset to be used during the export process"
+            if column == COLUMN_RESOLUTION and store.tile_resolutions[row] is not None:
+                return self.tile_resolution_tooltip(row)
+            if column == COLUMN_MEMORY and store.memory_validation is not None and row < len(store.memory_validation.footprints):
+                return module_validation_memory.format_footprint_tooltip(store.memory_validation, row, self.shader_type(row))
+            if column == COLUMN_ESTIMATE:
+                return store.estimate_details[row]
+            if column == COLUMN_EXPORT_STATUS:
+                return store.export_status_details[row]
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.ItemDataRole.EditRole):
+        if not index.isValid():
+            return False
+        row = index.row()
+        column = index.column()
+        if role == QtCore.Qt.ItemDataRole.CheckStateRole and column == COLUMN_EXPORT:
+            self.store.export_checked[row] = QtCore.Qt.CheckState(value) == QtCore.Qt.CheckState.Checked
+            self.dataChanged.emit(self.index(row, COLUMN_EXPORT), self.index(row, COLUMN_EXPORT_PATH)) #The rest of the row is grayed out or enabled again
+            self.exportStateChanged.emit(row)
+            return True
+        if role == QtCore.Qt.ItemDataRole.EditRole and column == COLUMN_SHADER:
+            if value not in self.shader_types:
+                return False
+            shader_index = self.shader_types.index(value)
+            if shader_index == self.store.shader_indices[row]:
+                return False
+            self.store.shader_indices[row] = shader_index
+            self.store.mark_dirty(row)
+            self.dataChanged.emit(index, self.index(row, COLUMN_EXPORT_PATH))
+            self.shaderChanged.emit(row)
+            return True
+        return False
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.ItemFlag.NoItemFlags
+        row = index.row()
+        column = index.column()
+        store = self.store
+        if column == COLUMN_EXPORT:
+            item_flags = QtCore.Qt.ItemFlag.ItemIsUserCheckable | QtCore.Qt.ItemFlag.ItemIsSelectable
+            if store.export_enabled[row]:
+                item_flags |= QtCore.Qt.ItemFlag.ItemIsEnabled
+            return item_flags
+
+        item_flags = QtCore.Qt.ItemFlag.ItemIsSelectable #Every other column is read-only, except the shader dropdown
+        if column >= COLUMN_VALIDATION or store.export_checked[row]: #Unchecked rows are grayed out, except the validation icon, the estimate and the export status
+            item_flags |= QtCore.Qt.ItemFlag.ItemIsEnabled
+            if column == COLUMN_SHADER:
+                item_flags |= QtCore.Qt.ItemFlag.ItemIsEditable
+        return item_flags
+
+    def notify_rows_changed(self, first_row:int, last_row:int, first_column:int=0, last_column:int=len(COLUMN_HEADERS)-1):
+        if len(self.store) > 0:
+            self.updated_cell_count += (last_row - first_row + 1) * (last_column - first_column + 1)
+            self.dataChanged.emit(self.index(first_row, first_column), self.index(last_row, last_column))
+
+    def notify_all_changed(self):
+        self.notify_rows_changed(0, len(self.store) - 1)
+
+class ShaderComboDelegate(QStyledItemDelegate):
+    """ Draws the shader type as a dropdown, and only creates a real QComboBox while the cell is edited. """
+    def __init__(self, shader_types:List[str], parent=None):
+        super().__init__(parent)
+        self.shader_types = shader_types
+
+    def paint(self, painter, option, index):
+        combo_option = QStyleOptionComboBox()
+        combo_option.rect = option.rect
+        combo_option.state = option.state
+        combo_option.currentText = index.data(QtCore.Qt.ItemDataRole.DisplayRole)
+        style = QApplication.style()
+        style.drawComplexControl(QStyle.ComplexControl.CC_ComboBox, combo_option, painter)
+        style.drawControl(QStyle.ControlElement.CE_ComboBoxLabel, combo_option, painter)
+
+    def createEditor(self, parent, option, index):
+        combo_box = QComboBox(parent)
+        combo_box.addItems(self.shader_types)
+        combo_box.currentIndexChanged.connect(lambda _: self.commitData.emit(combo_box)) #The change is applied right away, like the former cell widgets
+        return combo_box
+
+    def setEditorData(self, editor, index):
+        editor.blockSignals(True)
+        editor.setCurrentText(index.data(QtCore.Qt.ItemDataRole.EditRole))
+        editor.blockSignals(False)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), QtCore.Qt.ItemDataRole.EditRole)
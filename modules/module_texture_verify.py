@@ -0,0 +1,188 @@
+"""Verifies the exported textures from their image headers only (PNG, TGA, OpenEXR, TIFF), in parallel:
+missing maps, wrong dimensions and unexpected bit depths."""
+
+#Substance Painter API import
+import substance_painter
+#Custom exporter modules
+import module_export_manifest
+import module_validation_resolution
+
+# Default Utils imports
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+MAX_HEADER_BYTES = 65536 #No header read goes past this many bytes
+MAX_WORKERS = 8
+
+ALLOWED_BIT_DEPTHS = {
+    "png": {8, 16},
+    "tga": {8},
+    "tif": {8, 16, 32},
+    "tiff": {8, 16, 32},
+    "exr": {16, 32},
+}
+
+class ImageHeader(NamedTuple):
+    file_format: str
+    width: int
+    height: int
+    bit_depth: int #Bits per channel
+    channels: int
+
+class HeaderError(Exception):
+    pass
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4} #Color type -> number of channels
+EXR_MAGIC = b"\x76\x2f\x31\x01"
+EXR_PIXEL_TYPE_BITS = {0: 32, 1: 16, 2: 32} #UINT, HALF, FLOAT
+
+def read_png_header(image_file) -> ImageHeader:
+    data = image_file.read(33)
+    if len(data) < 33 or data[:8] != PNG_SIGNATURE or data[12:16] != b"IHDR":
+        raise HeaderError("not a PNG file")
+    width, height, bit_depth, color_type = struct.unpack(">IIBB", data[16:26])
+    return ImageHeader("png", width, height, bit_depth, PNG_CHANNELS.get(color_type, 0))
+
+def read_tga_header(image_file) -> ImageHeader:
+    data = image_file.read(18)
+    if len(data) < 18:
+        raise HeaderError("truncated TGA header")
+    width, height, pixel_depth, descriptor = struct.unpack("<HHBB", data[12:18])
+    alpha_bits = descriptor & 0x0F
+    if pixel_depth in (24, 32):
+        return ImageHeader("tga", width, height, 8, pixel_depth // 8)
+    if pixel_depth == 16:
+        return ImageHeader("tga", width, height, 5, 4 if alpha_bits else 3)
+    return ImageHeader("tga", width, height, pixel_depth, 1)
+
+def read_exr_header(image_file) -> ImageHeader:
+    data = image_file.read(MAX_HEADER_BYTES)
+    if data[:4] != EXR_MAGIC:
+        raise HeaderError("not an OpenEXR file")
+    position = 8 #Magic number and version field
+    width = height = None
+    channel_bits = []
+    while True:
+        name_end = data.find(b"\0", position)
+        if name_end < 0:
+            raise HeaderError("OpenEXR header is larger than the read limit")
+        attribute_name = data[position:name_end]
+        if attribute_name == b"": #End of the header
+            break
+        type_end = data.find(b"\0", name_end + 1)
+        attribute_size = struct.unpack("<i", data[type_end + 1:type_end + 5])[0]
+        value = data[type_end + 5:type_end + 5 + attribute_size]
+        if len(value) < attribute_size:
+            raise HeaderError("OpenEXR header is larger than the read limit")
+        if attribute_name == b"dataWindow":
+            x_min, y_min, x_max, y_max = struct.unpack("<iiii", value[:16])
+            width, height = x_max - x_min + 1, y_max - y_min + 1
+        elif attribute_name == b"channels":
+            channel_position = 0
+            while channel_position < len(value) and value[channel_position] != 0:
+                channel_name_end = value.find(b"\0", channel_position)
+                pixel_type = struct.unpack("<i", value[channel_name_end + 1:channel_name_end + 5])[0]
+                channel_bits.append(EXR_PIXEL_TYPE_BITS.get(pixel_type, 0))
+                channel_position = channel_name_end + 1 + 16 #pixel type, pLinear, reserved, x and y sampling
+        position = type_end + 5 + attribute_size
+    if width is None or len(channel_bits) == 0:
+        raise HeaderError("OpenEXR header has no dataWindow or channels")
+    return ImageHeader("exr", width, height, max(channel_bits), len(channel_bits))
+
+def read_tiff_header(image_file) -> ImageHeader:
+    data = image_file.read(8)
+    if data[:4] == b"II*\0":
+        byte_order = "<"
+    elif data[:4] == b"MM\0*":
+        byte_order = ">"
+    else:
+        raise HeaderError("not a classic TIFF file")
+    ifd_offset = struct.unpack(byte_order + "I", data[4:8])[0]
+    image_file.seek(ifd_offset)
+    entry_count = struct.unpack(byte_order + "H", image_file.read(2))[0]
+    entries = image_file.read(min(entry_count * 12, MAX_HEADER_BYTES))
+    tags = {}
+    for i in range(len(entries) // 12):
+        tag, field_type, count = struct.unpack(byte_order + "HHI", entries[i * 12:i * 12 + 8])
+        value_bytes = entries[i * 12 + 8:i * 12 + 12]
+        if field_type == 3: #SHORT, the first value is stored inline when it fits
+            value = struct.unpack(byte_order + "H", value_bytes[:2])[0] if count <= 2 else None
+        elif field_type == 4: #LONG
+            value = struct.unpack(byte_order + "I", value_bytes)[0] if count == 1 else None
+        else:
+            value = None
+        tags[tag] = (value, count, value_bytes)
+    if 256 not in tags or 257 not in tags:
+        raise HeaderError("TIFF has no ImageWidth or ImageLength")
+    samples_per_pixel = tags.get(277, (1, 1, b""))[0] or 1
+    bits_per_sample, bits_count, bits_value_bytes = tags.get(258, (1, 1, b""))
+    if bits_per_sample is None: #More than 2 samples, the values are stored at an offset
+        image_file.seek(struct.unpack(byte_order + "I", bits_value_bytes)[0])
+        bits_per_sample = struct.unpack(byte_order + "H", image_file.read(2))[0]
+    return ImageHeader("tif", tags[256][0], tags[257][0], bits_per_sample, samples_per_pixel)
+
+HEADER_READERS = {
+    ".png": read_png_header,
+    ".tga": read_tga_header,
+    ".exr": read_exr_header,
+    ".tif": read_tiff_header,
+    ".tiff": read_tiff_header,
+}
+
+def read_image_header(file_path:str) -> ImageHeader:
+    """ Reads the header of an image file, raises HeaderError if the format is unknown or the header is invalid. """
+    header_reader = HEADER_READERS.get(os.path.splitext(file_path)[1].lower())
+    if header_reader is None:
+        raise HeaderError(f"unsupported file format {os.path.splitext(file_path)[1]}")
+    with open(file_path, "rb") as image_file:
+        try:
+            return header_reader(image_file)
+        except struct.error:
+            raise HeaderError("truncated header")
+
+def check_file(file_path:str, expected_resolution:Optional[List[int]], budget:Tuple[int, int]) -> List[str]:
+    """ Returns the issues of one exported file. Runs in a worker thread. """
+    if not os.path.exists(file_path):
+        return [f"Missing map {os.path.basename(file_path)}"]
+    try:
+        header = read_image_header(file_path)
+    except (OSError, HeaderError) as error:
+        return [f"Unreadable header of {os.path.basename(file_path)}: {error}"]
+
+    issues = []
+    file_name = os.path.basename(file_path)
+    if expected_resolution is not None and [header.width, header.height] != list(expected_resolution):
+        issues.append(f"{file_name} is {header.width} x {header.height}, expected {expected_resolution[0]} x {expected_resolution[1]}")
+    if header.width > budget[0] or header.height > budget[1]:
+        issues.append(f"{file_name} is {header.width} x {header.height}, over the budget of {budget[0]} x {budget[1]}")
+    allowed_bit_depths = ALLOWED_BIT_DEPTHS.get(header.file_format)
+    if allowed_bit_depths is not None and header.bit_depth not in allowed_bit_depths:
+        issues.append(f"{file_name} has {header.bit_depth} bits per channel, expected {sorted(allowed_bit_depths)}")
+    return issues
+
+def verify_export_groups(export_groups:List, asset_type:str) -> Dict[str, List[str]]:
+    """
+    Verifies the files of exported groups, given as (export_config, texture_set_names) tuples.
+    Returns texture set name -> list of issues, with an empty list for the texture sets that passed.
+    """
+    budget = module_validation_resolution.get_required_res_from_asset_type(asset_type)
+    checks = [] #(texture set name, file path, expected resolution)
+    issues_by_texture_set = {}
+    for export_config, texture_set_names in export_groups:
+        for texture_set_name in texture_set_names:
+            issues_by_texture_set[texture_set_name] = []
+        sizes_by_stack = module_export_manifest.get_sizes_by_stack(export_config)
+        sizes_by_tile = module_export_manifest.get_sizes_by_tile(export_config)
+        #The API is only called from this thread, the workers only read files. Every UV tile file is checked against the resolution of its tile
+        for (texture_set_name, stack_name), file_paths in substance_painter.export.list_project_textures(export_config).items():
+            stack_path = f"{texture_set_name}/{stack_name}"
+            checks.extend((texture_set_name, file_path, module_export_manifest.get_map_resolution(sizes_by_stack, sizes_by_tile, stack_path, file_path)) for file_path in file_paths)
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        file_issues = executor.map(lambda check: check_file(check[1], check[2], budget), checks)
+        for (texture_set_name, _, _), issues in zip(checks, file_issues):
+            issues_by_texture_set.setdefault(texture_set_name, []).extend(issues)
+    return issues_by_texture_set
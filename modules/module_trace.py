@@ -0,0 +1,91 @@
+"""Opt-in timing of the hot paths, recorded as Chrome trace events (chrome://tracing, https://ui.perfetto.dev).
+Enabled by the Trace checkbox or CUSTOM_EXPORTER_TRACE=1, a disabled span() is a shared no-op."""
+
+# Default Utils imports
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+TRACE_PATH = os.environ.get("CUSTOM_EXPORTER_TRACE_PATH", os.path.join(tempfile.gettempdir(), "custom_exporter_trace.json"))
+MAX_EVENTS = 100000 #Oldest events are dropped first, so a long session can't grow the trace forever
+
+is_enabled = os.environ.get("CUSTOM_EXPORTER_TRACE", "0") == "1"
+trace_events = deque(maxlen=MAX_EVENTS)
+run_start_us = 0.0
+
+class NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+NOOP_SPAN = NoopSpan()
+
+class Span:
+    __slots__ = ("name", "args", "start_us")
+
+    def __init__(self, name:str, args:Dict):
+        self.name = name
+        self.args = args
+        self.start_us = 0.0
+
+    def __enter__(self):
+        self.start_us = time.perf_counter_ns() / 1000
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end_us = time.perf_counter_ns() / 1000
+        trace_events.append({
+            "name": self.name,
+            "ph": "X", #Complete event, with a start and a duration
+            "ts": self.start_us,
+            "dur": end_us - self.start_us,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": self.args,
+        })
+        return False
+
+def span(name:str, **args):
+    if not is_enabled:
+        return NOOP_SPAN
+    return Span(name, args)
+
+def set_enabled(enabled:bool):
+    global is_enabled
+    is_enabled = enabled
+
+def begin_run():
+    """ Marks the start of a run (a refresh or an export), its spans are summarized by end_run. """
+    global run_start_us
+    run_start_us = time.perf_counter_ns() / 1000
+
+def summarize(events:List[Dict]) -> List[Dict]:
+    """ Total time and count per span name, longest first. """
+    totals = {}
+    for event in events:
+        total = totals.setdefault(event["name"], {"name": event["name"], "count": 0, "total_ms": 0.0})
+        total["count"] += 1
+        total["total_ms"] += event["dur"] / 1000
+    return sorted(totals.values(), key=lambda total: total["total_ms"], reverse=True)
+
+def end_run(trace_path:Optional[str]=None) -> List[Dict]:
+    """ Writes the whole trace to disk and returns the summary of the spans of the last run. Does nothing when tracing is disabled. """
+    if not is_enabled:
+        return []
+    write_trace(trace_path or TRACE_PATH)
+    return summarize([event for event in trace_events if event["ts"] >= run_start_us])
+
+def write_trace(trace_path:str):
+    temp_path = f"{trace_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as trace_file:
+        json.dump({"traceEvents": list(trace_events), "displayTimeUnit": "ms"}, trace_file)
+    os.replace(temp_path, trace_path)
+
+def format_summary(summary:List[Dict], max_spans:int=4) -> str:
+    return ", ".join(f"{total['name']} {total['total_ms']:.1f} ms ({total['count']}x)" for total in summary[:max_spans])
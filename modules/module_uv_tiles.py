@@ -0,0 +1,54 @@
+"""UV tile (UDIM) helpers. Tiles are (u, v) tuples, UDIM = 1001 + u + 10 * v,
+and tiled maps are exported as <TextureSet>_<Map>.<UDIM>.<ext>."""
+
+# Default Utils imports
+import re
+from typing import Dict, List, Optional, Tuple
+
+UDIM_FILE_REGEX = re.compile(r"\.(1\d{3})\.[^./\\]+$")
+
+def get_udim(u:int, v:int) -> int:
+    return 1001 + u + 10 * v
+
+def get_tile_from_udim(udim:int) -> Tuple[int, int]:
+    return (udim - 1001) % 10, (udim - 1001) // 10
+
+def get_udim_from_file_path(file_path:str) -> Optional[int]:
+    """ UDIM number of an exported file, None for the files of texture sets without UV tiles. """
+    udim_match = UDIM_FILE_REGEX.search(file_path)
+    return int(udim_match.group(1)) if udim_match is not None else None
+
+def get_tile_resolutions(texture_set) -> Dict[Tuple[int, int], Tuple[int, int]]:
+    """
+    (u, v) -> (width, height) of every UV tile of a texture set, empty for texture sets without UV tiles.
+    Versions of Substance Painter without per tile resolutions use the resolution of the texture set for every tile.
+    """
+    if not hasattr(texture_set, "has_uv_tiles") or not texture_set.has_uv_tiles():
+        return {}
+    texture_set_resolution = None
+    tile_resolutions = {}
+    for uv_tile in texture_set.all_uv_tiles():
+        if hasattr(uv_tile, "get_resolution"):
+            resolution = uv_tile.get_resolution()
+        else:
+            if texture_set_resolution is None:
+                texture_set_resolution = texture_set.get_resolution()
+            resolution = texture_set_resolution
+        tile_resolutions[(uv_tile.u, uv_tile.v)] = (resolution.width, resolution.height)
+    return tile_resolutions
+
+def group_tiles_by_resolution(tile_resolutions:Dict[Tuple[int, int], Tuple[int, int]], tiles:Optional[List[Tuple[int, int]]]=None) -> Dict[Tuple[int, int], List[List[int]]]:
+    """ (width, height) -> [u, v] tiles with this resolution, for the given tiles or all of them. """
+    tiles_by_resolution = {}
+    for tile in (tiles if tiles is not None else tile_resolutions):
+        tiles_by_resolution.setdefault(tile_resolutions[tuple(tile)], []).append(list(tile))
+    return tiles_by_resolution
+
+def get_max_resolution(tile_resolutions:Dict[Tuple[int, int], Tuple[int, int]]) -> Tuple[int, int]:
+    return max(width for width, _ in tile_resolutions.values()), max(height for _, height in tile_resolutions.values())
+
+def format_udims(tiles:List[Tuple[int, int]], max_count:int=8) -> str:
+    """ Short list of UDIM numbers for messages and tooltips, e.g. "1001, 1002 and 3 more". """
+    udims = sorted(get_udim(u, v) for u, v in tiles)
+    udim_list = ", ".join(str(udim) for udim in udims[:max_count])
+    return f"{udim_list} and {len(udims) - max_count} more" if len(udims) > max_count else udim_list
@@ -0,0 +1,135 @@
+"""GPU memory validation of all texture sets at once, with NumPy (optional, see is_available()).
+Footprint: resolution x block compressed bytes per pixel of every map of the shader type x mip chain.
+Budgets per asset type, in memory_budgets.json: texture_set for every texture set, asset for all of them."""
+
+#Custom exporter modules
+import module_texture_packing
+
+# Default Utils imports
+import importlib.util
+import json
+import os
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+MEMORY_BUDGETS_PATH = os.path.join(os.path.dirname(__file__), "memory_budgets.json")
+BLOCK_SIZE = 4 #Block compressed formats store 4 x 4 pixel blocks
+MEGABYTE = 1024 * 1024
+
+class MemoryBudget(NamedTuple):
+    texture_set_bytes: int
+    asset_bytes: int
+
+class MemoryValidation(NamedTuple):
+    footprints: "numpy.ndarray" #Bytes of every texture set, by row
+    is_valid: "numpy.ndarray" #Bool of every texture set, by row
+    asset_footprint: int
+    budget: MemoryBudget
+    asset_type: str
+
+def is_available() -> bool:
+    return importlib.util.find_spec("numpy") is not None
+
+_memory_config = None
+
+def memory_config() -> Dict:
+    """ memory_budgets.json, loaded once per session. """
+    global _memory_config
+    if _memory_config is None:
+        with open(MEMORY_BUDGETS_PATH, "r", encoding="utf-8") as config_file:
+            _memory_config = json.load(config_file)
+    return _memory_config
+
+def get_budget(asset_type:str) -> MemoryBudget:
+    """ The strictest budget for an asset type without one, like the resolution budget. """
+    budgets = memory_config()["budgets_mb"]
+    budget = budgets.get(asset_type) or min(budgets.values(), key=lambda budget: budget["texture_set"])
+    return MemoryBudget(int(budget["texture_set"] * MEGABYTE), int(budget["asset"] * MEGABYTE))
+
+def get_map_formats(shader_type:str) -> List[Tuple[str, str, float]]:
+    """ (packed map, format, bytes per pixel) of every map of a shader type. """
+    config = memory_config()
+    shader_packing = module_texture_packing.shader_packings().get(shader_type)
+    if shader_packing is None:
+        return []
+    map_formats = []
+    for packed_map, packed_channels in shader_packing.packed_maps.items():
+        texture_format = config["format_by_map"].get(packed_map) or config["format_by_channel_count"][str(len(packed_channels))]
+        map_formats.append((packed_map, texture_format, config["formats"][texture_format]))
+    return map_formats
+
+def get_mip_chain_pixels(widths:"numpy.ndarray", heights:"numpy.ndarray") -> "numpy.ndarray":
+    """ Pixels of every resolution with its mip chain, every level padded to whole blocks. """
+    import numpy
+    widths = widths.astype(numpy.int64)
+    heights = heights.astype(numpy.int64)
+    pixels = numpy.zeros(len(widths), dtype=numpy.int64)
+    while True:
+        pixels += (-(-widths // BLOCK_SIZE) * BLOCK_SIZE) * (-(-heights // BLOCK_SIZE) * BLOCK_SIZE)
+        if not memory_config()["mip_maps"] or len(widths) == 0 or (widths.max() <= 1 and heights.max() <= 1):
+            return pixels
+        widths = numpy.maximum(widths >> 1, 1)
+        heights = numpy.maximum(heights >> 1, 1)
+
+def compute_footprints(widths:Sequence[int], heights:Sequence[int], shader_indices:Sequence[int], shader_types:List[str],
+                       tile_resolutions:List[Optional[Dict[Tuple[int, int], Tuple[int, int]]]]) -> "numpy.ndarray":
+    """
+    Bytes of every texture set, given by row: its resolution, the index of its shader type in shader_types,
+    and the (u, v) -> (width, height) of its UV tiles, None without UV tiles. Returns an int64 array, by row.
+    """
+    import numpy
+    row_count = len(widths)
+    bytes_per_pixel = numpy.array([sum(map_bytes_per_pixel for _, _, map_bytes_per_pixel in get_map_formats(shader_type)) for shader_type in shader_types], dtype=numpy.float64)
+    row_bytes_per_pixel = bytes_per_pixel[numpy.asarray(shader_indices, dtype=numpy.int64)] if row_count > 0 else numpy.zeros(0)
+
+    #Texture sets without UV tiles take one entry, texture sets with UV tiles one entry per tile
+    tile_rows = [row for row in range(row_count) if tile_resolutions[row] is not None]
+    entry_rows = numpy.arange(row_count, dtype=numpy.int64)
+    entry_widths = numpy.asarray(widths, dtype=numpy.int64)
+    entry_heights = numpy.asarray(heights, dtype=numpy.int64)
+    if len(tile_rows) > 0:
+        is_tiled = numpy.zeros(row_count, dtype=bool)
+        is_tiled[tile_rows] = True
+        tile_entries = [(row, width, height) for row in tile_rows for width, height in tile_resolutions[row].values()]
+        tile_entries = numpy.array(tile_entries, dtype=numpy.int64).reshape(-1, 3)
+        entry_rows = numpy.concatenate([entry_rows[~is_tiled], tile_entries[:, 0]])
+        entry_widths = numpy.concatenate([entry_widths[~is_tiled], tile_entries[:, 1]])
+        entry_heights = numpy.concatenate([entry_heights[~is_tiled], tile_entries[:, 2]])
+
+    entry_bytes = get_mip_chain_pixels(entry_widths, entry_heights) * row_bytes_per_pixel[entry_rows]
+    return numpy.rint(numpy.bincount(entry_rows, weights=entry_bytes, minlength=row_count)).astype(numpy.int64)
+
+def validate_memory(asset_type:str, footprints:"numpy.ndarray") -> MemoryValidation:
+    """ Checks the footprints of all texture sets of the project against the budgets of the asset type. """
+    budget = get_budget(asset_type)
+    asset_footprint = int(footprints.sum())
+    is_valid = footprints <= budget.texture_set_bytes
+    if asset_footprint > budget.asset_bytes:
+        is_valid[:] = False
+    return MemoryValidation(footprints, is_valid, asset_footprint, budget, asset_type)
+
+def format_megabytes(byte_count:int) -> str:
+    return f"{byte_count / MEGABYTE:.1f} MB"
+
+def format_memory_details(memory_validation:MemoryValidation, row:int) -> str:
+    """ Failure reason of a texture set, empty when it is within both budgets. """
+    footprint = int(memory_validation.footprints[row])
+    budget = memory_validation.budget
+    if footprint > budget.texture_set_bytes:
+        return f"GPU memory of the Texture set is {format_megabytes(footprint)}, \
+                \nwhich is more than max allowed per texture set for current Asset Type ({memory_validation.asset_type}): \
+                \n{format_megabytes(budget.texture_set_bytes)}"
+    if memory_validation.asset_footprint > budget.asset_bytes:
+        return f"GPU memory of all Texture sets of the project is {format_megabytes(memory_validation.asset_footprint)}, \
+                \nwhich is more than max allowed per asset for current Asset Type ({memory_validation.asset_type}): \
+                \n{format_megabytes(budget.asset_bytes)} \
+                \nThis texture set takes {format_megabytes(footprint)}"
+    return ""
+
+def format_footprint_tooltip(memory_validation:MemoryValidation, row:int, shader_type:str) -> str:
+    """ Maps and formats of the texture set, and its share of the budgets. """
+    footprint = int(memory_validation.footprints[row])
+    budget = memory_validation.budget
+    map_lines = [f"{packed_map}: {texture_format} ({map_bytes_per_pixel:g} bytes per pixel)" for packed_map, texture_format, map_bytes_per_pixel in get_map_formats(shader_type)]
+    return "\n".join([f"GPU memory with mip maps: {format_megabytes(footprint)}, {footprint / budget.texture_set_bytes:.0%} of the texture set budget ({format_megabytes(budget.texture_set_bytes)})"]
+                     + map_lines
+                     + [f"All texture sets: {format_megabytes(memory_validation.asset_footprint)}, {memory_validation.asset_footprint / budget.asset_bytes:.0%} of the asset budget ({format_megabytes(budget.asset_bytes)})"])
@@ -9,145 +9,151 @@
         Prop Type could be: "CHR" (Chair), "TBL" (Table), LMP (Lamp), or WIN (Window).
         Prop Size/Scale could be: "S" (Small), "M" (Medium), or "L" (Large).
         Valid Texture Set names for Props:
-            Prop_CHR_S_01
-            Prop_BKL_M_02
+            PROP_CHR_S_01
+            PROP_TBL_M_02
     
     For Weapons, details are Weapon Type and Rarity:
         Weapon Type could be: "SWD: (Sword), "BOW" (Bow), "RFL" (Rifle), or "EXP" (Explosive).
         Weapon Rarity could be: "COM" (Common),  "RAR" (Rare), or "EPC" (Epic).
         Valid Texture Set names for Weapons:
             WPN_BOW_COM_01
-            WPN_RLF_EPC_04
+            WPN_RFL_EPC_04
     
     For Character, details are Character Type and Gender
         Character Type could be: "PLR" (Player), "ENM" (Enemy), or "CIV" (Civilian).
         Character Gender could be: Male (ML), or Female (FL).
         Valid Texture Set names for Characters:
             CHAR_PLR_ML_01
-            CHAR_CIV_FM_05
+            CHAR_CIV_FL_05
+
+    The rules are stored in naming_rules.json (asset type -> prefix, detail vocabularies, ID pattern and resolution budget),
+    so adding an asset type doesn't need any code. They are compiled once into sets and one regex per asset type.
 
     Content:
         - validate_name
-        - validate_name_props
-        - validate_name_characters
-        - validate_name_weapon
+        - validate_names
+        - get_asset_types
+        - load_naming_rules
 
     Contributors:
         - Bjørn Troldahl, bjoerntrold@hotmail.com
 """
 
 # Default Utils imports
-from typing import Tuple
-
-props_asset_detail_1_list = ["CHR", "TBL", "LMP", "WIN"]
-props_asset_detail_2_list = ["S", "M", "L"]
-
-weapons_asset_detail_1_list = ["SWD", "BOW", "RFL", "EXP"]
-weapons_asset_detail_2_list = ["COM", "RAR", "EPC"]
-
-characters_asset_detail_1_list = ["PLR", "ENM", "CIV"]
-characters_asset_detail_2_list = ["ML", "FL"]
-
-def validate_name_props(asset_type_acronym:str, asset_type_detail_1:str, asset_type_detail_2:str) -> Tuple[bool, str]:
-    """ Sub-validation function used for specific rules check applied to Characters Texture sets. """
-    is_validation_passed = None
-    validation_details = None
-    if asset_type_acronym != "PROP":
-        is_validation_passed = False
-        validation_details = f"First acronym is for Asset Type \
-                                \nFor asset type 'Props' valid option is 'PROP' \
-                                \nCurrent acronym is: {asset_type_acronym}"
-    elif asset_type_detail_1 not in props_asset_detail_1_list:
-        is_validation_passed = False
-        validation_details = f"Second acronym is for Asset Detail #1 \
-                                \nFor 'Props' valid options are {props_asset_detail_1_list} \
-                                \nCurrent acronym is: {asset_type_detail_1}"
-    elif asset_type_detail_2 not in props_asset_detail_2_list:
-        is_validation_passed = False
-        validation_details = f"Third acronym is for Asset Detail #2 \
-                                \nFor 'Props' valid options are {props_asset_detail_2_list} \
-                                \nCurrent acronym is: {asset_type_detail_2}"
-    else: 
-        is_validation_passed = True
-        validation_details = "All validation checks passed!"
-    return is_validation_passed, validation_details
-
-def validate_name_weapons(asset_type_acronym:str, asset_type_detail_1:str, asset_type_detail_2:str) -> Tuple[bool, str]:
-    """ Sub-validation function used for specific rules check applied to Weapons Texture sets. """
-    is_validation_passed = None
-    validation_details = None
-    if asset_type_acronym != "WPN":
-        is_validation_passed = False
-        validation_details = f"First acronym is for Asset Type \
-                                \nFor asset type 'Weapons' valid option is 'WPN' \
-                                \nCurrent acronym is: {asset_type_acronym}"
-    elif asset_type_detail_1 not in weapons_asset_detail_1_list:
-        is_validation_passed = False
-        validation_details = f"Second acronym is for Asset Detail #1 \
-                                \nFor 'Weapons' valid options are {weapons_asset_detail_1_list} \
-                                \nCurrent acronym is: {asset_type_detail_1}"
-    elif asset_type_detail_2 not in weapons_asset_detail_2_list:
-        is_validation_passed = False
-        validation_details = f"Third acronym is for Asset Detail #2 \
-                                \nFor 'Weapons' valid options are {weapons_asset_detail_2_list} \
-                                \nCurrent acronym is: {asset_type_detail_2}"
-    else: 
-        is_validation_passed = True
-        validation_details = "All validation checks passed!"
-    return is_validation_passed, validation_details
-
-def validate_name_characters(asset_type_acronym:str, asset_type_detail_1:str, asset_type_detail_2:str) -> Tuple[bool, str]:
-    """ Sub-validation function used for specific rules check applied to Characters Texture sets. """
-    is_validation_passed = None
-    validation_details = None
-    if asset_type_acronym != "CHAR":
-        is_validation_passed = False
-        validation_details = f"First acronym is for Asset Type \
-                                \nFor asset type 'Characters' valid option is 'CHAR' \
-                                \nCurrent acronym is: {asset_type_acronym}"
-    elif asset_type_detail_1 not in characters_asset_detail_1_list:
-        is_validation_passed = False
-        validation_details = f"Second acronym is for Asset Detail #1 \
-                                \nFor 'Characters' valid options are {characters_asset_detail_1_list} \
-                                \nCurrent acronym is: {asset_type_detail_1}"
-    elif asset_type_detail_2 not in characters_asset_detail_2_list:
-        is_validation_passed = False
-        validation_details = f"Third acronym is for Asset Detail #2 \
-                                \nFor 'Characters' valid options are {characters_asset_detail_2_list} \
-                                \nCurrent acronym is: {asset_type_detail_2}"
-    else: 
-        is_validation_passed = True
-        validation_details = "All validation checks passed!"
-    return is_validation_passed, validation_details
+import json
+import os
+import re
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+NAMING_RULES_PATH = os.path.join(os.path.dirname(__file__), "naming_rules.json")
+
+ORDINALS = ["First", "Second", "Third", "Fourth", "Fifth", "Sixth", "Seventh", "Eighth", "Ninth", "Tenth"]
+
+class CompiledNamingRule(NamedTuple):
+    """ Naming rule of one asset type, compiled for fast lookups. """
+    asset_type: str
+    prefix: str
+    details: Tuple[FrozenSet[str], ...]
+    details_display: Tuple[List[str], ...] #Original order of the vocabularies, used in the validation messages
+    id_regex: "re.Pattern"
+    id_description: str
+    name_regex: "re.Pattern"
+    acronym_count: int
+    max_resolution: Optional[Tuple[int, int]] #Resolution budget of the asset type, None if the rules don't declare one
+
+class NameValidationResult(NamedTuple):
+    texture_set_name: str
+    is_valid: bool
+    details: str
+
+def compile_naming_rule(asset_type:str, rule:Dict) -> CompiledNamingRule:
+    details = [list(detail_options) for detail_options in rule["details"]]
+    id_pattern = rule.get("id_pattern", "[0-9]{2}")
+    # One regex for the whole name, so valid names never need to be splitted
+    name_pattern = "_".join([re.escape(rule["prefix"])] 
+                            + ["(?:" + "|".join(re.escape(option) for option in detail_options) + ")" for detail_options in details] 
+                            + [f"(?:{id_pattern})"])
+    return CompiledNamingRule(asset_type=asset_type,
+                              prefix=rule["prefix"],
+                              details=tuple(frozenset(detail_options) for detail_options in details),
+                              details_display=tuple(details),
+                              id_regex=re.compile(id_pattern),
+                              id_description=rule.get("id_description", f"values matching {id_pattern}"),
+                              name_regex=re.compile(name_pattern),
+                              acronym_count=len(details) + 2,
+                              max_resolution=tuple(rule["max_resolution"]) if "max_resolution" in rule else None)
+
+def load_naming_rules(naming_rules_path:str=NAMING_RULES_PATH) -> Dict[str, CompiledNamingRule]:
+    with open(naming_rules_path, "r", encoding="utf-8") as naming_rules_file:
+        naming_rules = json.load(naming_rules_file)
+    return {asset_type: compile_naming_rule(asset_type, rule) for asset_type, rule in naming_rules.items()}
+
+compiled_naming_rules = load_naming_rules()
+
+def get_asset_types() -> List[str]:
+    """ Asset types in the order they are declared in the naming rules. """
+    return list(compiled_naming_rules.keys())
+
+def get_naming_rule(asset_type:str) -> Optional[CompiledNamingRule]:
+    return compiled_naming_rules.get(asset_type)
+
+def get_ordinal(position:int) -> str:
+    """ Ordinal of the acronym at the zero-based position, numbered past the spelled out ones. """
+    return ORDINALS[position] if position < len(ORDINALS) else f"#{position + 1}"
+
+def get_valid_format(acronym_count:int) -> str:
+    return "_".join(["AssetType"] + [f"AssetDetail{i}" for i in range(1, acronym_count - 1)] + ["AssetID"])
+
+def validate_name_details(rule:CompiledNamingRule, texture_set_name_acronyms:List[str]) -> Tuple[bool, str]:
+    """ Sub-validation function used for specific rules check applied to the Texture sets of the asset type of the rule. """
+    asset_type_acronym = texture_set_name_acronyms[0]
+    if asset_type_acronym != rule.prefix:
+        return False, f"First acronym is for Asset Type \
+                        \nFor asset type '{rule.asset_type}' valid option is '{rule.prefix}' \
+                        \nCurrent acronym is: {asset_type_acronym}"
+    for i, detail_options in enumerate(rule.details):
+        asset_type_detail = texture_set_name_acronyms[i + 1]
+        if asset_type_detail not in detail_options:
+            return False, f"{get_ordinal(i + 1)} acronym is for Asset Detail #{i + 1} \
+                            \nFor '{rule.asset_type}' valid options are {rule.details_display[i]} \
+                            \nCurrent acronym is: {asset_type_detail}"
+    return True, "All validation checks passed!"
 
 def validate_name(asset_type: str, texture_set_name: str) -> Tuple[bool, str]:
     """ 
     Core function to validate texture set name.
     Performs general rules validation and, if they are passed,
-    triggers sub-validation functions for the specific asset type.
+    triggers sub-validation of the details for the specific asset type.
     """
+    rule = compiled_naming_rules.get(asset_type)
+    if rule is None:
+        return False, "General validation error. Asset type is not valid. \
+                        \nThere is a mismatch between Asset Type in the Dropdown list of the widget and the asset types in naming_rules.json \
+                        \nPlease contact a tool developer for further assistance"
+
+    if rule.name_regex.fullmatch(texture_set_name): #Fast path, valid names are checked without splitting them
+        return True, "All validation checks passed!"
+
     texture_set_name_acronyms = texture_set_name.split("_")
     # Template validation
-    if len(texture_set_name_acronyms) != 4: #Does not accept ANY more or less names than 4
-        return False, f"Texture Set name must consist of 4 acronyms separated by underscore symbol _ \
-                        \nValid format: AssetType_AssetDetail1_AssetDetail2_AssetID \
+    if len(texture_set_name_acronyms) != rule.acronym_count: #Does not accept ANY more or less acronyms than the rule defines
+        return False, f"Texture Set name must consist of {rule.acronym_count} acronyms separated by underscore symbol _ \
+                        \nValid format: {get_valid_format(rule.acronym_count)} \
                         \nCurrent number of acronyms: {len(texture_set_name_acronyms)}"
-    
-    asset_type_acronym, asset_type_detail_1, asset_type_detail_2, asset_id = texture_set_name_acronyms
 
     #Asset ID validation
-    if (len(asset_id) != 2) or (not asset_id.isdigit()): #Does not accept ANY more or less digits than 2 or if the ID is not a number
+    asset_id = texture_set_name_acronyms[-1]
+    if not rule.id_regex.fullmatch(asset_id):
         return False, f"Last acronym is used to specify Asset ID \
-                        \nValid options are any numbers from rang 00 to 99. For example: 01, 55, 17 \
+                        \nValid options are {rule.id_description} \
                         \nCurrent acronym is: {asset_id}"
-    
-    if asset_type == "Props":
-        return validate_name_props(asset_type_acronym, asset_type_detail_1, asset_type_detail_2)
-    elif asset_type == "Weapons":
-        return validate_name_weapons(asset_type_acronym, asset_type_detail_1, asset_type_detail_2)
-    elif asset_type == "Characters":
-        return validate_name_characters(asset_type_acronym, asset_type_detail_1, asset_type_detail_2)
-    
-    return False, f"General validation error. Asset type is not valid. \
-                    \nThere is a mismatch between Asset Type in the Dropdown list of the widget and the strings in the validate_name function \
-                    \nPlease contact a tool developer for further assistance"
+
+    return validate_name_details(rule, texture_set_name_acronyms)
+
+def validate_names(asset_type:str, texture_set_names:List[str]) -> List[NameValidationResult]:
+    """ Validates many texture set names at once. Duplicated names are only validated once. """
+    results_by_name = {}
+    for texture_set_name in texture_set_names:
+        if texture_set_name not in results_by_name:
+            results_by_name[texture_set_name] = NameValidationResult(texture_set_name, *validate_name(asset_type, texture_set_name))
+    return [results_by_name[texture_set_name] for texture_set_name in texture_set_names]
@@ -1,19 +1,20 @@
-"""Max allowed resolution for each asset type:
+"""Max allowed resolution for each asset type, the max_resolution of naming_rules.json:
 Props: 1024 x 1024
 Weapons: 2048 x 2048
 Characters: 4096 x 4096
-Lower resolution is allowed."""
+Lower resolution is allowed.
+Texture sets with UV tiles are validated per tile, every tile has to be within the budget."""
 
 #Substance Painter API import
 import substance_painter.logging
+#Custom exporter modules
+import module_uv_tiles
+import module_validation_name
 # Default Utils imports
-from typing import Tuple
+from typing import Dict, Tuple
 
-res_requirements = {
-    "Props" : [1024, 1024],
-    "Weapons" : [2048, 2048],
-    "Characters" : [4096, 4096]
-}
+res_requirements = {asset_type: list(rule.max_resolution) for asset_type, rule in module_validation_name.compiled_naming_rules.items()
+                    if rule.max_resolution is not None}
 
 def get_required_res_from_asset_type(asset_type:str) -> Tuple[int, int]:
     """ Retrieves the required texture budget for the currently selected asset type. """
@@ -43,4 +44,18 @@ def validate_res(asset_type:str, current_texture_set_res:str) -> Tuple[bool, str
     else:
         is_validation_passed = True
         validation_details = "All validation checks passed!"
-    return is_validation_passed, validation_details
\ No newline at end of file
+    return is_validation_passed, validation_details
+
+def validate_tile_res(asset_type:str, tile_resolutions:Dict[Tuple[int, int], Tuple[int, int]]) -> Tuple[bool, str]:
+    """ Resolution check of every UV tile of a texture set, given as (u, v) -> (width, height). The details list the over budget tiles. """
+    required_res_width, required_res_height = get_required_res_from_asset_type(asset_type)
+    over_budget_tiles = [tile for tile, (width, height) in tile_resolutions.items() if width > required_res_width or height > required_res_height]
+    if len(over_budget_tiles) == 0:
+        return True, "All validation checks passed!"
+
+    max_width, max_height = module_uv_tiles.get_max_resolution({tile: tile_resolutions[tile] for tile in over_budget_tiles})
+    validation_details = f"{len(over_budget_tiles)} of {len(tile_resolutions)} UV tiles are up to {max_width} x {max_height}, \
+                        \nwhich is bigger than max allowed for current Asset Type ({asset_type}): \
+                        \n{required_res_width} x {required_res_height} \
+                        \nUDIM tiles over budget: {module_uv_tiles.format_udims(over_budget_tiles)}"
+    return False, validation_details
@@ -1,14 +1,23 @@
 # Painter API import 
 import substance_painter
-import substance_painter_plugins
 
 # 3rd party UI library import
-from PySide6.QtWidgets import QWidget, QLabel, QCheckBox, QComboBox, QPushButton, QHBoxLayout, QVBoxLayout, QTableWidget, QTableWidgetItem, QDialog, QDialogButtonBox
-from PySide6 import QtCore, QtGui
+from PySide6.QtWidgets import QWidget, QLabel, QCheckBox, QComboBox, QPushButton, QHBoxLayout, QVBoxLayout, QTableView, QAbstractItemView, QDialog, QDialogButtonBox, QPlainTextEdit
+from PySide6 import QtCore, QtGui, QtWidgets
 from PySide6.QtGui import QAction
 
-#Custom exporter modules
+#Custom exporter modules - only the ones the table, its validations and its export paths need when the plugin starts
+#The modules of the export and of the post-export stages (cache, estimate, journal, publish, dedup, LOD, verification) are imported on first use
 import module_export
+import module_name_autofix
+import module_refresh_scheduler
+import module_resolution_autofix
+import module_texture_packing
+import module_texture_snapshot
+import module_texture_table
+import module_trace
+import module_uv_tiles
+import module_validation_memory
 import module_validation_name
 import module_validation_resolution
 
@@ -16,9 +25,39 @@ import module_validation_resolution
 import importlib
 import os 
 
-is_user_dev = True
+#Set CUSTOM_EXPORTER_DEV=1 to reload the modules every time the plugin starts, so code changes are picked up without restarting Substance Painter
+is_user_dev = os.environ.get("CUSTOM_EXPORTER_DEV", "0") == "1"
 if is_user_dev:
+    import module_export_cache
+    import module_export_dedup
+    import module_export_estimate
+    import module_export_journal
+    import module_export_manifest
+    import module_export_publish
+    import module_export_queue
+    import module_image_io
+    import module_texture_lod
+    import module_texture_verify
+    importlib.reload(module_export_manifest) #Imported by other modules, so reloaded before them
+    importlib.reload(module_image_io)
+    importlib.reload(module_refresh_scheduler)
     importlib.reload(module_export)
+    importlib.reload(module_export_cache)
+    importlib.reload(module_export_dedup)
+    importlib.reload(module_export_estimate)
+    importlib.reload(module_export_journal)
+    importlib.reload(module_export_publish)
+    importlib.reload(module_export_queue)
+    importlib.reload(module_name_autofix)
+    importlib.reload(module_resolution_autofix)
+    importlib.reload(module_texture_lod)
+    importlib.reload(module_texture_packing)
+    importlib.reload(module_texture_snapshot)
+    importlib.reload(module_texture_table)
+    importlib.reload(module_texture_verify)
+    importlib.reload(module_trace)
+    importlib.reload(module_uv_tiles)
+    importlib.reload(module_validation_memory)
     importlib.reload(module_validation_name)
     importlib.reload(module_validation_resolution)
 
@@ -45,22 +84,46 @@ class CustomExporter:
             substance_painter.logging.log(substance_painter.logging.WARNING, "Custom Exporter", f"Waiting for debugger to attach in VS Code in port {port}")
 
     def init_widget_window(self):
-        self.asset_types = ["Props", "Weapons", "Characters"] #list of asset types
-        self.shader_types = ["Basic", "Armament", "Morph"] #list of shader types
-        self.textsets_with_overbudget_res = [] #list of texture sets with overbudget resolution, empty by default on startup
+        self.asset_types = module_validation_name.get_asset_types() #list of asset types, as declared in naming_rules.json
+        self.shader_types = module_texture_packing.get_shader_types() #list of shader types, as declared in shader_packings.json
+        self.rows_with_overbudget_res = [] #Table rows of the texture sets with overbudget resolution, empty by default on startup
+        self.applied_resolution_changes = [] #Changes of the last resolution autofix, undone by the Undo Resolution Fix button
+        self.is_res_dialog_suppressed = False #True until the revalidation that follows a resolution autofix or its undo is done
+        self.export_queue = None #Export queue of the running export, None when no export is running
+        self.export_cache = None #Fingerprint cache of the export root used by the running export
+        self.export_tile_filters = {} #Texture set name -> (u, v) tiles to export, for the texture sets with only some tiles changed
+        self.pack_jobs = [] #(texture_set_name, shader_type, export_path) jobs packed from the source maps, when Single Source Export is checked
+        self.sources_dir = None #Temporary folder of the source maps of the running export, removed once they are packed. None without Single Source Export
+        self.packed_files = [] #Files written by the packing of the running export
+        self.staging_dir = None #Local folder the running export writes to, before its files are published to the export root. None without local staging
+        self.staged_files = {} #Texture set name -> files written to the staging folder by the running export
+        self.export_cache_records = [] #(cache_key, texture_set_name, files, duration) of the running export, recorded in the export cache when it is done
+        self.cost_model = None #Cost model of the export root used by the last export or estimate, refined after every exported group
+        self.export_estimates = {} #Texture set name -> ExportEstimate of the last export or estimate
+        self.measured_export_cost = (0.0, 0.0) #(measured, estimated) duration of the groups exported by the running export
+        self.export_journal = None #Journal of the running export, so it can be resumed if it is interrupted
+        self.resumed_files = {} #Texture set name -> files of the texture sets skipped by resuming an interrupted export
+        self.skipped_export_message = "" #Texture sets skipped by the last export, as unchanged or already exported before an interruption
+        self.is_project_closing = False #True when the running export was cancelled by its project closing, it is left to be resumed
+        self.is_memory_warning_logged = False #The missing NumPy warning is logged once per session
+        self.project_revision_token = None #Identifies the saved state of the project when it was opened, None if it is unknown
+        self.content_revisions = {} #Texture set name -> number of stack edits since the project was opened
+        self.texture_set_snapshot = module_texture_snapshot.TextureSetSnapshot() #Texture set data read from Substance Painter, until an event invalidates it
+        self.refresh_scheduler = module_refresh_scheduler.RefreshScheduler(self.perform_refresh) #All refresh requests of one event loop turn are merged into one refresh
+        self.live_revalidation = module_refresh_scheduler.RowChangeThrottle(self.revalidate_changed_rows, is_busy=self.is_export_running) #Rows changed by Substance Painter events, revalidated a few times per second at most
+        self.is_fill_trace_run = False #True between a table fill and its refresh, so both are summarized as one traced run
+        self.is_table_fill_pending = False #True when the table has to be filled the next time the widget is shown
+        self.is_first_show_done = False
+        self.dock_widget = None
         self.widget = QWidget()
         self.widget.setObjectName("Custom Exporter")
         self.widget.setWindowTitle("Custom Exporter")
+        self.widget.showEvent = self.on_widget_shown #The icons and the table are loaded when the widget is shown, not when the plugin starts
 
         self.file_dir = os.path.dirname(__file__)
 
         self.icons_path = os.path.join(self.file_dir, "icons")
-
-        self.icon_main_window = QtGui.QIcon(os.path.join(self.icons_path, "main_window_icon.png"))
-        self.icon_validation_ok = QtGui.QIcon(os.path.join(self.icons_path, "validation_ok.png"))
-        self.icon_validation_fail = QtGui.QIcon(os.path.join(self.icons_path, "validation_fail.png"))
-        self.pixmap_help = QtGui.QPixmap(os.path.join(self.icons_path, "help.png"))
-        self.widget.setWindowIcon(self.icon_main_window)
+        self.icons = {} #Icon file name -> QIcon, every icon is loaded on first use
 
         # Add a layout and content to make the widget visible
         self.main_layout = QVBoxLayout(self.widget)
@@ -68,13 +131,11 @@ class CustomExporter:
         # Help Icon
         help_layout = QHBoxLayout()
         help_layout.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
-        help_label = QLabel()
-        scaled_pixmap = self.pixmap_help.scaled(32, 32) #Scaling the help icon to 32x32 pixels
-        help_label.setPixmap(scaled_pixmap)
-        help_label.setFixedSize(scaled_pixmap.size())
-        help_label.mousePressEvent = self.show_help #When the help icon is clicked, it will trigger the show_help function
-        help_label.setToolTip("Click here to open the help documentation \nHotkey: Alt + F1")
-        help_layout.addWidget(help_label)
+        self.help_label = QLabel()
+        self.help_label.setFixedSize(32, 32) #The help icon is scaled to 32x32 pixels when the widget is first shown
+        self.help_label.mousePressEvent = self.show_help #When the help icon is clicked, it will trigger the show_help function
+        self.help_label.setToolTip("Click here to open the help documentation \nHotkey: Alt + F1")
+        help_layout.addWidget(self.help_label)
         self.main_layout.addLayout(help_layout)
 
         # Help Action
@@ -103,11 +164,37 @@ class CustomExporter:
         self.refresh_button.setShortcut(QtGui.QKeySequence(QtCore.Qt.ALT | QtCore.Qt.Key_R))
         self.main_layout.addWidget(self.refresh_button)
 
-        #Table widget
-        self.table_widget = QTableWidget()
-        self.table_widget.setMinimumSize(730,250)
+        #Undo resolution fix button
+        self.undo_res_fix_button = QPushButton("Undo Resolution Fix")
+        self.undo_res_fix_button.setToolTip("Restore the resolutions changed by the last resolution autofix")
+        self.undo_res_fix_button.setEnabled(False) #Only enabled after a resolution autofix
+        self.main_layout.addWidget(self.undo_res_fix_button)
+
+        #Rename button, renames the texture sets failing the name validation to their suggested names
+        self.rename_button = QPushButton("Rename to Suggested Names")
+        self.rename_button.setToolTip("Rename every texture set failing the name validation to the nearest valid name, shown in its validation tooltip")
+        self.rename_button.setEnabled(False) #Only enabled when a failing name has a suggestion
+        self.main_layout.addWidget(self.rename_button)
+
+        #Refresh statistics label
+        self.refresh_stats_label = QLabel("")
+        self.refresh_stats_label.setToolTip("Number of table cells updated by the last refresh, and number of refresh requests merged into another refresh")
+        self.main_layout.addWidget(self.refresh_stats_label)
+
+        #Table view, the rows are stored in the model and drawn by delegates, so no widget is created per texture set
+        self.texture_table_store = module_texture_table.TextureSetRowStore()
+        self.texture_table_model = module_texture_table.TextureSetTableModel(self.texture_table_store, self.shader_types, self.load_validation_icons)
+        self.shader_delegate = module_texture_table.ShaderComboDelegate(self.shader_types)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.texture_table_model)
+        self.table_view.setItemDelegateForColumn(module_texture_table.COLUMN_SHADER, self.shader_delegate)
+        self.table_view.setEditTriggers(QAbstractItemView.EditTrigger.CurrentChanged | QAbstractItemView.EditTrigger.SelectedClicked)
+        self.table_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.table_view.verticalHeader().setVisible(False) #Hides the visible numbers of vertical headers
+        self.table_view.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed) #Fixed row heights keep scrolling constant-cost per visible row
+        self.table_view.setMinimumSize(730,250)
         self.init_rows_and_cols_table()
-        self.main_layout.addWidget(self.table_widget)
+        self.main_layout.addWidget(self.table_view)
 
         #Export button
         self.export_button = QPushButton("Export")
@@ -115,19 +202,80 @@ class CustomExporter:
         self.export_button.setShortcut(QtGui.QKeySequence(QtCore.Qt.ALT | QtCore.Qt.Key_E))
         self.main_layout.addWidget(self.export_button)
 
+        #Estimate export button
+        self.estimate_button = QPushButton("Estimate Export")
+        self.estimate_button.setToolTip("Dry run of the export: estimate the duration and disk size of every checked texture set that changed, without exporting \nThe estimates are refined after every export, from its measured durations and file sizes")
+        self.main_layout.addWidget(self.estimate_button)
+
+        #Force export checkbox
+        self.force_export_checkbox = QCheckBox("Force Export")
+        self.force_export_checkbox.setToolTip("Export all checked texture sets, also the ones that have not changed since their last export")
+        self.main_layout.addWidget(self.force_export_checkbox)
+
+        #Single source export checkbox
+        self.single_source_checkbox = QCheckBox("Single Source Export")
+        self.single_source_checkbox.setToolTip("Export the source maps of each texture set once, and build the maps of its shader type from them, as declared in shader_packings.json \nShader types without an export preset can only be exported this way")
+        self.main_layout.addWidget(self.single_source_checkbox)
+
+        #Local staging checkbox
+        self.local_staging_checkbox = QCheckBox("Stage Exports Locally")
+        self.local_staging_checkbox.setToolTip("Export to a local scratch folder first, then copy the files to the export path in parallel, with checksum verification \nA texture set is only published when all its files are verified \nScratch folder: the CUSTOM_EXPORTER_SCRATCH environment variable, or the temp folder of the system")
+        self.local_staging_checkbox.setChecked(True)
+        self.local_staging_checkbox.toggled.connect(self.on_local_staging_toggled)
+        self.main_layout.addWidget(self.local_staging_checkbox)
+
+        #Deduplication checkbox
+        self.dedup_checkbox = QCheckBox("Deduplicate Identical Maps")
+        self.dedup_checkbox.setToolTip("Publish identical maps as hardlinks to one copy, stored once in the .texture_store folder of the export path \nContents published by earlier exports are reused, only new contents are copied \nNeeds local staging, and a volume with hardlinks: the maps are copied otherwise \nA tool that edits a published map in place changes every identical map linked to it")
+        self.dedup_checkbox.setChecked(False) #Tools that edit a published map in place would change every map linked to it
+        self.main_layout.addWidget(self.dedup_checkbox)
+
+        #LOD variants checkbox
+        self.lod_variants_checkbox = QCheckBox("Generate LOD Variants")
+        self.lod_variants_checkbox.setToolTip("After the export, write downscaled copies of every map for each smaller resolution budget, in LOD_<width>x<height> folders next to the maps")
+        self.main_layout.addWidget(self.lod_variants_checkbox)
+
+        #Cancel export button
+        self.cancel_export_button = QPushButton("Cancel Export")
+        self.cancel_export_button.setToolTip("Cancel the texture sets that have not been exported yet \nHotkey: Alt + C")
+        self.cancel_export_button.setShortcut(QtGui.QKeySequence(QtCore.Qt.ALT | QtCore.Qt.Key_C))
+        self.cancel_export_button.setEnabled(False) #Only enabled while an export is running
+        self.main_layout.addWidget(self.cancel_export_button)
+
+        #Export progress label
+        self.export_progress_label = QLabel("")
+        self.main_layout.addWidget(self.export_progress_label)
+
+        #Trace checkbox and summary of the last traced run
+        self.trace_checkbox = QCheckBox("Trace")
+        self.trace_checkbox.setToolTip(f"Record the timings of refreshes and exports \nTrace file: {module_trace.TRACE_PATH}")
+        self.trace_checkbox.setChecked(module_trace.is_enabled)
+        self.main_layout.addWidget(self.trace_checkbox)
+        self.trace_summary_label = QLabel("")
+        self.trace_summary_label.setWordWrap(True)
+        self.main_layout.addWidget(self.trace_summary_label)
+
         if substance_painter.project.is_open():
-            self.fill_texture_table()
+            self.is_table_fill_pending = True #Filled when the widget is first shown
             settings = QtCore.QSettings()
             settings.setValue("dialog_window_checkbox_state", QtCore.Qt.CheckState.Unchecked)  
 
     def connect_widget_events(self):
         #Buttons
         self.refresh_button.clicked.connect(self.on_refresh_requested)
+        self.undo_res_fix_button.clicked.connect(self.on_undo_res_fix_requested)
+        self.rename_button.clicked.connect(self.on_rename_requested)
         self.export_button.clicked.connect(self.on_export_requested)
+        self.estimate_button.clicked.connect(self.on_estimate_requested)
+        self.cancel_export_button.clicked.connect(self.on_cancel_export_requested)
+        #Trace checkbox
+        self.trace_checkbox.stateChanged.connect(self.on_trace_toggled)
         #Personal Export checkbox
-        self.personal_checkbox.stateChanged.connect(self.on_refresh_requested)
+        self.personal_checkbox.stateChanged.connect(self.on_personal_export_changed)
         #Asset type combo box
-        self.asset_combobox.currentIndexChanged.connect(self.on_refresh_requested)
+        self.asset_combobox.currentIndexChanged.connect(self.on_asset_type_changed)
+        #Table rows
+        self.texture_table_model.shaderChanged.connect(self.on_shader_changed)
         #Hot key trigger for help
         self.help_action.triggered.connect(self.show_help)
 
@@ -139,21 +287,56 @@ class CustomExporter:
             substance_painter.event.ProjectAboutToClose : self.on_project_about_to_close,
         }
 
+        #Stack edits are used to know which texture sets changed since their last export. The event only exists in recent versions of Substance Painter
+        if hasattr(substance_painter.event, "LayerStacksModelDataChanged"):
+            substance_painter_connections[substance_painter.event.LayerStacksModelDataChanged] = self.on_layer_stacks_changed
+
+        #Texture changes, e.g. a new resolution, invalidate the snapshot of their texture set
+        if hasattr(substance_painter.event, "TextureStateEvent"):
+            substance_painter_connections[substance_painter.event.TextureStateEvent] = self.on_texture_state_changed
+
         #Use a for loop to iterate through each event and corresponding callback that we need from the dictionary
         for event, callback in substance_painter_connections.items():
             substance_painter.event.DISPATCHER.connect(event, callback)
     
         
     def show_ui_widget(self):
-        plugin = substance_painter_plugins.plugins.get("Custom Exporter", None) #If the custom exporter already exists upon launch, we want to delete it and then initialize again to avoid duplication
-        if plugin is not None:
-            #Refresh the widget
-            self.delete_widget()
-            self.init_widget_window()
-           
-        # Add the widget to the Painter UI
-        substance_painter.ui.add_dock_widget(self.widget)
+        #The widget is built once and added to the Painter UI once, showing it again reuses it instead of rebuilding it
+        if self.dock_widget is None:
+            self.dock_widget = substance_painter.ui.add_dock_widget(self.widget)
         self.widget.show()
+
+    def get_icon(self, file_name):
+        if file_name not in self.icons:
+            self.icons[file_name] = QtGui.QIcon(os.path.join(self.icons_path, file_name))
+        return self.icons[file_name]
+
+    #Called by the table model the first time a validation icon is drawn
+    def load_validation_icons(self):
+        return self.get_icon("validation_ok.png"), self.get_icon("validation_fail.png")
+
+    #Function that's triggered every time the widget is shown, e.g. when its dock tab is selected
+    def on_widget_shown(self, event):
+        QWidget.showEvent(self.widget, event)
+        if not self.is_first_show_done:
+            self.is_first_show_done = True
+            self.widget.setWindowIcon(self.get_icon("main_window_icon.png"))
+            self.help_label.setPixmap(QtGui.QPixmap(os.path.join(self.icons_path, "help.png")).scaled(32, 32))
+        if self.is_table_fill_pending:
+            QtCore.QTimer.singleShot(0, self.fill_pending_texture_table) #Filled after the widget is drawn, so showing it is never delayed
+
+    def fill_pending_texture_table(self):
+        if self.is_table_fill_pending and substance_painter.project.is_open():
+            self.is_table_fill_pending = False
+            self.fill_texture_table()
+
+    #The table of a hidden widget is filled when the widget is shown
+    def request_texture_table_fill(self):
+        if self.widget.isVisible():
+            self.is_table_fill_pending = False
+            self.fill_texture_table()
+        else:
+            self.is_table_fill_pending = True
     
     def show_help(self, event):
         help_doc_path = os.path.join(self.file_dir, "Custom_Exporter_Help.pdf")
@@ -167,74 +350,139 @@ class CustomExporter:
             substance_painter.ui.delete_ui_element(self.widget)
 
     def init_rows_and_cols_table(self):
-        labelHeaders=["Export", "Texture Set Name", "Shader Type", "Resolution", "Export Path", "Validation"]
-        num_columns = len(labelHeaders)
-        num_rows = 0
-
-        self.table_widget.setRowCount(num_rows)
-        self.table_widget.setColumnCount(num_columns) #Make scalable, so use a varaible for number of textures instead
-
-        self.table_widget.setHorizontalHeaderLabels(labelHeaders)
+        self.all_texture_sets = None
+        self.texture_table_model.reset_rows([], []) #No rows until a project is open
 
-        self.table_widget.verticalHeader().setVisible(False) #Hides the visible numbers of vertical headers
-
-        self.table_widget.setColumnWidth(0,40)
-        self.table_widget.setColumnWidth(3,70)
-        self.table_widget.setColumnWidth(4,370)
-        self.table_widget.setColumnWidth(5,60)
+        self.table_view.setColumnWidth(module_texture_table.COLUMN_EXPORT,40)
+        self.table_view.setColumnWidth(module_texture_table.COLUMN_RESOLUTION,70)
+        self.table_view.setColumnWidth(module_texture_table.COLUMN_MEMORY,80)
+        self.table_view.setColumnWidth(module_texture_table.COLUMN_EXPORT_PATH,370)
+        self.table_view.setColumnWidth(module_texture_table.COLUMN_VALIDATION,60)
+        self.table_view.setColumnWidth(module_texture_table.COLUMN_ESTIMATE,110)
+        self.table_view.setColumnWidth(module_texture_table.COLUMN_EXPORT_STATUS,110)
     
-    def validate_texture_sets(self): #Visual representation of the validation with icons
+    def validate_texture_sets(self, rows): #Visual representation of the validation with icons, stored in the table model
         asset_type = self.asset_combobox.currentText()
-        self.textsets_with_overbudget_res = []
-        for i, texture_set in enumerate(self.all_texture_sets):
-            res_is_valid, res_validation_details = module_validation_resolution.validate_res(asset_type, texture_set.get_resolution())
-            validation_item = QTableWidgetItem() #Changes the icon based on the name validation - the icon automatically scales to the size of the cell
-            export_checkbox = self.table_widget.cellWidget(i,0)
-            if res_is_valid:
-                name_is_valid, name_validation_details = module_validation_name.validate_name(asset_type, texture_set.name())
-                if name_is_valid:
-                    validation_item.setIcon(self.icon_validation_ok)
-                    validation_item.setToolTip(f"Texture set validations are OK for texture set {i+1} \
-                                                \n{texture_set.name()} \
-                                                \nGood job!")
-                    export_checkbox.setToolTip(f"Specify if Texture Set {i+1}: {texture_set.name()} \
-                                               should be processed during the export or skipped.")
+        store = self.texture_table_store
+        snapshot = self.texture_set_snapshot
+        rows_to_validate = [i for i in rows if snapshot.get_validation(i, asset_type) is None] #Unchanged texture sets keep their validation result
+        with module_trace.span("validate_names", texture_sets=len(rows_to_validate)):
+            name_validation_results = module_validation_name.validate_names(asset_type, [store.names[i] for i in rows_to_validate]) #All names are validated in one batch
+        for i, name_validation_result in zip(rows_to_validate, name_validation_results):
+            record = snapshot.get_record(i)
+            with module_trace.span("validate_res", texture_set=record.name):
+                if len(record.tile_resolutions) > 0: #Every UV tile has to be within the budget
+                    res_is_valid, res_validation_details = module_validation_resolution.validate_tile_res(asset_type, record.tile_resolutions)
                 else:
-                    validation_item.setIcon(self.icon_validation_fail)
-                    validation_item.setToolTip(f"Texture set Name validation is FAILED for texture set {i+1} \
-                                                \n{texture_set.name()} \
-                                                \nReason: {name_validation_details} \
-                                                \nExport of this texture set is forcibly disabled until validation is OK.")
-                    export_checkbox.setToolTip(f"Texture set Name validation is FAILED for texture set {i+1} \
-                                                \n{texture_set.name()} \
-                                                \nReason: {name_validation_details} \
-                                                \nExport of this texture set is forcibly disabled until validation is OK.")
+                    res_is_valid, res_validation_details = module_validation_resolution.validate_res(asset_type, record)
+            if not res_is_valid:
+                snapshot.set_validation(i, asset_type, module_texture_table.VALIDATION_RES_FAILED, res_validation_details)
+            elif not name_validation_result.is_valid:
+                snapshot.set_validation(i, asset_type, module_texture_table.VALIDATION_NAME_FAILED, name_validation_result.details)
             else:
-                validation_item.setIcon(self.icon_validation_fail)
-                validation_item.setToolTip(f"Texture set Resolution validation is FAILED for texture set {i+1} \
-                                            \n{texture_set.name()} \
-                                            \nReason: {res_validation_details} \
-                                            \nExport of this texture set is forcibly disabled until validation is OK.")
-                export_checkbox.setToolTip(f"Texture set Resolution validation is FAILED for texture set {i+1} \
-                                            \n{texture_set.name()} \
-                                            \nReason: {res_validation_details} \
-                                            \nExport of this texture set is forcibly disabled until validation is OK.")
-                self.textsets_with_overbudget_res.append(texture_set)
-            
-            export_checkbox.setChecked(res_is_valid and name_is_valid) #Python is smart enough to know that if the first one is false, it won't even bother checking the second one
-            export_checkbox.setEnabled(res_is_valid and name_is_valid)
-            self.table_widget.setItem(i,5,validation_item)
-
-        if len(self.textsets_with_overbudget_res) > 0:
+                snapshot.set_validation(i, asset_type, module_texture_table.VALIDATION_OK, "") #Export checkbox is checked and enabled only when both validations pass
+        self.suggest_names(asset_type, [i for i, name_validation_result in zip(rows_to_validate, name_validation_results) if not name_validation_result.is_valid], rows_to_validate)
+
+        #The GPU memory is validated for all rows at once, the asset budget depends on every texture set
+        previous_memory_validation = store.memory_validation
+        store.memory_validation = self.validate_texture_memory(asset_type)
+
+        has_new_overbudget_res = False
+        for i in rows:
+            validation_state, validation_details = self.get_row_validation(i, asset_type)
+            store.set_validation(i, validation_state, validation_details)
+            has_new_overbudget_res |= validation_state == module_texture_table.VALIDATION_RES_FAILED
+
+        #Rows that were not revalidated are only updated when their GPU memory result changed, e.g. when the asset went over budget
+        validated_rows = set(rows)
+        for i in self.get_memory_changed_rows(previous_memory_validation, store.memory_validation):
+            if i in validated_rows or snapshot.get_validation(i, asset_type) is None:
+                continue
+            store.set_validation(i, *self.get_row_validation(i, asset_type))
+            self.texture_table_model.notify_rows_changed(i, i, module_texture_table.COLUMN_EXPORT, module_texture_table.COLUMN_VALIDATION)
+
+        #The autofix applies to every over budget texture set, not only the revalidated ones
+        self.rows_with_overbudget_res = store.rows_with_validation_state(module_texture_table.VALIDATION_RES_FAILED)
+        if has_new_overbudget_res and not self.is_res_dialog_suppressed:
             self.open_dialog_res_confirmation()
 
+    #Nearest valid name of every failing name in one batch, the suggestions never collide with a texture set name or with another suggestion
+    def suggest_names(self, asset_type, failing_rows, validated_rows):
+        store = self.texture_table_store
+        for i in validated_rows:
+            store.name_suggestions[i] = ""
+        if len(failing_rows) > 0:
+            with module_trace.span("suggest_names", texture_sets=len(failing_rows)):
+                taken_names = set(store.names)
+                taken_names.update(name_suggestion for name_suggestion in store.name_suggestions if name_suggestion)
+                for i in failing_rows:
+                    name_suggestion = module_name_autofix.suggest_name(asset_type, store.names[i], taken_names)
+                    if name_suggestion is not None:
+                        store.name_suggestions[i] = name_suggestion
+                        taken_names.add(name_suggestion)
+        self.rename_button.setEnabled(module_name_autofix.is_rename_supported() and any(store.name_suggestions))
+
+    #Function that's triggered when the "Rename to Suggested Names" button is clicked, all failing names with a suggestion are renamed as one batch
+    def on_rename_requested(self):
+        if not substance_painter.project.is_open() or self.all_texture_sets is None:
+            return
+        store = self.texture_table_store
+        name_changes = module_name_autofix.plan_name_changes(self.asset_combobox.currentText(), store.names) #Planned again, with the current names of the project
+        if len(name_changes) == 0:
+            return
+        try:
+            module_name_autofix.apply_name_changes(name_changes)
+        except Exception as error: #The batch was rolled back, the project is unchanged
+            substance_painter.logging.log(substance_painter.logging.ERROR, "Custom Exporter", f"The texture sets could not be renamed, nothing was renamed: {error}")
+            return
+        change_lines = "\n".join(module_name_autofix.format_name_change(name_change) for name_change in name_changes)
+        substance_painter.logging.log(substance_painter.logging.INFO, "Custom Exporter", f"Renamed {len(name_changes)} texture sets:\n{change_lines}")
+
+        #Only the renamed rows are read again and revalidated
+        for name_change in name_changes:
+            row = store.row_by_name.get(name_change.texture_set_name)
+            if row is not None:
+                self.texture_set_snapshot.invalidate_row(row)
+                store.mark_dirty(row)
+        self.refresh_scheduler.request_refresh(rows=True)
+
+    #Validation result of a row, from its name and resolution validation and the GPU memory validation
+    def get_row_validation(self, row, asset_type):
+        validation_state, validation_details = self.texture_set_snapshot.get_validation(row, asset_type)
+        memory_validation = self.texture_table_store.memory_validation
+        if validation_state == module_texture_table.VALIDATION_OK and memory_validation is not None and not memory_validation.is_valid[row]:
+            return module_texture_table.VALIDATION_MEMORY_FAILED, "" #The details are built by the tooltip, with the current totals
+        return validation_state, validation_details
+
+    #GPU memory footprint of every texture set, checked against the budgets of the asset type. None when NumPy is missing
+    def validate_texture_memory(self, asset_type):
+        if not module_validation_memory.is_available():
+            if not self.is_memory_warning_logged:
+                substance_painter.logging.log(substance_painter.logging.WARNING, "Custom Exporter", "NumPy is not installed, the GPU memory budget is not validated.")
+                self.is_memory_warning_logged = True
+            return None
+        store = self.texture_table_store
+        with module_trace.span("validate_memory", texture_sets=len(store)):
+            footprints = module_validation_memory.compute_footprints(store.widths, store.heights, store.shader_indices, 
+                                                                     self.texture_table_model.shader_types, store.tile_resolutions)
+            return module_validation_memory.validate_memory(asset_type, footprints)
+
+    def get_memory_changed_rows(self, previous_memory_validation, memory_validation):
+        if memory_validation is None:
+            return []
+        if previous_memory_validation is None or len(previous_memory_validation.is_valid) != len(memory_validation.is_valid):
+            return range(len(memory_validation.is_valid))
+        return (previous_memory_validation.is_valid != memory_validation.is_valid).nonzero()[0].tolist()
+
     def open_dialog_res_confirmation(self):   
         settings = QtCore.QSettings()
         if settings.value("dialog_window_checkbox_state", QtCore.Qt.CheckState.Unchecked) == QtCore.Qt.CheckState.Unchecked:
-            dialog = DialogWindow(self.icon_main_window)
+            resolution_changes = self.plan_required_res() #Dry run, listed in the dialog before anything is changed
+            if len(resolution_changes) == 0:
+                return
+            dialog = DialogWindow(self.get_icon("main_window_icon.png"), resolution_changes)
             if dialog.exec_() == QDialog.DialogCode.Accepted:
-                self.apply_required_res()
-                self.on_refresh_requested()
+                self.apply_required_res(resolution_changes)
                 
             else:
                 substance_painter.logging.log(severity=substance_painter.logging.WARNING, 
@@ -244,103 +492,150 @@ class CustomExporter:
             substance_painter.logging.log(severity=substance_painter.logging.INFO, 
                                           channel="Custom Exporter", 
                                           message="Dialog for Resolution Validation autofix was not triggered as per user settings.")
-    
-    def apply_required_res(self):
-        required_width, required_height = module_validation_resolution.get_required_res_from_asset_type(self.asset_combobox.currentText())
-        required_res = substance_painter.textureset.Resolution(required_width, required_height)
-        for texture_set in self.textsets_with_overbudget_res:
-            original_res = texture_set.get_resolution()
-            texture_set.set_resolution(required_res)
-            substance_painter.logging.log(severity=substance_painter.logging.INFO,
+
+    #Plans the resolution of every over budget texture set from the table, without changing anything
+    def plan_required_res(self):
+        store = self.texture_table_store
+        texture_set_resolutions = {}
+        for i in self.rows_with_overbudget_res:
+            texture_set_resolutions[store.names[i]] = ((store.widths[i], store.heights[i]), store.tile_resolutions[i])
+        budget = module_validation_resolution.get_required_res_from_asset_type(self.asset_combobox.currentText())
+        return module_resolution_autofix.plan_resolution_changes(texture_set_resolutions, budget)
+
+    #All changes are applied as one batch, followed by one revalidation of the changed rows
+    def apply_required_res(self, resolution_changes):
+        if not self.apply_resolution_changes(resolution_changes, "Applied required resolution"):
+            return
+        self.applied_resolution_changes = resolution_changes
+        self.undo_res_fix_button.setEnabled(True)
+
+    #Function that's triggered when the "Undo Resolution Fix" button is clicked
+    def on_undo_res_fix_requested(self):
+        if not substance_painter.project.is_open() or len(self.applied_resolution_changes) == 0:
+            return
+        undo_changes = module_resolution_autofix.invert_resolution_changes(self.applied_resolution_changes)
+        if self.apply_resolution_changes(undo_changes, "Restored resolution"):
+            self.applied_resolution_changes = []
+            self.undo_res_fix_button.setEnabled(False)
+
+    def apply_resolution_changes(self, resolution_changes, log_prefix):
+        try:
+            module_resolution_autofix.apply_resolution_changes(resolution_changes)
+        except Exception as error: #The batch was rolled back, the project is unchanged
+            substance_painter.logging.log(severity=substance_painter.logging.ERROR,
                                           channel="Custom Exporter",
-                                          message=f"Applied required resolution for texture set {texture_set.name()} \
-                                                    \nWas: {original_res}; Now: {required_res}")
-
-    def fill_texture_table(self):
-        self.all_texture_sets = substance_painter.textureset.all_texture_sets() #We assign this value to SELF so it's not only local and other parts of the class can also use it
-        self.table_widget.setRowCount(len(self.all_texture_sets)) #Automatically sets the number of rows to be equal to the number of texture sets used in the project
-
-        #Texture names and resolutions are added with for loop, for scalability  
-        for i, texture_set in enumerate(self.all_texture_sets):
-            #Personal Export checkbox is added to the "Export" column
-            check_box = QCheckBox()
-            check_box.setChecked(True)
-            check_box.stateChanged.connect(self.gray_out_unchecked_rows)
-            self.table_widget.setCellWidget(i,0,check_box) #assigns checkboxes to each row in the first column, with a default state of CHECKED
-
-            #Names of textures column
-            self.table_widget.setItem(i,1,QTableWidgetItem(texture_set.name()))
-
-            #Shader type combobox is added to the "Shader Type" column
-            combo_box = QComboBox()
-            combo_box.addItems(self.shader_types)
-            combo_box.currentIndexChanged.connect(self.on_refresh_requested)
-            combo_box.setToolTip("Specify the type of export preset to be used during the export process")
-            self.table_widget.setCellWidget(i,2,combo_box)
-
-            #Texture resolutions column
-            resolution = texture_set.get_resolution()
-            width = resolution.width
-            height = resolution.height
-            self.table_widget.setItem(i,3,QTableWidgetItem(f"{width} x {height}"))
-        self.on_refresh_requested()
-
-    #The code that unchecks all adjacent rows to the checkbox, if it becomes unchecked. 
-    def gray_out_unchecked_rows(self):
-        for i in range(self.table_widget.rowCount()): #First, we are iterating over each row of the texture set table
-            check_box_item = self.table_widget.cellWidget(i, 0) #Then we are accessing the checkbox of the given row
-            if check_box_item.isChecked(): #we check if the given checkbox is checked
-                for j in range(1, self.table_widget.columnCount()-1): #If it IS checked, then we proceed from here. We iterate through everything again, but now starting from the 2nd row since we don't want to gray out the checkbox itself. -1 is to make sure we don't gray out the icon.
-                    item = self.table_widget.item(i, j) #We then access the item as a text
-                    if item is not None: #If it is not none, we proceed
-                        item.setFlags(item.flags() | QtCore.Qt.ItemIsEnabled) #We then set a flag to mark that this text is enabled
-                    else: #If it is NOT a text, we proceed from here
-                        cell_widget = self.table_widget.cellWidget(i, j) #We then access it as a widget, since that's the only other possibility
-                        if cell_widget is not None: #If it is not none, we proceed
-                            cell_widget.setEnabled(True) #We then set a flag to mark that this widget is enabled
-            else: #If the checkbox is NOT checked, then we proceed from here
-                for j in range(1, self.table_widget.columnCount()-1): #Exactly the same as the above, but instead of enabling we instead DISABLE to gray everything out
-                    item = self.table_widget.item(i, j)
-                    if item is not None:
-                        item.setFlags(item.flags() & ~QtCore.Qt.ItemIsEnabled)
-                    else:
-                        cell_widget = self.table_widget.cellWidget(i, j)
-                        if cell_widget is not None:
-                            cell_widget.setDisabled(True)
+                                          message=f"The resolution of the texture sets could not be changed, nothing was applied: {error}")
+            return False
+        change_lines = "\n".join(module_resolution_autofix.format_resolution_change(resolution_change) for resolution_change in resolution_changes)
+        substance_painter.logging.log(severity=substance_painter.logging.INFO,
+                                      channel="Custom Exporter",
+                                      message=f"{log_prefix} for {len(resolution_changes)} texture sets and UV tiles:\n{change_lines}")
+
+        #Only the changed rows are revalidated, and the autofix dialog is not opened again by this revalidation
+        store = self.texture_table_store
+        for texture_set_name in module_resolution_autofix.get_changed_texture_set_names(resolution_changes):
+            if texture_set_name in store.row_by_name:
+                self.texture_set_snapshot.invalidate_row(store.row_by_name[texture_set_name])
+                store.mark_dirty(store.row_by_name[texture_set_name])
+        self.is_res_dialog_suppressed = True
+        self.refresh_scheduler.request_refresh(rows=True) #Runs after the current refresh, never inside it
+        return True
+
+    #keep_content_revisions is True when the table is filled again for the same project, the stack edits counted so far still apply then
+    def fill_texture_table(self, keep_content_revisions=False):
+        module_trace.begin_run()
+        self.is_fill_trace_run = True
+        with module_trace.span("fill_texture_table"):
+            self.all_texture_sets = substance_painter.textureset.all_texture_sets() #We assign this value to SELF so it's not only local and other parts of the class can also use it
+            if not keep_content_revisions:
+                self.reset_content_revisions()
+
+            #Texture names and resolutions are read once into the snapshot, the model creates the cells only for the visible rows
+            self.texture_set_snapshot.reset(self.all_texture_sets)
+            records = [self.texture_set_snapshot.get_record(i) for i in range(len(self.all_texture_sets))]
+            self.texture_table_model.reset_rows([record.name for record in records], [(record.width, record.height) for record in records]) #Every row is checked by default, with the first shader type
+            for i, record in enumerate(records):
+                if len(record.tile_resolutions) > 0:
+                    self.texture_table_store.set_tile_resolutions(i, record.tile_resolutions)
+        self.refresh_scheduler.request_refresh(full=True)
     
-    #Function that's triggered when clicking the "Refresh" button
+    #Function that's triggered when clicking the "Refresh" button, every texture set is read again from Substance Painter and revalidated
+    #It is the way out when the snapshot missed a change that sent no event, e.g. a rename
     def on_refresh_requested(self):
-        if substance_painter.project.is_open():
-            export_path_root = self.build_root_export_path()
-            if self.all_texture_sets is not None:
-                for i, texture_set in enumerate(self.all_texture_sets):
+        if substance_painter.project.is_open() and self.all_texture_sets is not None:
+            self.all_texture_sets = substance_painter.textureset.all_texture_sets()
+            if not self.texture_set_snapshot.sync_names(self.all_texture_sets): #Texture sets were added or removed
+                self.fill_texture_table(keep_content_revisions=True) #Same project, the revisions are kept by texture set name
+                return
+            self.texture_set_snapshot.invalidate_all()
+        self.refresh_scheduler.request_refresh(full=True)
 
-                    #Names of textures column
-                    self.table_widget.setItem(i,1,QTableWidgetItem(texture_set.name()))
+    #Function that's triggered when the shader type of a row is changed, only the changed rows are refreshed
+    def on_shader_changed(self, row):
+        self.refresh_scheduler.request_refresh(rows=True)
 
-                    #Texture resolutions column
-                    resolution = texture_set.get_resolution()
-                    width = resolution.width
-                    height = resolution.height
-                    self.table_widget.setItem(i,3,QTableWidgetItem(f"{width} x {height}"))
+    #Function that's triggered when the asset type is changed, it affects the export paths and the validations, but not the texture set data
+    def on_asset_type_changed(self):
+        self.refresh_scheduler.request_refresh(asset_type=True)
 
-                    #Export path column - all the variables updates the path whenever you change them from the menu and they call the refresh function
-                    self.table_widget.setItem(i,4,QTableWidgetItem(f"{export_path_root}/{self.asset_combobox.currentText()}/{texture_set.name()}_{self.table_widget.cellWidget(i,2).currentText()}/"))
+    #Function that's triggered when the Personal Export checkbox is toggled, it only affects the export paths
+    def on_personal_export_changed(self):
+        self.refresh_scheduler.request_refresh(export_root=True)
 
-                self.validate_texture_sets()
-                self.gray_out_unchecked_rows()
+    #Function that's called by the refresh scheduler, once per event loop turn, with all the requests of that turn merged together
+    def perform_refresh(self, refresh_request):
+        if not substance_painter.project.is_open() or self.all_texture_sets is None:
+            return
+        if not self.is_fill_trace_run: #The refresh requested by the table fill is summarized together with the fill
+            module_trace.begin_run()
+        self.is_fill_trace_run = False
+        is_res_fix_revalidation = self.is_res_dialog_suppressed #A fix applied during this refresh is revalidated by the next one
+        with module_trace.span("refresh", full=refresh_request.full):
+            self.refresh_table(refresh_request)
+        if is_res_fix_revalidation:
+            self.is_res_dialog_suppressed = False
+        self.show_trace_summary()
 
-                self.set_column_read_only(1) #Name of textures column
-                self.set_column_read_only(3) #Resolution of textures column
-                self.set_column_read_only(4) #Export path column
-                self.set_column_read_only(5) #Validation column
-    
-    #Makes sure that the user can't edit the text, and it's set to read-only
-    def set_column_read_only(self, column_index):
-        for row in range(self.table_widget.rowCount()):
-            item = self.table_widget.item(row,column_index)
-            if item is not None:
-                item.setFlags(item.flags() & ~QtCore.Qt.ItemIsEditable)
+    def refresh_table(self, refresh_request):
+        self.texture_table_model.updated_cell_count = 0
+        hit_count, miss_count = self.texture_set_snapshot.hit_count, self.texture_set_snapshot.miss_count
+        store = self.texture_table_store
+        dirty_rows = store.take_dirty_rows()
+        if refresh_request.full:
+            self.refresh_rows(range(len(store)))
+        else:
+            if refresh_request.rows and len(dirty_rows) > 0:
+                self.refresh_rows(dirty_rows)
+            if refresh_request.asset_type:
+                self.texture_table_model.asset_type = self.asset_combobox.currentText()
+                self.validate_texture_sets(range(len(store)))
+                self.texture_table_model.notify_rows_changed(0, len(store) - 1, module_texture_table.COLUMN_EXPORT, module_texture_table.COLUMN_VALIDATION)
+            if refresh_request.export_root:
+                self.texture_table_model.export_root = self.build_root_export_path()
+                self.texture_table_model.notify_rows_changed(0, len(store) - 1, module_texture_table.COLUMN_EXPORT_PATH, module_texture_table.COLUMN_EXPORT_PATH)
+        self.refresh_stats_label.setText(f"Last refresh updated {self.texture_table_model.updated_cell_count} cells, {self.refresh_scheduler.collapsed_count} refresh requests merged, "
+                                         f"{self.texture_set_snapshot.hit_count - hit_count} texture sets read from the snapshot, {self.texture_set_snapshot.miss_count - miss_count} from Substance Painter")
+
+    #Updates the names and resolutions of the given rows from the snapshot, and revalidates only these rows
+    def refresh_rows(self, rows):
+        store = self.texture_table_store
+        for i in rows:
+            #Names and resolutions of textures columns, only the invalidated texture sets are read again from Substance Painter
+            record = self.texture_set_snapshot.get_record(i)
+            store.set_name(i, record.name)
+            store.set_resolution(i, record.width, record.height)
+            store.set_tile_resolutions(i, record.tile_resolutions)
+
+        #Export path column - it is built by the model from these values, whenever you change them from the menu
+        self.texture_table_model.export_root = self.build_root_export_path()
+        self.texture_table_model.asset_type = self.asset_combobox.currentText()
+
+        self.validate_texture_sets(rows)
+        if len(rows) == len(store):
+            self.texture_table_model.notify_all_changed() #Unchecked rows are grayed out and the columns are read-only through the model flags
+        else:
+            for i in rows:
+                self.texture_table_model.notify_rows_changed(i, i)
 
     #Builds the start of the texture export path as a string, based on the current state of the Personal Export checkbox
     def build_root_export_path(self):
@@ -352,47 +647,608 @@ class CustomExporter:
 
     #Function that's triggered when the "Export" button is clicked
     def on_export_requested(self):
-        if substance_painter.project.is_open():
-            if self.all_texture_sets != None: #Safety check, to make sure that the current project contains textures before we proceed
-                for i in range(len(self.all_texture_sets)):
-                    should_export = self.table_widget.cellWidget(i,0).isChecked() #Making that the checkbox is checked as well, before we can export
-                    if not should_export: #If it's not checked, then we exit this whole function
-                        continue
-
-                    textset_name = self.table_widget.item(i,1).text()
-                    #If it IS checked, we retrieve the text data from each of the rows to then use in our module_export function
-                    shader_type = self.table_widget.cellWidget(i,2).currentText()
-                    export_path = self.table_widget.item(i,4).text()
-                    module_export.exporting(textset_name, shader_type, export_path)
+        if self.is_export_running(): #Only one export can run at a time
+            return
+        export_jobs = self.collect_export_jobs()
+        if len(export_jobs) == 0: #No project open, or nothing checked or changed: the journal of an interrupted export is left for the next export
+            return
+        export_jobs = self.resume_interrupted_export(export_jobs)
+        export_jobs = self.stage_export_jobs(export_jobs)
+        self.pack_jobs = []
+        self.sources_dir = None
+        if self.single_source_checkbox.isChecked() and len(export_jobs) > 0: #The source maps are exported once, the shader maps are packed from them after each group
+            try:
+                self.sources_dir = module_texture_packing.create_sources_dir(self.staging_dir)
+            except OSError as error:
+                substance_painter.logging.log(substance_painter.logging.ERROR, "Custom Exporter", f"No folder could be created for the source maps, nothing was exported: {error}")
+                self.remove_staging_dir()
+                return
+            self.pack_jobs = export_jobs
+            export_jobs = module_texture_packing.build_source_export_jobs(export_jobs, self.sources_dir)
+        if len(export_jobs) > 0: #All checked texture sets are exported together, one export call per export preset
+            export_jobs = self.estimate_export_jobs(export_jobs) #The longest texture sets are exported first
+            self.start_export_queue(export_jobs)
+
+    #Function that's triggered when the "Estimate Export" button is clicked, a dry run of the export that only shows its estimates
+    def on_estimate_requested(self):
+        if self.is_export_running():
+            return
+        export_jobs = self.collect_export_jobs()
+        if self.single_source_checkbox.isChecked() and len(export_jobs) > 0: #Nothing is written, the sources folder is never created
+            export_jobs = module_texture_packing.build_source_export_jobs(export_jobs, os.path.join(self.build_root_export_path(), "sources"))
+        if len(export_jobs) > 0:
+            self.estimate_export_jobs(export_jobs)
+
+    #Returns the (texture_set_name, shader_type, export_path) jobs of the checked texture sets, without the unchanged ones
+    def collect_export_jobs(self):
+        if not substance_painter.project.is_open() or self.all_texture_sets == None: #Safety check, to make sure that the current project contains textures before we proceed
+            return []
+        store = self.texture_table_store
+        stale_rows = self.texture_set_snapshot.stale_rows()
+        if len(stale_rows) > 0: #Texture sets changed since the last refresh are revalidated before they are exported
+            self.refresh_rows(stale_rows)
+        store.estimates = [""] * len(store) #Clears the estimates and the status of the previous export
+        store.estimate_details = [""] * len(store)
+        store.export_statuses = [""] * len(store)
+        store.export_status_details = [""] * len(store)
+        self.texture_table_model.notify_rows_changed(0, len(store) - 1, module_texture_table.COLUMN_ESTIMATE, module_texture_table.COLUMN_EXPORT_STATUS)
+
+        export_jobs = []
+        no_preset_names = []
+        for i in range(len(store)):
+            should_export = store.export_checked[i] #Making that the checkbox is checked as well, before we can export
+            if not should_export: #If it's not checked, then we skip this texture set
+                continue
+
+            #Shader types without an export preset can only be packed from the source maps, the texture set is flagged instead of silently left out
+            shader_type = self.texture_table_model.shader_type(i)
+            if not self.single_source_checkbox.isChecked() and not module_export.has_export_preset(shader_type):
+                store.export_status_details[i] = f"There is no export preset for the shader type {shader_type}. Check Single Source Export to pack it from the source maps instead."
+                self.set_export_status(i, "Skipped: no preset")
+                no_preset_names.append(store.names[i])
+                continue
+
+            #If it IS checked, we retrieve the data of the row from the model to then use in our module_export function
+            export_jobs.append((store.names[i], shader_type, self.texture_table_model.export_path(i)))
+
+        if len(no_preset_names) > 0:
+            substance_painter.logging.log(substance_painter.logging.WARNING, "Custom Exporter", 
+                                          f"Skipped {len(no_preset_names)} texture sets whose shader type has no export preset: {', '.join(no_preset_names)}. Check Single Source Export to pack them from the source maps instead.")
+        return self.skip_unchanged_texture_sets(export_jobs)
+
+    #Estimates the duration and disk size of every job with the cost model, shows them in the table, and returns the jobs longest first
+    def estimate_export_jobs(self, export_jobs):
+        import module_export_estimate #Imported on first use
+        self.cost_model = module_export_estimate.ExportCostModel(self.build_root_export_path())
+        with module_trace.span("estimate_export", texture_sets=len(export_jobs)):
+            self.export_estimates = module_export_estimate.estimate_export_jobs(export_jobs, self.cost_model, self.export_tile_filters)
+        self.measured_export_cost = (0.0, 0.0)
+
+        store = self.texture_table_store
+        for textset_name, estimate in self.export_estimates.items():
+            row = store.row_by_name.get(textset_name)
+            if row is not None:
+                store.estimates[row] = module_export_estimate.format_estimate(estimate)
+                store.estimate_details[row] = self.cost_model.describe(estimate)
+        self.texture_table_model.notify_rows_changed(0, len(store) - 1, module_texture_table.COLUMN_ESTIMATE, module_texture_table.COLUMN_ESTIMATE)
+
+        duration, size_bytes = module_export_estimate.sum_estimates(self.export_estimates.values())
+        estimate_message = f"Estimated {module_export_estimate.format_duration(duration)} and {module_export_estimate.format_size(size_bytes)} for {len(self.export_estimates)} texture sets."
+        substance_painter.logging.log(substance_painter.logging.INFO, "Custom Exporter", estimate_message)
+        self.export_progress_label.setText(f"{self.skipped_export_message} {estimate_message}".strip())
+        return module_export_estimate.sort_longest_first(export_jobs, self.export_estimates)
+
+    #Refines the cost model with the measured duration and disk size of an exported group
+    def record_export_cost(self, texture_set_names, export_result, elapsed_time):
+        import module_export_estimate #Imported on first use
+        estimates = [self.export_estimates[textset_name] for textset_name in texture_set_names if textset_name in self.export_estimates]
+        if self.cost_model is None or len(estimates) == 0:
+            return
+        exported_files = [file_path for file_paths in export_result.textures.values() for file_path in file_paths]
+        self.cost_model.observe(estimates[0].export_preset_name, sum(estimate.megapixels for estimate in estimates), elapsed_time,
+                                module_export_estimate.get_files_size(exported_files))
+        measured_duration, estimated_duration = self.measured_export_cost
+        self.measured_export_cost = (measured_duration + elapsed_time, estimated_duration + sum(estimate.duration for estimate in estimates))
+
+    #Content revision of a texture set, used in the export fingerprint. None means that it is unknown, and the texture set is always exported
+    def get_content_revision(self, texture_set_name):
+        if self.project_revision_token is None:
+            return None
+        return f"{self.project_revision_token}:{self.content_revisions.get(texture_set_name, 0)}"
+
+    def reset_content_revisions(self):
+        self.content_revisions = {}
+        self.project_revision_token = None
+        if not hasattr(substance_painter.event, "LayerStacksModelDataChanged"): #Without stack edit events, changes can't be tracked
+            return
+        project_file_path = substance_painter.project.file_path()
+        if project_file_path is not None and os.path.exists(project_file_path): #Unsaved projects have no saved state to compare with
+            self.project_revision_token = f"{project_file_path}:{os.path.getmtime(project_file_path)}"
+
+    #Function that's triggered when the layer stack of the active texture set is edited
+    def on_layer_stacks_changed(self, e):
+        active_stack = substance_painter.textureset.get_active_stack()
+        if active_stack is not None:
+            texture_set_name = active_stack.material().name()
+            self.content_revisions[texture_set_name] = self.content_revisions.get(texture_set_name, 0) + 1
+            if hasattr(active_stack, "stack_id"): #A renamed texture set is revalidated, its new name may not follow the naming conventions
+                self.revalidate_live(self.texture_set_snapshot.invalidate_renamed(active_stack.stack_id, texture_set_name))
+
+    #Function that's triggered when a texture of a stack is created, updated or deleted, e.g. by a paint stroke or a new resolution
+    #Paint strokes send no stack edit, so the texture set owning the stack gets a new content revision here too
+    def on_texture_state_changed(self, e):
+        if hasattr(e, "stack_id"):
+            row = self.texture_set_snapshot.invalidate_stack(e.stack_id)
+            if row is not None and row < len(self.texture_table_store):
+                texture_set_name = self.texture_table_store.names[row]
+                self.content_revisions[texture_set_name] = self.content_revisions.get(texture_set_name, 0) + 1
+            self.revalidate_live(row)
+
+    #Rows invalidated by Substance Painter events are revalidated in the background, without a manual refresh
+    def revalidate_live(self, row):
+        if row is not None:
+            self.live_revalidation.add_row(row)
+
+    #Called by the live revalidation throttle, with all the rows changed since its last call
+    def revalidate_changed_rows(self, rows):
+        if not substance_painter.project.is_open() or self.all_texture_sets is None:
+            return
+        store = self.texture_table_store
+        for i in rows:
+            if i < len(store):
+                store.mark_dirty(i)
+        self.is_res_dialog_suppressed = True #A background revalidation only updates the validation icons, it doesn't open the autofix dialog
+        self.refresh_scheduler.request_refresh(rows=True)
+
+    def is_export_running(self):
+        return self.export_queue is not None and self.export_queue.is_running
+
+    #The fingerprint of a UV tile is built with the resolution of the tile
+    def get_export_fingerprint(self, texture_set_name, shader_type, export_path, resolution=None):
+        import module_export_cache #Imported on first use
+        if resolution is None:
+            record = self.texture_set_snapshot.get_record(self.texture_table_store.row_by_name[texture_set_name])
+            resolution = (record.width, record.height)
+        if self.single_source_checkbox.isChecked(): #Packed maps change with their packing layout
+            shader_packing = module_texture_packing.shader_packings().get(shader_type)
+            export_preset_name = f"{module_export.get_export_preset_from_shader_type(module_export.SOURCE_SHADER_TYPE)}:{shader_packing.layout if shader_packing is not None else shader_type}"
+        else:
+            export_preset_name = module_export.get_export_preset_from_shader_type(shader_type)
+        return module_export_cache.build_fingerprint(export_preset_name, 
+                                                     list(resolution), 
+                                                     module_export.PADDING_ALGORITHM, 
+                                                     export_path,
+                                                     self.get_content_revision(texture_set_name))
+
+    #Removes the texture sets whose fingerprint and exported files have not changed since their last export, unless Force Export is checked
+    #Texture sets with UV tiles are checked per tile, and only their changed tiles are exported
+    def skip_unchanged_texture_sets(self, export_jobs):
+        import module_export_cache #Imported on first use
+        self.export_cache = module_export_cache.ExportCache(self.build_root_export_path())
+        self.export_tile_filters = {}
+        self.export_fingerprints = {} #Cache key -> fingerprint, the cache key of a UV tile is its tile key
+        for textset_name, shader_type, export_path in export_jobs:
+            tile_resolutions = self.get_tile_resolutions(textset_name)
+            if tile_resolutions is None:
+                self.export_fingerprints[textset_name] = self.get_export_fingerprint(textset_name, shader_type, export_path)
+                continue
+            for (u, v), tile_resolution in tile_resolutions.items():
+                tile_key = module_export_cache.get_tile_key(textset_name, module_uv_tiles.get_udim(u, v))
+                self.export_fingerprints[tile_key] = self.get_export_fingerprint(textset_name, shader_type, export_path, tile_resolution)
+
+        project_name = substance_painter.project.name()
+        evicted_count = self.export_cache.evict_deleted(project_name, self.texture_table_store.names)
+        if evicted_count > 0:
+            self.save_export_cache()
+
+        self.skipped_export_message = ""
+        if self.force_export_checkbox.isChecked():
+            return export_jobs
+
+        jobs_to_export = []
+        skipped_names = set()
+        skipped_keys = [] #Cache keys of the skipped texture sets and tiles
+        skipped_tile_count = 0 #Unchanged tiles of the texture sets that are exported
+        for export_job in export_jobs:
+            textset_name = export_job[0]
+            tile_resolutions = self.get_tile_resolutions(textset_name)
+            if tile_resolutions is None:
+                if self.export_cache.is_up_to_date(textset_name, self.export_fingerprints[textset_name]):
+                    skipped_names.add(textset_name)
+                    skipped_keys.append(textset_name)
+                else:
+                    jobs_to_export.append(export_job)
+                continue
+
+            changed_tiles = []
+            for u, v in tile_resolutions:
+                tile_key = module_export_cache.get_tile_key(textset_name, module_uv_tiles.get_udim(u, v))
+                if self.export_cache.is_up_to_date(tile_key, self.export_fingerprints[tile_key]):
+                    skipped_keys.append(tile_key)
+                else:
+                    changed_tiles.append((u, v))
+            if len(changed_tiles) == 0:
+                skipped_names.add(textset_name)
+            else:
+                jobs_to_export.append(export_job)
+                if len(changed_tiles) < len(tile_resolutions):
+                    self.export_tile_filters[textset_name] = changed_tiles
+                    skipped_tile_count += len(tile_resolutions) - len(changed_tiles)
+
+        if len(skipped_keys) > 0:
+            saved_time = sum(self.export_cache.get_duration(cache_key) for cache_key in skipped_keys)
+            self.skipped_export_message = f"Skipped {len(skipped_names)} unchanged texture sets"
+            if skipped_tile_count > 0:
+                self.skipped_export_message += f" and {skipped_tile_count} unchanged UV tiles"
+            self.skipped_export_message += f", saving about {saved_time:.1f} s. Check Force Export to export them anyway."
+            substance_painter.logging.log(substance_painter.logging.INFO, "Custom Exporter", self.skipped_export_message)
+            self.export_progress_label.setText(self.skipped_export_message)
+            for textset_name in skipped_names:
+                self.set_export_status(self.texture_table_store.row_by_name[textset_name], "Up to date")
+        return jobs_to_export
+
+    def get_tile_resolutions(self, texture_set_name):
+        return self.texture_table_store.tile_resolutions[self.texture_table_store.row_by_name[texture_set_name]]
+
+    #Offers to resume the last export of the project if it was interrupted, and returns the jobs without the texture sets it already exported
+    #The partial outputs of the interrupted export are removed either way
+    def resume_interrupted_export(self, export_jobs):
+        import module_export_journal #Imported on first use
+        self.resumed_files = {}
+        journal = module_export_journal.ExportJournal(self.build_root_export_path(), substance_painter.project.name())
+        interrupted_batch = journal.read_interrupted_batch()
+        if interrupted_batch is None:
+            return export_jobs
+        removed_count = module_export_journal.clean_partial_outputs(interrupted_batch)
+        if removed_count > 0:
+            substance_painter.logging.log(substance_painter.logging.INFO, "Custom Exporter", f"Removed {removed_count} partial files of the interrupted export.")
+
+        completed_files = interrupted_batch.get_completed_files()
+        completed_jobs = [export_job for export_job in export_jobs if export_job[0] in completed_files]
+        if len(completed_jobs) > 0 and self.ask_resume_export(interrupted_batch, len(completed_jobs)):
+            self.resumed_files = {textset_name: completed_files[textset_name] for textset_name, _, _ in completed_jobs}
+            export_jobs = [export_job for export_job in export_jobs if export_job[0] not in self.resumed_files]
+            resume_message = f"Resumed the interrupted export, skipping {len(self.resumed_files)} texture sets it already exported."
+            substance_painter.logging.log(substance_painter.logging.INFO, "Custom Exporter", resume_message)
+            self.skipped_export_message = f"{self.skipped_export_message} {resume_message}".strip()
+            self.export_progress_label.setText(self.skipped_export_message)
+            for textset_name in self.resumed_files:
+                self.set_export_status(self.texture_table_store.row_by_name[textset_name], "Exported before interruption")
+        if len(export_jobs) == 0: #Nothing left to export, the interrupted export is done
+            journal.clear()
+        return export_jobs
+
+    def ask_resume_export(self, interrupted_batch, completed_count):
+        answer = QtWidgets.QMessageBox.question(self.widget, "Resume Interrupted Export", 
+                                                f"The last export of this project was interrupted after {len(interrupted_batch.committed_files)} of {len(interrupted_batch.texture_set_names)} texture sets. \n"
+                                                f"Resume it, and skip the {completed_count} checked texture sets it already exported? \nNo exports all checked texture sets again.")
+        return answer == QtWidgets.QMessageBox.StandardButton.Yes
+
+    #With local staging, the jobs export to the same paths under a new staging folder, published to the export root when the export is done
+    def stage_export_jobs(self, export_jobs):
+        self.staging_dir = None
+        if not self.local_staging_checkbox.isChecked() or len(export_jobs) == 0:
+            return export_jobs
+        import module_export_publish #Imported on first use
+        export_root = self.build_root_export_path()
+        try:
+            self.staging_dir = module_export_publish.create_staging_dir()
+        except OSError as error:
+            substance_painter.logging.log(substance_painter.logging.WARNING, "Custom Exporter", f"No staging folder could be created, exporting to the export root directly: {error}")
+            return export_jobs
+        return [(textset_name, shader_type, module_export_publish.get_staged_path(export_path, export_root, self.staging_dir)) 
+                for textset_name, shader_type, export_path in export_jobs]
+
+    #Exports the jobs one group per event loop turn, so the editor doesn't freeze during the export
+    def start_export_queue(self, export_jobs):
+        import module_export_journal #Imported on first use
+        import module_export_queue #Imported on first use
+        #Packed and staged files are not final when they are exported, they are committed once they are packed or published
+        self.export_journal = module_export_journal.ExportJournal(self.build_root_export_path(), substance_painter.project.name(), 
+                                                                  commit_on_export=self.staging_dir is None and len(self.pack_jobs) == 0)
+        try:
+            self.export_journal.begin(list(dict.fromkeys(textset_name for textset_name, _, _ in export_jobs)), self.staging_dir, self.resumed_files)
+        except OSError as error:
+            substance_painter.logging.log(substance_painter.logging.WARNING, "Custom Exporter", f"The export journal could not be written, this export can't be resumed if it is interrupted: {error}")
+            self.export_journal = None
+        self.export_queue = module_export_queue.ExportQueue(export_jobs, 
+                                                            on_progress=self.on_export_progress, 
+                                                            on_group_exported=self.on_export_group_exported,
+                                                            on_finished=self.on_export_finished,
+                                                            manifest_dir=self.build_root_export_path(),
+                                                            tile_filters=self.export_tile_filters,
+                                                            is_staged=self.staging_dir is not None,
+                                                            journal=self.export_journal,
+                                                            content_store_root=self.get_content_store_root())
+        self.packed_files = []
+        self.staged_files = {}
+        self.export_cache_records = []
+        self.export_button.setEnabled(False)
+        self.cancel_export_button.setEnabled(True)
+        module_trace.begin_run()
+        self.export_queue.start()
+
+    #Export root of a direct export when earlier exports published linked maps to it, their links are moved aside before they are exported again
+    def get_content_store_root(self):
+        import module_export_dedup #Imported on first use
+        export_root = self.build_root_export_path()
+        if self.staging_dir is not None or not module_export_dedup.has_content_store(export_root): #Staged exports write to a new folder, never to a linked map
+            return None
+        return export_root
+
+    #Function that's triggered when the "Cancel Export" button is clicked
+    def on_cancel_export_requested(self):
+        if self.export_queue is not None:
+            self.export_queue.cancel()
+            self.cancel_export_button.setEnabled(False)
+
+    #Function that's triggered every time the export status of a texture set changes
+    def on_export_progress(self, texture_set_name, status):
+        row = self.texture_table_store.row_by_name.get(texture_set_name)
+        if row is not None:
+            self.set_export_status(row, status)
+        self.export_progress_label.setText(f"Exported {self.export_queue.exported_count} of {self.export_queue.texture_set_count} texture sets ({self.export_queue.elapsed_time():.1f} s)")
+
+    #Function that's triggered after each exported group, keeps the files of the texture sets that were exported successfully
+    #They are recorded in the export cache when the export is done, once they are published
+    def on_export_group_exported(self, texture_set_names, export_result, elapsed_time):
+        import module_export_cache #Imported on first use
+        if export_result.status != substance_painter.export.ExportStatus.Success:
+            return
+        self.record_export_cost(texture_set_names, export_result, elapsed_time)
+        source_files = module_export_cache.group_exported_files(export_result.textures)
+        exported_files = source_files
+        if len(self.pack_jobs) > 0:
+            exported_files = self.pack_exported_sources(texture_set_names, source_files)
+            for textset_name in texture_set_names: #The manifest lists the packed maps, the source maps are removed once packed
+                self.export_queue.batch_result.manifest.replace_maps(source_files.get(textset_name, []), exported_files.get(textset_name, []))
+            if self.staging_dir is None and self.export_journal is not None: #The packed texture sets are in place, staged ones are committed once published
+                self.export_journal.record_commit(exported_files)
+        for textset_name in texture_set_names:
+            if textset_name not in exported_files: #Texture sets that failed to pack are exported again next time
+                continue
+            if self.staging_dir is not None: #The exported or packed maps are published, the source maps stay in the staging folder
+                self.staged_files.setdefault(textset_name, []).extend(exported_files[textset_name])
+            if self.get_tile_resolutions(textset_name) is not None: #One cache entry per exported tile
+                files_by_udim = module_export_cache.group_files_by_udim(exported_files[textset_name])
+                for udim, tile_files in files_by_udim.items():
+                    self.export_cache_records.append((module_export_cache.get_tile_key(textset_name, udim), textset_name, 
+                                                      tile_files, elapsed_time / len(texture_set_names) / len(files_by_udim)))
+                continue
+            self.export_cache_records.append((textset_name, textset_name, exported_files[textset_name], elapsed_time / len(texture_set_names)))
+
+    #Stores the fingerprints of the exported texture sets, with the paths of their files in the export root
+    def record_export_cache(self, publish_result=None):
+        import module_export_publish #Imported on first use
+        project_name = substance_painter.project.name()
+        export_root = self.build_root_export_path()
+        for cache_key, textset_name, files, duration in self.export_cache_records:
+            if publish_result is not None:
+                if textset_name not in publish_result.published_files: #Texture sets that failed to publish are exported again next time
+                    continue
+                files = [module_export_publish.get_published_path(file_path, self.staging_dir, export_root) for file_path in files]
+            self.export_cache.record(cache_key, project_name, self.export_fingerprints.get(cache_key), files, duration, parent_name=textset_name)
+        self.export_cache_records = []
+        self.save_export_cache()
+
+    def save_export_cache(self):
+        try:
+            self.export_cache.save()
+        except OSError as error: #Only the skipping of unchanged texture sets is lost, they are exported again next time
+            substance_painter.logging.log(substance_painter.logging.WARNING, "Custom Exporter", f"The export cache could not be saved: {error}")
+
+    #Builds the shader maps of the exported texture sets from their source maps, and returns texture set name -> packed files
+    def pack_exported_sources(self, texture_set_names, source_files):
+        exported_names = set(texture_set_names)
+        pack_jobs = [pack_job for pack_job in self.pack_jobs if pack_job[0] in exported_names]
+        try:
+            with module_trace.span("pack_texture_sets", texture_sets=len(texture_set_names)):
+                pack_results = module_texture_packing.pack_texture_sets(pack_jobs, source_files)
+        except ImportError as error:
+            pack_results = {textset_name: str(error) for textset_name in texture_set_names}
+
+        packed_files = {}
+        for textset_name, pack_result in pack_results.items():
+            row = self.texture_table_store.row_by_name.get(textset_name)
+            if isinstance(pack_result, str):
+                substance_painter.logging.log(substance_painter.logging.ERROR, "Custom Exporter", f"Packing FAILED for texture set {textset_name}: {pack_result}")
+                if row is not None:
+                    self.texture_table_store.export_status_details[row] = pack_result
+                    self.set_export_status(row, "Packing FAILED")
+            else:
+                packed_files[textset_name] = pack_result
+                self.packed_files.extend(pack_result)
+        return packed_files
+
+    #Function that's triggered when the export queue is done or cancelled
+    def on_export_finished(self, batch_result):
+        self.export_button.setEnabled(True)
+        self.cancel_export_button.setEnabled(False)
+        self.export_progress_label.setText(f"Exported {self.export_queue.exported_count} of {self.export_queue.texture_set_count} texture sets in {self.export_queue.elapsed_time():.1f} s. {self.skipped_export_message}")
+        try:
+            if self.is_project_closing: #Nothing can be read from the closed project, the suspended journal resumes the export when it is opened again
+                return
+            self.verify_exported_textures()
+            if self.lod_variants_checkbox.isChecked():
+                self.generate_lod_variants(batch_result)
+            publish_result = self.publish_staged_files(batch_result) if self.staging_dir is not None else None
+            self.record_export_cache(publish_result)
+            if self.export_journal is not None: #Only ended when every stage is done, an export interrupted before can be resumed
+                self.export_journal.end()
+            self.save_cost_model()
+        finally:
+            if self.sources_dir is not None: #The source maps are only needed until the maps are packed and verified
+                module_texture_packing.remove_sources_dir(self.sources_dir)
+                self.sources_dir = None
+            self.is_project_closing = False
+            self.show_trace_summary()
+
+    #Saves the cost model refined by the export, and logs how close its estimate was
+    def save_cost_model(self):
+        import module_export_estimate #Imported on first use
+        if self.cost_model is None:
+            return
+        try:
+            self.cost_model.save()
+        except OSError as error: #The next export is estimated with the previous rates
+            substance_painter.logging.log(substance_painter.logging.WARNING, "Custom Exporter", f"The export cost model could not be saved: {error}")
+        measured_duration, estimated_duration = self.measured_export_cost
+        if measured_duration > 0:
+            substance_painter.logging.log(substance_painter.logging.INFO, "Custom Exporter", 
+                                          f"The exported texture sets took {module_export_estimate.format_duration(measured_duration)}, estimated {module_export_estimate.format_duration(estimated_duration)}.")
+
+    #Copies the staged files of the export to the export root, and removes the staging folder
+    def publish_staged_files(self, batch_result):
+        import module_export_publish #Imported on first use
+        export_root = self.build_root_export_path()
+        try:
+            with module_trace.span("publish_staged_files", texture_sets=len(self.staged_files)):
+                content_store = None
+                if self.dedup_checkbox.isChecked():
+                    import module_export_dedup #Imported on first use
+                    content_store = module_export_dedup.ContentStore(export_root)
+                publish_result = module_export_publish.publish_staged_files(self.staged_files, self.staging_dir, export_root, content_store=content_store)
+        finally:
+            self.remove_staging_dir()
+
+        for textset_name, error in publish_result.errors.items():
+            substance_painter.logging.log(substance_painter.logging.ERROR, "Custom Exporter", f"Publishing FAILED for texture set {textset_name}: {error}")
+            row = self.texture_table_store.row_by_name.get(textset_name)
+            if row is not None:
+                self.texture_table_store.export_status_details[row] = error
+                self.set_export_status(row, "Publish FAILED")
+
+        if self.export_journal is not None:
+            self.export_journal.record_commit(publish_result.published_files)
+
+        #The manifest of the run is written once, with the published files, not the staged ones
+        batch_result.manifest.remap_paths(lambda file_path: module_export_publish.get_published_path(file_path, self.staging_dir, export_root))
+        batch_result.manifest.record_deduplication(publish_result.checksums, publish_result.deduplicated_files, publish_result.saved_byte_count)
+        module_export.log_export_manifest(batch_result.manifest)
+
+        publish_summary = publish_result.summary()
+        substance_painter.logging.log(substance_painter.logging.INFO, "Custom Exporter", publish_summary)
+        self.export_progress_label.setText(f"{self.export_progress_label.text()} {publish_summary}.")
+        published_folders = [os.path.dirname(file_paths[0]) for file_paths in publish_result.published_files.values() if len(file_paths) > 0]
+        for folder in module_export.get_folders_to_open(published_folders):
+            module_export.open_explorer_at_path(folder)
+        return publish_result
+
+    def remove_staging_dir(self):
+        import module_export_publish #Imported on first use
+        if self.staging_dir is not None:
+            module_export_publish.remove_staging_dir(self.staging_dir)
+
+    #Downscales the exported maps once for every smaller resolution budget, instead of exporting them again at each resolution
+    def generate_lod_variants(self, batch_result):
+        import module_texture_lod #Imported on first use
+        if len(self.pack_jobs) > 0: #The variants are made of the packed maps, not of the source maps
+            exported_files = list(self.packed_files)
+        else:
+            exported_files = [file_path for file_paths in batch_result.textures.values() for file_path in file_paths]
+        if len(exported_files) == 0:
+            return
+        try:
+            with module_trace.span("generate_lod_variants", maps=len(exported_files)):
+                lod_results = module_texture_lod.generate_lod_variants(exported_files)
+        except ImportError as error:
+            substance_painter.logging.log(substance_painter.logging.ERROR, "Custom Exporter", str(error))
+            return
+        failed_maps = {file_path: result for file_path, result in lod_results.items() if isinstance(result, str)}
+        if self.staging_dir is not None: #The variants are published with the maps they are made of
+            textset_names = {file_path: textset_name for textset_name, file_paths in self.staged_files.items() for file_path in file_paths}
+            for file_path, result in lod_results.items():
+                if not isinstance(result, str) and file_path in textset_names:
+                    self.staged_files[textset_names[file_path]].extend(result)
+        variant_count = sum(len(result) for result in lod_results.values() if not isinstance(result, str))
+        substance_painter.logging.log(substance_painter.logging.INFO, "Custom Exporter", f"Generated {variant_count} LOD variants of {len(exported_files) - len(failed_maps)} maps.")
+        for file_path, error in failed_maps.items():
+            substance_painter.logging.log(substance_painter.logging.WARNING, "Custom Exporter", f"No LOD variants for {file_path}: {error}")
+
+    #Reads the headers of all exported files, and flags the texture sets with missing maps, wrong dimensions or unexpected bit depths
+    def verify_exported_textures(self):
+        import module_texture_verify #Imported on first use
+        if len(self.export_queue.exported_groups) == 0:
+            return
+        with module_trace.span("verify_exported_textures"):
+            issues_by_texture_set = module_texture_verify.verify_export_groups(self.export_queue.exported_groups, self.asset_combobox.currentText())
+        failed_names = [textset_name for textset_name, issues in issues_by_texture_set.items() if len(issues) > 0]
+        for textset_name in failed_names:
+            row = self.texture_table_store.row_by_name.get(textset_name)
+            if row is not None:
+                self.texture_table_store.export_status_details[row] = "\n".join(issues_by_texture_set[textset_name])
+                self.set_export_status(row, "Verification FAILED")
+        if len(failed_names) > 0:
+            substance_painter.logging.log(substance_painter.logging.WARNING, "Custom Exporter", 
+                                          f"Export verification FAILED for {len(failed_names)} texture sets: {', '.join(failed_names)}. Hover their export status for details.")
+        else:
+            substance_painter.logging.log(substance_painter.logging.INFO, "Custom Exporter", f"Export verification passed for {len(issues_by_texture_set)} texture sets.")
+
+    #Function that's triggered when the Stage Exports Locally checkbox is toggled, the maps exported directly are never deduplicated
+    def on_local_staging_toggled(self, checked):
+        self.dedup_checkbox.setEnabled(checked)
+
+    #Function that's triggered when the Trace checkbox is toggled
+    def on_trace_toggled(self):
+        module_trace.set_enabled(self.trace_checkbox.isChecked())
+        self.trace_summary_label.setText("")
+
+    #Writes the trace file and shows the slowest spans of the last run
+    def show_trace_summary(self):
+        summary = module_trace.end_run()
+        if len(summary) > 0:
+            self.trace_summary_label.setText(f"Last run: {module_trace.format_summary(summary)}")
+
+    def set_export_status(self, row, status):
+        self.texture_table_store.export_statuses[row] = status
+        self.texture_table_model.notify_rows_changed(row, row, module_texture_table.COLUMN_EXPORT_STATUS, module_texture_table.COLUMN_EXPORT_STATUS)
     
     #Function that's triggered when an exisisting project is opened in Substance Painter
     def on_project_opened(self, e):
-        self.fill_texture_table()
+        self.request_texture_table_fill()
 
     #Function that's triggered when a new project is created in Substance Painter
     def on_project_created(self, e):
-        self.fill_texture_table()
+        self.request_texture_table_fill()
 
     #Function that's triggered when a new project is about to close in Substance Painter
     def on_project_about_to_close(self, e):
+        if self.is_export_running(): #The rest of the export is cancelled, and left unended in the journal, to be resumed when the project is opened again
+            if self.export_journal is not None:
+                self.export_journal.suspend()
+            self.is_project_closing = True #The queue finishes on a later event loop turn, once the project is closed
+            self.export_queue.cancel()
+        self.is_table_fill_pending = False
+        self.applied_resolution_changes = [] #The resolution fix can't be undone in another project
+        self.undo_res_fix_button.setEnabled(False)
+        self.rename_button.setEnabled(False)
+        self.is_res_dialog_suppressed = False
+        self.texture_set_snapshot.reset([])
+        self.live_revalidation.clear()
         self.init_rows_and_cols_table()
 
 class DialogWindow(QDialog):
-    def __init__(self, icon):
+    def __init__(self, icon, resolution_changes):
         super().__init__()
         self.setWindowTitle("Texture Set Resolution is over budget")
         self.setWindowIcon(icon)
-        self.setFixedSize(600, 160)
+        self.setFixedSize(600, 320)
 
         layout = QVBoxLayout(self)
 
-        text_label = QLabel("There is a validation error in the Resolution Check step. \nBut no worries, the tool can automatically adjust the resolution of all texture sets that do not meet the requirements. \nDo you want to proceed?")
+        text_label = QLabel("There is a validation error in the Resolution Check step. \nBut no worries, the tool can automatically adjust the resolution of all texture sets that do not meet the requirements. \nThese resolutions will be changed, and can be restored with the Undo Resolution Fix button. Do you want to proceed?")
+        text_label.setWordWrap(True)
         layout.addWidget(text_label)
 
+        #Dry run of the autofix, nothing is changed before the changes are accepted
+        preview = QPlainTextEdit("\n".join(module_resolution_autofix.format_resolution_change(resolution_change) for resolution_change in resolution_changes))
+        preview.setReadOnly(True)
+        layout.addWidget(preview)
+
         buttons = QDialogButtonBox(QDialogButtonBox.Yes | QDialogButtonBox.No)
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
-        buttons.button(QDialogButtonBox.Yes).setText("Yes, apply the required resolution for all texture sets.")
+        buttons.button(QDialogButtonBox.Yes).setText(f"Yes, apply these {len(resolution_changes)} resolution changes.")
         buttons.button(QDialogButtonBox.No).setText("No, I'll modify the resolution manually.")
         layout.addWidget(buttons)
 
@@ -407,12 +1263,16 @@ class DialogWindow(QDialog):
 
 def start_plugin(): #Needs to have this exact name, because of Substance Painter built-in functions
     global custom_expo
+    if custom_expo is not None: #The widget of a running custom exporter is shown again instead of being built twice
+        custom_expo.show_ui_widget()
+        return
     custom_expo = CustomExporter()
 
 def close_plugin(): #Needs to have this exact name, because of Substance Painter built-in functions
     global custom_expo
     if custom_expo is not None: #Delete the custom exporter if it curently exists
         custom_expo.delete_widget()
+        custom_expo = None
 
 if __name__ == "__main__": #Safety measure, to make sure that the script can only be initialized by Substance Painter directly and no external interference occurs
     start_plugin()
@@ -0,0 +1,12 @@
+"""Tests run against the stand-in substance_painter API of benchmarks/backend: python -m pytest tests"""
+
+# Default Utils imports
+import os
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "benchmarks", "backend"))
+sys.path.insert(0, os.path.join(REPO_DIR, "modules"))
+sys.path.insert(0, os.path.join(REPO_DIR, "plugins"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen") #The widget tests never show a window
@@ -0,0 +1,52 @@
+"""
+    Tests of the content revisions of the widget: every edit of a texture set, stack edit or paint stroke, changes its export fingerprint.
+"""
+
+#Substance Painter API import
+import substance_painter
+
+# Default Utils imports
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+TEXTURE_SET_NAMES = ["PROP_CHR_S_01", "PROP_CHR_S_02"]
+
+@unittest.skipIf(importlib.util.find_spec("PySide6") is None, "needs PySide6")
+class ContentRevisionTest(unittest.TestCase):
+    def setUp(self):
+        from PySide6.QtWidgets import QApplication
+        import custom_exporter
+        self.application = QApplication.instance() or QApplication([])
+        project_dir = tempfile.mkdtemp(prefix="test_project_")
+        self.addCleanup(shutil.rmtree, project_dir, ignore_errors=True)
+        project_path = os.path.join(project_dir, "Revisions.json") #A saved project, unsaved projects are always exported
+        with open(project_path, "w", encoding="utf-8") as project_file:
+            json.dump({"texture_sets": [{"name": name, "resolution": [256, 256]} for name in TEXTURE_SET_NAMES]}, project_file)
+        substance_painter.project.open(project_path)
+        self.exporter = custom_exporter.CustomExporter()
+        self.exporter.fill_texture_table()
+        self.exporter.refresh_scheduler.run_pending_refresh()
+
+    def tearDown(self):
+        substance_painter.project.close()
+        for callbacks in substance_painter.event.DISPATCHER.callbacks.values(): #The next test builds its own widget
+            callbacks[:] = [callback for callback in callbacks if getattr(callback, "__self__", None) is not self.exporter]
+
+    def get_fingerprints(self):
+        return {name: self.exporter.get_export_fingerprint(name, "Basic", self.exporter.texture_table_model.export_path(row))
+                for row, name in enumerate(TEXTURE_SET_NAMES)}
+
+    def test_texture_state_event_changes_fingerprint(self):
+        fingerprints = self.get_fingerprints()
+        stack_id = substance_painter.textureset.TextureSet.from_name(TEXTURE_SET_NAMES[0]).stack.stack_id
+        substance_painter.event.DISPATCHER.emit(substance_painter.event.TextureStateEvent(substance_painter.event.TextureStateEventAction.UPDATE, stack_id))
+        changed_fingerprints = self.get_fingerprints()
+        self.assertNotEqual(changed_fingerprints[TEXTURE_SET_NAMES[0]], fingerprints[TEXTURE_SET_NAMES[0]])
+        self.assertEqual(changed_fingerprints[TEXTURE_SET_NAMES[1]], fingerprints[TEXTURE_SET_NAMES[1]])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+    Tests of the batch export of module_export: the texture sets of one export preset are exported by one call, each to its own folder.
+"""
+
+#Substance Painter API import
+import substance_painter
+
+#Custom exporter modules
+import module_export
+
+# Default Utils imports
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+TEXTURE_SET_NAMES = [f"PROP_CHR_S_{i:02d}" for i in range(1, 41)]
+
+class BatchExportTest(unittest.TestCase):
+    def setUp(self):
+        substance_painter.project.create_synthetic([{"name": name, "resolution": [256, 256]} for name in TEXTURE_SET_NAMES])
+        self.export_root = tempfile.mkdtemp(prefix="test_export_")
+        self.addCleanup(shutil.rmtree, self.export_root, ignore_errors=True)
+        self.export_jobs = [(name, shader_type, module_export.build_export_path(self.export_root, "Props", name, shader_type)) 
+                            for name in TEXTURE_SET_NAMES for shader_type in ("Basic", "Morph")]
+
+    def tearDown(self):
+        substance_painter.project.close()
+
+    def test_fewer_export_calls_than_texture_sets(self):
+        export_project_textures = substance_painter.export.export_project_textures
+        with mock.patch.object(substance_painter.export, "export_project_textures", side_effect=export_project_textures) as export_call:
+            batch_result = module_export.exporting_batch(self.export_jobs, manifest_dir=self.export_root)
+        self.assertEqual(export_call.call_count, 2) #One call per export preset
+        self.assertLess(export_call.call_count, len(TEXTURE_SET_NAMES))
+        self.assertEqual(batch_result.status, substance_painter.export.ExportStatus.Success)
+
+    def test_every_texture_set_keeps_its_own_folder(self):
+        export_groups = module_export.build_batch_export_configs(self.export_jobs)
+        for export_config, texture_set_names in export_groups:
+            textures = substance_painter.export.list_project_textures(export_config)
+            for (texture_set_name, _), file_paths in textures.items():
+                export_path = module_export.get_group_export_path(export_config, texture_set_name)
+                self.assertIn((texture_set_name, export_path), [(name, path) for name, _, path in self.export_jobs])
+                for file_path in file_paths:
+                    self.assertEqual(os.path.normpath(os.path.dirname(file_path)), os.path.normpath(export_path))
+
+    def test_one_folder_is_opened_per_batch(self):
+        export_paths = [export_path for _, _, export_path in self.export_jobs]
+        self.assertEqual(module_export.get_folders_to_open(export_paths + export_paths), [os.path.normpath(os.path.join(self.export_root, "Props"))])
+
+    def test_single_texture_set_opens_its_folder(self):
+        export_path = self.export_jobs[0][2]
+        self.assertEqual(module_export.get_folders_to_open([export_path, export_path]), [os.path.normpath(export_path)])
+
+if __name__ == "__main__":
+    unittest.main()
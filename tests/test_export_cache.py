@@ -0,0 +1,55 @@
+"""
+    Tests of the export fingerprints of module_export_cache: a texture set is only skipped when its files are in its current export folder.
+"""
+
+#Custom exporter modules
+import module_export
+import module_export_cache
+
+# Default Utils imports
+import os
+import shutil
+import tempfile
+import unittest
+
+TEXTURE_SET_NAME = "PROP_CHR_S_01"
+CONTENT_REVISION = "project.spp:0"
+
+class ExportCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.export_root = tempfile.mkdtemp(prefix="test_cache_")
+        self.addCleanup(shutil.rmtree, self.export_root, ignore_errors=True)
+
+    def export(self, asset_type, shader_type):
+        """ Writes the files of the texture set to its export path, and records them in the cache like an export. Returns its fingerprint. """
+        export_path = module_export.build_export_path(self.export_root, asset_type, TEXTURE_SET_NAME, shader_type)
+        os.makedirs(export_path, exist_ok=True)
+        file_path = os.path.join(export_path, f"{TEXTURE_SET_NAME}_BaseColor.png")
+        with open(file_path, "wb") as exported_file:
+            exported_file.write(b"exported")
+        fingerprint = self.get_fingerprint(asset_type, shader_type)
+        export_cache = module_export_cache.ExportCache(self.export_root)
+        export_cache.record(TEXTURE_SET_NAME, "project", fingerprint, [file_path], 1.0)
+        export_cache.save()
+        return fingerprint
+
+    def get_fingerprint(self, asset_type, shader_type):
+        export_path = module_export.build_export_path(self.export_root, asset_type, TEXTURE_SET_NAME, shader_type)
+        return module_export_cache.build_fingerprint("Custom_Basic", [1024, 1024], module_export.PADDING_ALGORITHM, export_path, CONTENT_REVISION)
+
+    def test_unchanged_texture_set_is_up_to_date(self):
+        fingerprint = self.export("Props", "Basic")
+        self.assertTrue(module_export_cache.ExportCache(self.export_root).is_up_to_date(TEXTURE_SET_NAME, fingerprint))
+
+    def test_changed_asset_type_is_exported_again(self):
+        self.export("Props", "Basic")
+        fingerprint = self.get_fingerprint("Weapons", "Basic") #The files of the Props folder are still on disk
+        self.assertFalse(module_export_cache.ExportCache(self.export_root).is_up_to_date(TEXTURE_SET_NAME, fingerprint))
+
+    def test_changed_shader_type_is_exported_again(self):
+        self.export("Props", "Basic")
+        fingerprint = self.get_fingerprint("Props", "Armament")
+        self.assertFalse(module_export_cache.ExportCache(self.export_root).is_up_to_date(TEXTURE_SET_NAME, fingerprint))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+    Tests of the deduplicated publish of module_export_dedup: rewriting one map published as a hardlink never changes the other maps.
+"""
+
+#Substance Painter API import
+import substance_painter
+
+#Custom exporter modules
+import module_export
+import module_export_dedup
+import module_export_publish
+import module_image_io
+
+# Default Utils imports
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+TEXTURE_SET_NAMES = ["PROP_CHR_S_01", "PROP_CHR_S_02", "PROP_CHR_S_03"]
+
+@unittest.skipIf(len(module_image_io.get_missing_dependencies()) > 0, "needs NumPy and Pillow")
+class DedupPublishTest(unittest.TestCase):
+    def setUp(self):
+        #Texture sets of the same resolution export identical maps
+        substance_painter.project.create_synthetic([{"name": name, "resolution": [64, 64]} for name in TEXTURE_SET_NAMES])
+        substance_painter.configure(write_files=True)
+        self.addCleanup(substance_painter.configure, write_files=False)
+        self.export_root = tempfile.mkdtemp(prefix="test_dedup_")
+        self.addCleanup(shutil.rmtree, self.export_root, ignore_errors=True)
+        staging_dir = module_export_publish.create_staging_dir(tempfile.mkdtemp(prefix="test_scratch_"))
+        self.addCleanup(shutil.rmtree, os.path.dirname(staging_dir), ignore_errors=True)
+
+        staged_jobs = [(name, "Basic", module_export.build_export_path(staging_dir, "Props", name, "Basic")) for name in TEXTURE_SET_NAMES]
+        batch_result = module_export.exporting_batch(staged_jobs)
+        staged_files = {name: list(file_paths) for (name, _), file_paths in batch_result.textures.items()}
+        content_store = module_export_dedup.ContentStore(self.export_root)
+        publish_result = module_export_publish.publish_staged_files(staged_files, staging_dir, self.export_root, content_store=content_store)
+        self.assertEqual(publish_result.errors, {})
+        self.published_files = publish_result.published_files
+        self.base_color_paths = {name: next(file_path for file_path in file_paths if file_path.endswith("_BaseColor.png"))
+                                 for name, file_paths in self.published_files.items()}
+        self.assertGreater(os.stat(self.base_color_paths[TEXTURE_SET_NAMES[0]]).st_nlink, 1) #Published as hardlinks to one stored copy
+        self.checksums = module_export_dedup.hash_files([file_path for file_paths in self.published_files.values() for file_path in file_paths])
+
+    def tearDown(self):
+        substance_painter.project.close()
+
+    def assert_other_maps_unchanged(self, changed_name):
+        for name, file_paths in self.published_files.items():
+            if name != changed_name:
+                for file_path in file_paths:
+                    self.assertEqual(module_export_publish.get_file_checksum(file_path), self.checksums[file_path])
+
+    def test_rewritten_map_keeps_other_maps(self):
+        file_path = self.base_color_paths[TEXTURE_SET_NAMES[0]]
+        pixels, image_format = module_image_io.read_image(file_path)
+        module_image_io.write_image(file_path, 1.0 - pixels, image_format)
+        self.assertNotEqual(module_export_publish.get_file_checksum(file_path), self.checksums[file_path])
+        self.assert_other_maps_unchanged(TEXTURE_SET_NAMES[0])
+
+    def export_directly(self, name):
+        module_export.exporting_batch([(name, "Basic", module_export.build_export_path(self.export_root, "Props", name, "Basic"))],
+                                      content_store_root=self.export_root)
+
+    def test_direct_export_keeps_other_maps(self):
+        name = TEXTURE_SET_NAMES[0]
+        substance_painter.textureset.TextureSet.from_name(name).set_resolution(substance_painter.textureset.Resolution(128, 128))
+        self.export_directly(name)
+        self.assertNotEqual(module_export_publish.get_file_checksum(self.base_color_paths[name]), self.checksums[self.base_color_paths[name]])
+        self.assert_other_maps_unchanged(name)
+
+    def test_failed_direct_export_keeps_its_maps(self):
+        name = TEXTURE_SET_NAMES[0]
+        with mock.patch.object(substance_painter.export, "export_project_textures", side_effect=RuntimeError("export failed")):
+            with self.assertRaises(RuntimeError):
+                self.export_directly(name)
+        for file_path in self.published_files[name]:
+            self.assertEqual(module_export_publish.get_file_checksum(file_path), self.checksums[file_path])
+        self.assertGreater(os.stat(self.base_color_paths[name]).st_nlink, 1) #Still linked, nothing was written
+
+    def test_unlinked_contents_are_pruned(self):
+        content_store = module_export_dedup.ContentStore(self.export_root)
+        self.assertEqual(content_store.prune(), 0) #Every stored content is linked by the published maps
+        for file_paths in self.published_files.values():
+            for file_path in file_paths:
+                os.remove(file_path)
+        self.assertGreater(content_store.prune(), 0)
+        self.assertEqual(content_store.entries, {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+    Tests of module_export_queue: the groups are exported in order, one per event loop turn, the batch can be cancelled between two groups, and on_finished is called once.
+"""
+
+#Substance Painter API import
+import substance_painter
+
+#Custom exporter modules
+import module_export
+import module_export_queue
+
+# Default Utils imports
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+class ExportQueueTest(unittest.TestCase):
+    def setUp(self):
+        substance_painter.project.create_synthetic([{"name": name, "resolution": [256, 256]} for name in ("PROP_CHR_S_01", "PROP_CHR_S_02", "PROP_CHR_S_03")])
+        self.export_root = tempfile.mkdtemp(prefix="test_queue_")
+        self.addCleanup(shutil.rmtree, self.export_root, ignore_errors=True)
+        #Two groups, one per export preset, in the order they are first seen
+        self.export_jobs = [(name, shader_type, module_export.build_export_path(self.export_root, "Props", name, shader_type))
+                            for name, shader_type in (("PROP_CHR_S_03", "Morph"), ("PROP_CHR_S_01", "Basic"), ("PROP_CHR_S_02", "Basic"))]
+        self.pending = []
+        self.exported_groups = []
+        self.on_finished = mock.Mock()
+        self.queue = module_export_queue.ExportQueue(self.export_jobs, schedule=self.pending.append, on_finished=self.on_finished,
+                                                     on_group_exported=lambda texture_set_names, export_result, elapsed_time: self.exported_groups.append(list(texture_set_names)))
+
+    def tearDown(self):
+        substance_painter.project.close()
+
+    def run_pending(self):
+        while self.pending:
+            self.pending.pop(0)()
+
+    def test_groups_are_exported_in_order(self):
+        self.queue.start()
+        self.assertEqual(self.exported_groups, []) #Nothing is exported before the event loop runs
+        self.pending.pop(0)()
+        self.assertEqual(self.exported_groups, [["PROP_CHR_S_03"]]) #One group per event loop turn
+        self.run_pending()
+        self.assertEqual(self.exported_groups, [["PROP_CHR_S_03"], ["PROP_CHR_S_01", "PROP_CHR_S_02"]])
+        self.assertEqual(self.queue.batch_result.status, substance_painter.export.ExportStatus.Success)
+
+    def test_cancel_between_groups(self):
+        self.queue.start()
+        self.pending.pop(0)()
+        self.queue.cancel()
+        self.run_pending()
+        self.assertEqual(self.exported_groups, [["PROP_CHR_S_03"]])
+        self.assertTrue(self.queue.statuses["PROP_CHR_S_03"].startswith("Done"))
+        self.assertEqual(self.queue.statuses["PROP_CHR_S_01"], module_export_queue.STATUS_CANCELLED)
+        self.assertEqual(self.queue.statuses["PROP_CHR_S_02"], module_export_queue.STATUS_CANCELLED)
+        self.assertEqual(self.queue.batch_result.status, substance_painter.export.ExportStatus.Cancelled)
+        self.on_finished.assert_called_once_with(self.queue.batch_result)
+
+    def test_finished_once(self):
+        self.queue.start()
+        self.run_pending()
+        self.queue.export_next_group() #A late callback of the event loop
+        self.queue.cancel()
+        self.run_pending()
+        self.on_finished.assert_called_once_with(self.queue.batch_result)
+
+    def test_finished_once_when_finishing_fails(self):
+        self.queue.start()
+        with mock.patch.object(module_export, "finish_batch_export", side_effect=OSError("folder can't be opened")):
+            with self.assertRaises(OSError):
+                self.run_pending()
+        self.run_pending()
+        self.on_finished.assert_called_once_with(self.queue.batch_result)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+"""
+    Tests of module_image_io: 16-bit grayscale images are read in the 0-1 range, also when Pillow opens them as 32-bit integers.
+"""
+
+#Custom exporter modules
+import module_image_io
+
+# Default Utils imports
+import os
+import shutil
+import tempfile
+import unittest
+
+@unittest.skipIf(len(module_image_io.get_missing_dependencies()) > 0, "needs NumPy and Pillow")
+class GrayscaleImageTest(unittest.TestCase):
+    def setUp(self):
+        import numpy
+        self.numpy = numpy
+        self.temp_dir = tempfile.mkdtemp(prefix="test_image_io_")
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.values = numpy.array([[0, 1000], [40000, 65535]], dtype=numpy.uint16)
+
+    def assert_read_values(self, file_path, mode):
+        pixels, image_format = module_image_io.read_image(file_path)
+        self.assertEqual(image_format.mode, mode)
+        self.assertEqual(pixels.shape, (2, 2, 1))
+        self.numpy.testing.assert_allclose(pixels[:, :, 0], self.values / 65535.0, rtol=1e-6)
+        return pixels, image_format
+
+    def test_16_bit_png(self):
+        from PIL import Image
+        file_path = os.path.join(self.temp_dir, "height.png")
+        Image.fromarray(self.values).save(file_path)
+        pixels, image_format = self.assert_read_values(file_path, Image.open(file_path).mode)
+        module_image_io.write_image(file_path, pixels, image_format)
+        self.assertTrue(self.numpy.array_equal(self.numpy.asarray(Image.open(file_path)), self.values))
+
+    def test_32_bit_integer_image(self):
+        from PIL import Image
+        file_path = os.path.join(self.temp_dir, "height.tif")
+        Image.fromarray(self.values.astype(self.numpy.int32), "I").save(file_path)
+        pixels, image_format = self.assert_read_values(file_path, "I")
+        module_image_io.write_image(file_path, pixels, image_format)
+        self.assertTrue(self.numpy.array_equal(self.numpy.asarray(Image.open(file_path)).astype(self.numpy.uint16), self.values))
+
+if __name__ == "__main__":
+    unittest.main()
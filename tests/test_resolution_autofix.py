@@ -0,0 +1,59 @@
+"""
+    Tests of the batch apply of module_resolution_autofix: a failed rollback is logged, and the error of the failed change is raised.
+"""
+
+#Substance Painter API import
+import substance_painter
+
+#Custom exporter modules
+import module_resolution_autofix
+
+# Default Utils imports
+import unittest
+from unittest import mock
+
+class ApplyResolutionChangesTest(unittest.TestCase):
+    def setUp(self):
+        substance_painter.project.create_synthetic([{"name": "PROP_CHR_S_01", "resolution": [4096, 512]},
+                                                    {"name": "PROP_TBL_S_01", "resolution": [2048, 2048]}])
+        #Two target resolutions, so the batch takes two calls
+        self.resolution_changes = module_resolution_autofix.plan_resolution_changes(
+            {"PROP_CHR_S_01": ((4096, 512), None), "PROP_TBL_S_01": ((2048, 2048), None)}, (1024, 1024))
+
+    def tearDown(self):
+        substance_painter.project.close()
+
+    def get_resolution(self, name):
+        resolution = substance_painter.textureset.TextureSet.from_name(name).get_resolution()
+        return resolution.width, resolution.height
+
+    def test_failed_change_is_rolled_back(self):
+        set_texture_sets_resolution = module_resolution_autofix.set_texture_sets_resolution
+        calls = []
+        def fail_second_call(texture_sets, res):
+            calls.append(res)
+            if len(calls) == 2:
+                raise ValueError("change failed")
+            set_texture_sets_resolution(texture_sets, res)
+        with mock.patch.object(module_resolution_autofix, "set_texture_sets_resolution", side_effect=fail_second_call):
+            with self.assertRaises(ValueError):
+                module_resolution_autofix.apply_resolution_changes(self.resolution_changes)
+        self.assertEqual(self.get_resolution("PROP_CHR_S_01"), (4096, 512))
+        self.assertEqual(self.get_resolution("PROP_TBL_S_01"), (2048, 2048))
+
+    def test_failed_rollback_raises_the_change_error(self):
+        calls = []
+        def fail_after_first_call(texture_sets, res):
+            calls.append(res)
+            if len(calls) > 1:
+                raise ValueError("change failed") if len(calls) == 2 else RuntimeError("rollback failed")
+        with mock.patch.object(module_resolution_autofix, "set_texture_sets_resolution", side_effect=fail_after_first_call), \
+             mock.patch.object(substance_painter.logging, "log") as log:
+            with self.assertRaisesRegex(ValueError, "change failed"):
+                module_resolution_autofix.apply_resolution_changes(self.resolution_changes)
+        self.assertEqual(len(calls), 3)
+        log.assert_called_once()
+        self.assertIn("rollback failed", log.call_args.args[2])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+"""
+    Tests of the row store of module_texture_table: revalidating a row keeps the export checkbox the user unchecked.
+"""
+
+# Default Utils imports
+import importlib.util
+import unittest
+
+@unittest.skipIf(importlib.util.find_spec("PySide6") is None, "needs PySide6")
+class RowStoreValidationTest(unittest.TestCase):
+    def setUp(self):
+        import module_texture_table
+        self.module_texture_table = module_texture_table
+        self.store = module_texture_table.TextureSetRowStore()
+        self.store.reset(["PROP_CHR_S_01"], [(1024, 1024)])
+
+    def test_first_validation_sets_the_checkbox(self):
+        self.store.set_validation(0, self.module_texture_table.VALIDATION_NAME_FAILED, "name")
+        self.assertFalse(self.store.export_checked[0])
+        self.assertFalse(self.store.export_enabled[0])
+
+    def test_revalidation_keeps_the_choice_of_the_user(self):
+        self.store.set_validation(0, self.module_texture_table.VALIDATION_OK)
+        self.store.export_checked[0] = False #Unchecked by the user
+        self.store.set_validation(0, self.module_texture_table.VALIDATION_OK)
+        self.assertFalse(self.store.export_checked[0])
+
+    def test_validity_change_sets_the_checkbox(self):
+        self.store.set_validation(0, self.module_texture_table.VALIDATION_RES_FAILED, "resolution")
+        self.store.set_validation(0, self.module_texture_table.VALIDATION_OK)
+        self.assertTrue(self.store.export_checked[0])
+        self.store.set_validation(0, self.module_texture_table.VALIDATION_NAME_FAILED, "name")
+        self.assertFalse(self.store.export_checked[0])
+
+if __name__ == "__main__":
+    unittest.main()